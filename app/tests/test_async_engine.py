@@ -0,0 +1,137 @@
+"""AdaptiveRateLimiter: transient throttles must not cap throughput, learned ceilings must recover"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import boto3
+import pytest
+from botocore.config import Config
+
+import async_engine
+from async_engine import AdaptiveRateLimiter, AsyncConversionEngine
+from bedrock_client import BedrockClient
+from fake_bedrock import FakeBedrockServer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        # At least a millisecond: a real clock always moves on while the bucket refills
+        self.now += max(seconds, 0.001)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(async_engine.time, 'monotonic', fake)
+    monkeypatch.setattr(async_engine.time, 'sleep', fake.sleep)
+    return fake
+
+
+def send(limiter, clock, requests, throttled, seconds=5.0):
+    """Spread requests evenly over a few seconds, every (requests / throttled)-th one is throttled"""
+    for i in range(requests):
+        clock.now += seconds / requests
+        limiter.acquire()
+        if i % (requests // throttled) == 0:
+            limiter.on_throttle()
+        else:
+            limiter.on_success(0.1, input_tokens=100, output_tokens=100)
+
+
+def test_transient_throttles_do_not_learn_a_ceiling(clock):
+    limiter = AdaptiveRateLimiter(initial_concurrency=8)
+    for _ in range(5):
+        send(limiter, clock, requests=100, throttled=10)
+
+    stats = limiter.get_stats()
+    assert stats['throttles'] == 50
+    assert stats['ceilings_learned'] == 0
+    assert limiter.learned_rps is None
+    assert limiter.request_bucket.rate is None
+
+
+def test_quota_ceiling_is_admitted_rate_and_recovers(clock):
+    limiter = AdaptiveRateLimiter(initial_concurrency=8)
+    send(limiter, clock, requests=21, throttled=10, seconds=2.1)
+
+    # Every other one of ~10 requests per second was admitted
+    assert limiter.get_stats()['ceilings_learned'] >= 1
+    assert limiter.learned_rps == pytest.approx(5.0, rel=0.1)
+    assert limiter.unthrottled_rps == pytest.approx(10.0, rel=0.1)
+
+    # Throttle-free seconds step the ceiling back up, then remove it
+    ceilings = []
+    for _ in range(limiter.RECOVERY_STEPS + 1):
+        clock.now += limiter.RECOVERY_SECONDS
+        limiter.on_success(0.1, input_tokens=100, output_tokens=100)
+        ceilings.append(limiter.learned_rps)
+    rising = [value for value in ceilings if value is not None]
+    assert rising == sorted(rising) and rising[0] > 5.0
+    assert ceilings[-1] is None
+    assert limiter.request_bucket.rate is None
+    assert limiter.learned_tpm is None
+
+
+def test_throttle_before_recovery_period_keeps_ceiling(clock):
+    limiter = AdaptiveRateLimiter(initial_concurrency=8)
+    send(limiter, clock, requests=21, throttled=10, seconds=2.1)
+    learned = limiter.learned_rps
+
+    clock.now += limiter.RECOVERY_SECONDS / 2
+    limiter.on_success(0.1, input_tokens=100, output_tokens=100)
+    assert limiter.learned_rps == learned
+
+
+@pytest.fixture
+def throttling_server():
+    server = FakeBedrockServer(latency_ms=40, ms_per_token=0.0, jitter_ms=0,
+                               throttle_rate=0.1, seed=1).start()
+    yield server
+    server.stop()
+
+
+def make_bedrock(server, rate_limiter=None):
+    client = boto3.client('bedrock-runtime', region_name='us-east-1', endpoint_url=server.endpoint_url,
+                          aws_access_key_id='fake', aws_secret_access_key='fake',
+                          config=Config(retries={'total_max_attempts': 1, 'mode': 'standard'}))
+    bedrock = BedrockClient('us-east-1', model_id='fake.model', retry_budget=None,
+                            rate_limiter=rate_limiter, client=client)
+    bedrock.BASE_DELAYS = {'throttle': 0.1, 'timeout': 0.1, 'server_error': 0.1}
+    return bedrock
+
+
+def convert_with(bedrock):
+    body = {'anthropic_version': 'bedrock-2023-05-31', 'max_tokens': 100, 'system': 'test',
+            'messages': [{'role': 'user', 'content': 'SELECT 1 FROM DUAL'}]}
+
+    def convert(_path):
+        bedrock.invoke_model(body)
+        return True
+    return convert
+
+
+def test_async_engine_keeps_up_with_thread_pool_under_random_throttling(throttling_server):
+    files = [Path(f'file_{i}.xml') for i in range(200)]
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert all(executor.map(convert_with(make_bedrock(throttling_server)), files))
+    thread_seconds = time.monotonic() - start
+
+    limiter = AdaptiveRateLimiter(initial_concurrency=4, max_concurrency=16)
+    engine = AsyncConversionEngine(convert_with(make_bedrock(throttling_server, limiter)), limiter)
+    start = time.monotonic()
+    results = engine.run(files)
+    async_seconds = time.monotonic() - start
+
+    assert all(ok for _, ok, _ in results)
+    assert limiter.get_stats()['throttles'] > 0
+    assert limiter.learned_rps is None
+    assert async_seconds < 2 * thread_seconds + 1.0
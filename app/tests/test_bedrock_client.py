@@ -0,0 +1,107 @@
+"""BedrockClient: error classification, retries of streamed calls, circuit breaker"""
+
+import json
+
+import pytest
+from botocore.exceptions import ClientError, EventStreamError, ReadTimeoutError
+
+from bedrock_client import BedrockClient, CircuitBreaker, CircuitOpenError
+
+
+def stream_error(code):
+    return EventStreamError({'Error': {'Code': code, 'Message': 'stream error'}},
+                            'InvokeModelWithResponseStream')
+
+
+def chunk(data):
+    return {'chunk': {'bytes': json.dumps(data).encode('utf-8')}}
+
+
+class StubRuntime:
+    """bedrock-runtime stand-in: each streamed call plays the next script of events"""
+
+    def __init__(self, scripts):
+        self.scripts = list(scripts)
+        self.calls = 0
+
+    def invoke_model_with_response_stream(self, modelId, body):
+        self.calls += 1
+        script = self.scripts.pop(0)
+
+        def events():
+            for event in script:
+                if isinstance(event, Exception):
+                    raise event
+                yield event
+        return {'body': events()}
+
+
+@pytest.fixture
+def bedrock():
+    client = BedrockClient('us-east-1', model_id='fake.model', client=StubRuntime([]))
+    client.backoff_delay = lambda attempt, error_class: 0.0
+    return client
+
+
+@pytest.mark.parametrize('code, expected', [
+    ('throttlingException', 'throttle'),
+    ('ThrottlingException', 'throttle'),
+    ('serviceUnavailableException', 'server_error'),
+    ('internalServerException', 'server_error'),
+    ('modelStreamErrorException', 'server_error'),
+    ('modelTimeoutException', 'timeout'),
+    ('validationException', None),
+])
+def test_classify_stream_error_codes(bedrock, code, expected):
+    assert bedrock.classify_error(stream_error(code)) == expected
+
+
+def test_classify_http_status_and_timeouts(bedrock):
+    throttled = ClientError({'Error': {'Code': 'Unknown'}, 'ResponseMetadata': {'HTTPStatusCode': 429}},
+                            'InvokeModel')
+    assert bedrock.classify_error(throttled) == 'throttle'
+    assert bedrock.classify_error(ReadTimeoutError(endpoint_url='http://x')) == 'timeout'
+    assert bedrock.classify_error(ValueError('bad json')) is None
+
+
+def test_stream_throttle_is_retried(bedrock):
+    bedrock.client = StubRuntime([
+        [chunk({'type': 'message_start', 'message': {'usage': {'input_tokens': 10}}}),
+         chunk({'type': 'content_block_delta', 'delta': {'text': 'SELECT'}}),
+         stream_error('throttlingException')],
+        [chunk({'type': 'message_start', 'message': {'usage': {'input_tokens': 10}}}),
+         chunk({'type': 'content_block_delta', 'delta': {'text': 'SELECT 1'}}),
+         chunk({'type': 'message_delta', 'delta': {'stop_reason': 'end_turn'},
+                'usage': {'output_tokens': 3}})],
+    ])
+    restarts = []
+
+    response = bedrock.invoke_model_stream({'messages': []}, on_restart=lambda: restarts.append(True))
+
+    assert response['content'][0]['text'] == 'SELECT 1'
+    assert response['stop_reason'] == 'end_turn'
+    assert bedrock.client.calls == 2
+    assert restarts == [True]
+    stats = bedrock.get_stats()
+    assert stats['retries']['throttle'] == 1
+    assert stats['failed'] == 0
+
+
+def test_non_retryable_stream_error_is_raised(bedrock):
+    bedrock.client = StubRuntime([[stream_error('validationException')]])
+
+    with pytest.raises(EventStreamError):
+        bedrock.invoke_model_stream({'messages': []})
+    assert bedrock.client.calls == 1
+
+
+def test_half_open_circuit_admits_one_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure()
+
+    assert breaker.before_call() is True
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    assert breaker.before_call() is False
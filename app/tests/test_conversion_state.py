@@ -0,0 +1,68 @@
+"""ConversionJournal: a run interrupted part way is resumed from its journal"""
+
+import json
+
+import pytest
+
+from conversion_state import ConversionJournal
+
+
+@pytest.fixture
+def sources(tmp_path):
+    source_dir = tmp_path / 'src'
+    source_dir.mkdir()
+    for name in ('A.xml', 'B.xml', 'C.xml'):
+        (source_dir / name).write_text(f'<mapper namespace="{name}"/>', encoding='utf-8')
+    return source_dir
+
+
+def partial_run(journal_path, source_dir):
+    """A.xml converted, B.xml failed, C.xml cut off mid-record by a crash"""
+    journal = ConversionJournal(journal_path)
+    journal.record('A.xml', 'success', ConversionJournal.hash_file(source_dir / 'A.xml'), '4',
+                   output_hash='out-a')
+    journal.record('B.xml', 'failed', ConversionJournal.hash_file(source_dir / 'B.xml'), '4',
+                   error='timeout')
+    with open(journal_path, 'a', encoding='utf-8') as f:
+        f.write('{"file": "C.xml", "status": "succ')
+
+
+def pending(journal, source_dir, prompt_version='4'):
+    return sorted(path.name for path in source_dir.glob('*.xml')
+                  if not journal.is_up_to_date(path.name, ConversionJournal.hash_file(path),
+                                               prompt_version))
+
+
+def test_resume_skips_only_successful_files(tmp_path, sources):
+    journal_path = tmp_path / 'out' / '.conversion-state.jsonl'
+    partial_run(journal_path, sources)
+
+    journal = ConversionJournal(journal_path)
+    assert set(journal.records) == {'A.xml', 'B.xml'}
+    assert pending(journal, sources) == ['B.xml', 'C.xml']
+
+
+def test_changed_input_or_prompt_version_is_converted_again(tmp_path, sources):
+    journal_path = tmp_path / 'out' / '.conversion-state.jsonl'
+    partial_run(journal_path, sources)
+
+    journal = ConversionJournal(journal_path)
+    assert pending(journal, sources, prompt_version='5') == ['A.xml', 'B.xml', 'C.xml']
+    (sources / 'A.xml').write_text('<mapper namespace="changed"/>', encoding='utf-8')
+    assert pending(journal, sources) == ['A.xml', 'B.xml', 'C.xml']
+
+
+def test_second_run_completes_and_compacts(tmp_path, sources):
+    journal_path = tmp_path / 'out' / '.conversion-state.jsonl'
+    partial_run(journal_path, sources)
+
+    journal = ConversionJournal(journal_path)
+    for name in pending(journal, sources):
+        journal.record(name, 'success', ConversionJournal.hash_file(sources / name), '4')
+    # The torn line was cut off, so the appended records are not glued onto it
+    assert pending(ConversionJournal(journal_path), sources) == []
+    journal.compact()
+
+    lines = journal_path.read_text(encoding='utf-8').splitlines()
+    assert [json.loads(line)['file'] for line in lines] == ['A.xml', 'B.xml', 'C.xml']
+    assert pending(ConversionJournal(journal_path), sources) == []
@@ -0,0 +1,44 @@
+"""DictionaryJournal: resuming after a crash and releasing the journal file"""
+
+from dictionary_journal import DictionaryJournal
+
+
+def entry(name, **extra):
+    return {'table_name': name, 'columns': [{'column_name': 'C', 'data_type': 'NUMBER'}], **extra}
+
+
+def test_resume_drops_truncated_line_and_failed_tables(tmp_path):
+    path = tmp_path / 'dict.json.partial'
+    journal = DictionaryJournal(path)
+    assert journal.open('S', '2026-01-01T00:00:00') is False
+    journal.append('T1', entry('T1'))
+    journal.append('T2', {'error': 'boom'})
+    journal.close()
+    with open(path, 'ab') as f:
+        f.write(b'{"table":"T3","err')
+
+    resumed = DictionaryJournal(path)
+    assert resumed.open('S', '2026-02-02T00:00:00', resume=True) is True
+    assert resumed.generated_at == '2026-01-01T00:00:00'
+    assert resumed.completed_tables() == {'T1'}
+    resumed.append('T2', entry('T2'))
+    with resumed.tables(['T1', 'T2', 'T3']) as tables:
+        assert list(tables) == ['T1', 'T2']
+        assert tables['T2'] == entry('T2')
+        assert tables.errors == {}
+    assert tables._file.closed
+    resumed.remove()
+    assert not path.exists()
+
+
+def test_other_schema_is_not_resumed(tmp_path):
+    path = tmp_path / 'dict.json.partial'
+    journal = DictionaryJournal(path)
+    journal.open('S', '2026-01-01T00:00:00')
+    journal.append('T1', entry('T1'))
+    journal.close()
+
+    other = DictionaryJournal(path)
+    assert other.open('OTHER', '2026-02-02T00:00:00', resume=True) is False
+    assert other.completed_tables() == set()
+    other.close()
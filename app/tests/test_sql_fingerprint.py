@@ -0,0 +1,65 @@
+"""SQLFingerprinter: statements that differ only in id, layout or comments share a fingerprint"""
+
+import pytest
+
+from sql_fingerprint import SQLFingerprinter
+
+BASE = '<select id="getUser" resultType="map">SELECT A.NAME FROM TB_USER A WHERE A.ID = #{id}</select>'
+
+
+@pytest.fixture
+def fingerprinter():
+    return SQLFingerprinter()
+
+
+@pytest.mark.parametrize('variant', [
+    # Different id
+    '<select id="getUserCopy" resultType="map">SELECT A.NAME FROM TB_USER A WHERE A.ID = #{id}</select>',
+    # Attribute order and quoting
+    "<select resultType='map' id='x'>SELECT A.NAME FROM TB_USER A WHERE A.ID = #{id}</select>",
+    # Whitespace, line breaks and space next to tags
+    '<select id="getUser" resultType="map">\n    SELECT A.NAME\n      FROM TB_USER A\n'
+    '     WHERE A.ID   =   #{id}\n</select>',
+    # SQL and XML comments
+    '<select id="getUser" resultType="map"><!-- copied -->SELECT A.NAME /* name */\n'
+    'FROM TB_USER A -- user\nWHERE A.ID = #{id}</select>',
+])
+def test_equivalent_statements_normalize_alike(fingerprinter, variant):
+    assert fingerprinter.normalize(variant) == fingerprinter.normalize(BASE)
+    assert fingerprinter.fingerprint(variant) == fingerprinter.fingerprint(BASE)
+
+
+@pytest.mark.parametrize('variant', [
+    # Whitespace inside a string literal is data
+    '<select id="a" resultType="map">SELECT \'A  B\' FROM DUAL</select>',
+    # Optimizer hints change the plan
+    '<select id="a" resultType="map">SELECT /*+ INDEX(A IX_USER) */ A.NAME FROM TB_USER A '
+    'WHERE A.ID = #{id}</select>',
+    # Other root attributes
+    '<select id="getUser" resultType="hashmap">SELECT A.NAME FROM TB_USER A WHERE A.ID = #{id}</select>',
+    # Different SQL
+    '<select id="getUser" resultType="map">SELECT A.NAME FROM TB_USER A WHERE A.ID = #{userId}</select>',
+])
+def test_different_statements_keep_their_own_fingerprint(fingerprinter, variant):
+    assert fingerprinter.fingerprint(variant) != fingerprinter.fingerprint(BASE)
+
+
+def test_string_literals_are_kept_verbatim(fingerprinter):
+    normalized = fingerprinter.normalize(
+        "<select id=\"a\">SELECT 'it''s  --not a comment' FROM DUAL</select>")
+    assert normalized == "<select>SELECT 'it''s  --not a comment' FROM DUAL</select>"
+
+
+def test_fragments_are_part_of_the_fingerprint(fingerprinter):
+    statement = '<select id="a">SELECT * FROM TB_A <include refid="cond"/></select>'
+    first = fingerprinter.fingerprint(statement, {'cond': '<sql id="cond">WHERE X = 1</sql>'})
+    same = fingerprinter.fingerprint(statement, {'cond': '<sql id="cond">WHERE  X = 1</sql>'})
+    other = fingerprinter.fingerprint(statement, {'cond': '<sql id="cond">WHERE X = 2</sql>'})
+    assert first == same
+    assert first != other
+
+
+def test_rewrite_id(fingerprinter):
+    rewritten = fingerprinter.rewrite_id(BASE, 'getUserCopy')
+    assert fingerprinter.statement_id(rewritten) == 'getUserCopy'
+    assert rewritten.endswith(BASE[BASE.index('>'):])
@@ -0,0 +1,76 @@
+"""SQLTableParser: MyBatis flattening and table extraction"""
+
+from sql_table_parser import SQLTableParser
+
+
+def test_flatten_xml_splits_choose_alternatives():
+    variants, info = SQLTableParser().flatten_xml(
+        '<select id="q">SELECT * FROM <choose><when test="a">TB_A</when>'
+        '<otherwise>TB_B</otherwise></choose> WHERE 1 = 1</select>')
+
+    assert info == {'root_tag': 'select', 'has_include': False, 'xml_parsed': True}
+    assert [variant.split() for variant in variants] == [
+        ['SELECT', '*', 'FROM', 'TB_A', 'WHERE', '1', '=', '1'],
+        ['SELECT', '*', 'FROM', 'TB_B', 'WHERE', '1', '=', '1'],
+    ]
+
+
+def test_flatten_xml_without_choose_is_one_variant():
+    variants, _ = SQLTableParser().flatten_xml(
+        '<select id="q">SELECT * FROM TB_A <where><if test="x">AND X = #{x}</if></where></select>')
+
+    assert len(variants) == 1
+    assert variants[0].split() == ['SELECT', '*', 'FROM', 'TB_A', 'WHERE', 'AND', 'X', '=', '#{x}']
+
+
+def test_flatten_xml_pads_shorter_choose_with_its_last_branch():
+    variants, _ = SQLTableParser().flatten_xml(
+        '<select id="q">SELECT <choose><when test="a">A</when><when test="b">B</when>'
+        '<otherwise>C</otherwise></choose> FROM <choose><when test="t">T1</when>'
+        '<otherwise>T2</otherwise></choose></select>')
+
+    assert [variant.split() for variant in variants] == [
+        ['SELECT', 'A', 'FROM', 'T1'],
+        ['SELECT', 'B', 'FROM', 'T2'],
+        ['SELECT', 'C', 'FROM', 'T2'],
+    ]
+
+
+def test_choose_in_from_reports_every_table():
+    parsed = SQLTableParser(known_tables={'TB_A', 'TB_B'}).parse(
+        '<select id="q">SELECT a.NAME FROM <choose><when test="hist">TB_B a</when>'
+        '<otherwise>TB_A a</otherwise></choose> WHERE a.ID = #{id}</select>')
+
+    assert parsed['tables'] == ['TB_B', 'TB_A']
+    assert parsed['confidence'] == 'high'
+    # The alias names a different table per alternative; the second one is qualified by table name
+    assert {(c['qualifier'], c['column'], c['role']) for c in parsed['columns']} == {
+        ('A', 'NAME', 'other'), ('A', 'ID', 'bound'),
+        ('TB_A', 'NAME', 'other'), ('TB_A', 'ID', 'bound'),
+    }
+
+
+def test_choose_in_where_keeps_all_columns():
+    parsed = SQLTableParser().parse(
+        '<select id="q">SELECT * FROM TB_C c <where><choose><when test="x">c.X = #{x}</when>'
+        '<otherwise>c.Y = #{y}</otherwise></choose></where></select>')
+
+    assert parsed['tables'] == ['TB_C']
+    assert [(c['qualifier'], c['column'], c['role']) for c in parsed['columns']] == [
+        ('C', 'X', 'bound'), ('C', 'Y', 'bound')]
+
+
+def test_from_inside_function_arguments_is_not_a_table():
+    parsed = SQLTableParser().parse(
+        "<select id=\"q\">SELECT EXTRACT(YEAR FROM a.DT), TRIM(LEADING '0' FROM a.CD) "
+        "FROM TB_A a</select>")
+
+    assert parsed['tables'] == ['TB_A']
+    assert parsed['confidence'] == 'high'
+
+
+def test_malformed_xml_lowers_confidence():
+    parsed = SQLTableParser().parse('<select id="q">SELECT * FROM TB_A WHERE A < 1</select>')
+
+    assert parsed['tables'] == ['TB_A']
+    assert 'xml_parse_error' in parsed['reasons']
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Async Conversion Engine
+asyncio-based file scheduler with adaptive Bedrock concurrency and rate limiting
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Any, Tuple
+
+
+class TokenBucket:
+    """Thread-safe token bucket (rate=None means unlimited)"""
+
+    def __init__(self, rate: Optional[float], capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else (rate or 0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        if self.rate:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def set_rate(self, rate: Optional[float], capacity: Optional[float] = None):
+        with self.lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+            self.capacity = capacity if capacity is not None else (rate or 0)
+            self.tokens = min(self.tokens, self.capacity)
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Block until amount tokens are available, return seconds waited"""
+        waited = 0.0
+        while True:
+            with self.lock:
+                if not self.rate:
+                    return waited
+                now = time.monotonic()
+                self._refill(now)
+                # Requests larger than the bucket are admitted once it is full
+                needed = min(amount, self.capacity)
+                if self.tokens >= needed:
+                    self.tokens -= amount
+                    return waited
+                sleep_for = (needed - self.tokens) / self.rate
+            time.sleep(sleep_for)
+            waited += sleep_for
+
+    def charge(self, amount: float):
+        """Consume (or refund, if negative) tokens after the fact without blocking"""
+        with self.lock:
+            if self.rate:
+                self._refill(time.monotonic())
+                self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class AdaptiveRateLimiter:
+    """Learns the account's Bedrock request/token limits from throttling and latency
+
+    Additive increase / multiplicative decrease on two signals:
+    - ThrottlingException: in-flight concurrency is halved. Only throttles that repeat within
+      THROTTLE_WINDOW and make up THROTTLE_RATIO of the requests sent there are taken as a
+      quota: the rates the service admitted in that window become the learned TPS/TPM ceilings.
+      Each RECOVERY_SECONDS without such a burst moves the ceilings one step back toward the
+      unthrottled rates, and they are dropped once reached.
+    - Latency inflation (EWMA of seconds per output token above LATENCY_FACTOR x baseline):
+      concurrency backs off
+    """
+
+    LATENCY_FACTOR = 2.0
+    DECREASE_COOLDOWN = 2.0  # seconds between multiplicative decreases
+    WINDOW = 60.0            # seconds of history used to measure observed rates
+    THROTTLE_WINDOW = 10.0   # throttles must repeat within this many seconds to set a ceiling
+    THROTTLE_MIN_SENT = 20   # requests sent within THROTTLE_WINDOW before the share is trusted
+    THROTTLE_RATIO = 0.3     # share of those requests that must have been throttled
+    RECOVERY_SECONDS = 5.0   # throttle-free seconds per recovery step
+    RECOVERY_STEPS = 4       # steps from a learned ceiling back to the unthrottled rate
+
+    def __init__(self, initial_concurrency: int = 4, min_concurrency: int = 1,
+                 max_concurrency: int = 64):
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max(max_concurrency, min_concurrency)
+        self.concurrency = float(min(max(initial_concurrency, min_concurrency), self.max_concurrency))
+
+        # Unlimited until repeated throttles teach us the quota
+        self.request_bucket = TokenBucket(None)
+        self.token_bucket = TokenBucket(None)
+        self.learned_rps: Optional[float] = None
+        self.learned_tpm: Optional[float] = None
+        self.unthrottled_rps: Optional[float] = None
+        self.unthrottled_tpm: Optional[float] = None
+
+        self.lock = threading.Lock()
+        self.history = deque()    # (timestamp, tokens) of successful calls
+        self.sent = deque()       # timestamps of requests let through acquire()
+        self.throttles = deque()  # timestamps of throttling responses
+        self.latency_ewma: Optional[float] = None
+        self.latency_baseline: Optional[float] = None
+        self.last_decrease = 0.0
+        self.last_quota_throttle = 0.0
+        self.last_recovery = 0.0
+
+        self.stats = {
+            'requests': 0,
+            'throttles': 0,
+            'ceilings_learned': 0,
+            'latency_backoffs': 0,
+            'rate_wait_seconds': 0.0,
+            'peak_concurrency': self.concurrency
+        }
+
+    def acquire(self, estimated_tokens: int = 0) -> float:
+        """Wait for request and token budget before calling Bedrock (called from worker threads)"""
+        waited = self.request_bucket.acquire(1)
+        if estimated_tokens:
+            waited += self.token_bucket.acquire(estimated_tokens)
+        with self.lock:
+            self.sent.append(time.monotonic())
+            if waited:
+                self.stats['rate_wait_seconds'] += waited
+        return waited
+
+    def _trim_history(self, now: float):
+        while self.history and now - self.history[0][0] > self.WINDOW:
+            self.history.popleft()
+        while self.sent and now - self.sent[0] > self.THROTTLE_WINDOW:
+            self.sent.popleft()
+        while self.throttles and now - self.throttles[0] > self.THROTTLE_WINDOW:
+            self.throttles.popleft()
+
+    def _set_ceilings(self, rps: Optional[float], tpm: Optional[float]):
+        self.learned_rps = rps
+        self.learned_tpm = tpm
+        self.request_bucket.set_rate(rps, max(1.0, rps) if rps else None)
+        self.token_bucket.set_rate(tpm / 60.0 if tpm else None, tpm)
+
+    def _recover(self, now: float):
+        """Step the learned ceilings back toward the unthrottled rates after a throttle-free period"""
+        if self.learned_rps is None and self.learned_tpm is None:
+            return
+        if now - max(self.last_quota_throttle, self.last_recovery) < self.RECOVERY_SECONDS:
+            return
+        self.last_recovery = now
+
+        rps = tpm = None
+        if self.learned_rps and self.unthrottled_rps and self.learned_rps < self.unthrottled_rps:
+            step = max(self.unthrottled_rps / self.RECOVERY_STEPS, 0.1)
+            rps = min(self.unthrottled_rps, self.learned_rps + step)
+            rps = rps if rps < self.unthrottled_rps else None
+        if self.learned_tpm and self.unthrottled_tpm and self.learned_tpm < self.unthrottled_tpm:
+            step = self.unthrottled_tpm / self.RECOVERY_STEPS
+            tpm = min(self.unthrottled_tpm, self.learned_tpm + step)
+            tpm = tpm if tpm < self.unthrottled_tpm else None
+        self._set_ceilings(rps, tpm)
+
+    def on_success(self, latency: float, input_tokens: int = 0, output_tokens: int = 0,
+                   estimated_tokens: int = 0):
+        """Record a successful call and grow limits additively"""
+        now = time.monotonic()
+        tokens = input_tokens + output_tokens
+        if estimated_tokens and tokens:
+            # Settle the reservation against actual usage (refund or extra charge)
+            self.token_bucket.charge(tokens - estimated_tokens)
+
+        # Latency per generated token, so long conversions are not mistaken for congestion
+        unit_latency = latency / max(output_tokens, 1)
+
+        with self.lock:
+            self.stats['requests'] += 1
+            self.history.append((now, tokens))
+            self._trim_history(now)
+            self._recover(now)
+
+            self.latency_ewma = (unit_latency if self.latency_ewma is None
+                                 else 0.8 * self.latency_ewma + 0.2 * unit_latency)
+            if self.latency_baseline is None or unit_latency < self.latency_baseline:
+                self.latency_baseline = unit_latency
+            else:
+                # Let the baseline drift up slowly so one lucky fast call does not pin it
+                self.latency_baseline *= 1.001
+
+            if (self.latency_ewma > self.LATENCY_FACTOR * self.latency_baseline
+                    and now - self.last_decrease > self.DECREASE_COOLDOWN):
+                self.concurrency = max(self.min_concurrency, self.concurrency * 0.9)
+                self.last_decrease = now
+                self.stats['latency_backoffs'] += 1
+                return
+
+            # Additive increase: about +1 in-flight request per round of completions
+            self.concurrency = min(self.max_concurrency, self.concurrency + 1.0 / self.concurrency)
+            self.stats['peak_concurrency'] = max(self.stats['peak_concurrency'], self.concurrency)
+
+    def on_throttle(self):
+        """Record a throttling response: back off, and learn ceilings if throttles keep coming"""
+        now = time.monotonic()
+        with self.lock:
+            self.stats['throttles'] += 1
+            self.throttles.append(now)
+            self._trim_history(now)
+
+            # A transient throttle only costs concurrency; a quota throttles a steady share of requests
+            quota = (len(self.sent) >= self.THROTTLE_MIN_SENT
+                     and len(self.throttles) >= self.THROTTLE_RATIO * len(self.sent))
+            if quota:
+                self.last_quota_throttle = now
+
+            if now - self.last_decrease < self.DECREASE_COOLDOWN:
+                return
+            self.last_decrease = now
+            self.concurrency = max(self.min_concurrency, self.concurrency * 0.5)
+            if not quota:
+                return
+
+            # Rates the service admitted in the window, never less than that
+            span = max(now - self.sent[0], 1.0) if self.sent else self.THROTTLE_WINDOW
+            admitted = [t for stamp, t in self.history if now - stamp <= self.THROTTLE_WINDOW]
+            admitted_rps = max(0.1, len(admitted) / span)
+            admitted_tpm = sum(admitted) / span * 60.0
+            if self.learned_rps is None:
+                self.unthrottled_rps = max(admitted_rps, len(self.sent) / span)
+            if self.learned_tpm is None and admitted_tpm:
+                self.unthrottled_tpm = admitted_tpm * len(self.sent) / max(len(admitted), 1)
+            self._set_ceilings(admitted_rps, admitted_tpm or self.learned_tpm)
+            self.stats['ceilings_learned'] += 1
+
+    def get_limit(self) -> int:
+        with self.lock:
+            return max(self.min_concurrency, int(self.concurrency))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            stats = dict(self.stats)
+            stats['final_concurrency'] = round(self.concurrency, 2)
+            stats['peak_concurrency'] = round(stats['peak_concurrency'], 2)
+            stats['rate_wait_seconds'] = round(stats['rate_wait_seconds'], 2)
+            stats['learned_requests_per_second'] = round(self.learned_rps, 3) if self.learned_rps else None
+            stats['learned_tokens_per_minute'] = round(self.learned_tpm) if self.learned_tpm else None
+            stats['latency_baseline_ms_per_token'] = (round(self.latency_baseline * 1000, 2)
+                                                      if self.latency_baseline else None)
+            return stats
+
+
+class AsyncConversionEngine:
+    """Schedules file conversions on an event loop, keeping in-flight work at the limiter's level"""
+
+    def __init__(self, convert_fn: Callable[[Path], bool], limiter: AdaptiveRateLimiter):
+        self.convert_fn = convert_fn
+        self.limiter = limiter
+
+    async def _run(self, files: List[Path],
+                   on_done: Optional[Callable[[Path, Optional[bool], Optional[Exception]], None]]):
+        loop = asyncio.get_running_loop()
+        results: List[Tuple[Path, Optional[bool], Optional[Exception]]] = []
+        pending = deque(files)
+        in_flight = set()
+        future_to_file = {}
+
+        # Blocking boto3 calls run on threads; the pool is sized for the concurrency ceiling
+        with ThreadPoolExecutor(max_workers=self.limiter.max_concurrency) as executor:
+            while pending or in_flight:
+                while pending and len(in_flight) < self.limiter.get_limit():
+                    xml_file = pending.popleft()
+                    future = loop.run_in_executor(executor, self.convert_fn, xml_file)
+                    future_to_file[future] = xml_file
+                    in_flight.add(future)
+
+                # Wake up on completion, or periodically to pick up a raised limit
+                done, in_flight = await asyncio.wait(in_flight, timeout=0.5,
+                                                     return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    xml_file = future_to_file.pop(future)
+                    error = future.exception()
+                    ok = None if error else future.result()
+                    results.append((xml_file, ok, error))
+                    if on_done:
+                        on_done(xml_file, ok, error)
+
+        return results
+
+    def run(self, files: List[Path],
+            on_done: Optional[Callable[[Path, Optional[bool], Optional[Exception]], None]] = None
+            ) -> List[Tuple[Path, Optional[bool], Optional[Exception]]]:
+        """Convert all files, return (file, result, exception) tuples in completion order"""
+        return asyncio.run(self._run(files, on_done))
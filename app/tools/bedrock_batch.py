@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Bedrock Batch Inference
+Submit model requests as batch inference jobs (Bedrock or a local directory stand-in),
+poll them and collect the results
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import boto3
+
+
+class BatchPending(Exception):
+    """Raised while collecting batch requests: the response is not available yet
+
+    realtime=True means the request cannot be served by a batch job (e.g. its batch
+    output was truncated) and the caller should make it in real time instead.
+    """
+
+    def __init__(self, call_type: str = 'other', realtime: bool = False):
+        super().__init__(call_type)
+        self.call_type = call_type
+        self.realtime = realtime
+
+
+class BatchJobError(Exception):
+    """Raised when a batch job cannot be submitted or read"""
+
+
+class LocalBatchBackend:
+    """Directory-based stand-in for the Bedrock batch inference API
+
+    Layout per job (mirrors the S3 input/output layout of Bedrock batch jobs):
+      <batch_dir>/jobs/<job_id>/input.jsonl
+      <batch_dir>/jobs/<job_id>/status.json
+      <batch_dir>/jobs/<job_id>/output/input.jsonl.out
+
+    Jobs are processed by `python bedrock_batch.py --batch-dir DIR` (real-time
+    invoke_model), or in-process when a worker function is given.
+    """
+
+    MIN_RECORDS = 1
+    MAX_RECORDS = 50000
+
+    def __init__(self, batch_dir: str, worker: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None):
+        """
+        Args:
+            worker: modelInput -> modelOutput function used to complete jobs in-process
+        """
+        self.jobs_dir = Path(batch_dir) / 'jobs'
+        self.worker = worker
+
+    def _status_path(self, job_id: str) -> Path:
+        return self.jobs_dir / job_id / 'status.json'
+
+    def _write_status(self, job_id: str, status: str, message: str = ''):
+        status_path = self._status_path(job_id)
+        tmp_path = status_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'status': status, 'message': message,
+                       'updated_at': datetime.now().isoformat()}, f)
+        os.replace(tmp_path, status_path)
+
+    def submit(self, job_name: str, input_path: Path) -> str:
+        job_dir = self.jobs_dir / job_name
+        job_dir.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(input_path, job_dir / 'input.jsonl')
+        self._write_status(job_name, 'Submitted')
+        return job_name
+
+    def get_status(self, job_id: str) -> str:
+        status_path = self._status_path(job_id)
+        if not status_path.exists():
+            raise BatchJobError(f"Unknown local batch job: {job_id}")
+        with open(status_path, 'r', encoding='utf-8') as f:
+            status = json.load(f)['status']
+        if status == 'Submitted' and self.worker:
+            self.process(job_id, self.worker)
+            return self.get_status(job_id)
+        return status
+
+    def list_jobs(self, status: str = 'Submitted') -> List[str]:
+        """Job ids in the given status"""
+        if not self.jobs_dir.exists():
+            return []
+        return sorted(
+            path.parent.name for path in self.jobs_dir.glob('*/status.json')
+            if json.loads(path.read_text(encoding='utf-8'))['status'] == status
+        )
+
+    def process(self, job_id: str, worker: Callable[[Dict[str, Any]], Dict[str, Any]]):
+        """Run every record of a job through worker and write the output file"""
+        job_dir = self.jobs_dir / job_id
+        self._write_status(job_id, 'InProgress')
+        (job_dir / 'output').mkdir(exist_ok=True)
+
+        failed = 0
+        with open(job_dir / 'input.jsonl', 'r', encoding='utf-8') as src, \
+                open(job_dir / 'output' / 'input.jsonl.out', 'w', encoding='utf-8') as out:
+            for line in src:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                try:
+                    record['modelOutput'] = worker(record['modelInput'])
+                except Exception as e:
+                    failed += 1
+                    record['error'] = {'errorCode': type(e).__name__, 'errorMessage': str(e)}
+                out.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+        self._write_status(job_id, 'PartiallyCompleted' if failed else 'Completed',
+                           f"{failed} records failed" if failed else '')
+
+    def read_output(self, job_id: str) -> Iterator[Dict[str, Any]]:
+        output_path = self.jobs_dir / job_id / 'output' / 'input.jsonl.out'
+        if not output_path.exists():
+            return
+        with open(output_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+class BedrockBatchBackend:
+    """Bedrock batch inference (create_model_invocation_job) with S3 input/output"""
+
+    MIN_RECORDS = 100      # Bedrock rejects smaller jobs
+    MAX_RECORDS = 50000
+
+    def __init__(self, region_name: str, model_id: str, role_arn: str, s3_uri: str):
+        """
+        Args:
+            role_arn: IAM service role Bedrock assumes to read/write the S3 location
+            s3_uri: s3://bucket/prefix for job input and output
+        """
+        self.model_id = model_id
+        self.role_arn = role_arn
+        self.s3_uri = s3_uri.rstrip('/')
+        self.bedrock = boto3.client('bedrock', region_name=region_name)
+        self.s3 = boto3.client('s3', region_name=region_name)
+        self.output_uris: Dict[str, str] = {}
+
+    @staticmethod
+    def _split_s3_uri(uri: str):
+        bucket, _, key = uri[len('s3://'):].partition('/')
+        return bucket, key
+
+    def submit(self, job_name: str, input_path: Path) -> str:
+        input_uri = f"{self.s3_uri}/{job_name}/input.jsonl"
+        output_uri = f"{self.s3_uri}/{job_name}/output/"
+        bucket, key = self._split_s3_uri(input_uri)
+        self.s3.upload_file(str(input_path), bucket, key)
+
+        response = self.bedrock.create_model_invocation_job(
+            jobName=job_name,
+            roleArn=self.role_arn,
+            modelId=self.model_id,
+            inputDataConfig={'s3InputDataConfig': {'s3Uri': input_uri, 's3InputFormat': 'JSONL'}},
+            outputDataConfig={'s3OutputDataConfig': {'s3Uri': output_uri}}
+        )
+        job_arn = response['jobArn']
+        self.output_uris[job_arn] = output_uri
+        return job_arn
+
+    def get_status(self, job_id: str) -> str:
+        return self.bedrock.get_model_invocation_job(jobIdentifier=job_id)['status']
+
+    def read_output(self, job_id: str) -> Iterator[Dict[str, Any]]:
+        # Bedrock writes <output_uri>/<job id>/<input file>.out
+        bucket, prefix = self._split_s3_uri(self.output_uris[job_id] + job_id.split('/')[-1] + '/')
+        paginator = self.s3.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+            for obj in page.get('Contents', []):
+                if not obj['Key'].endswith('.jsonl.out'):
+                    continue
+                body = self.s3.get_object(Bucket=bucket, Key=obj['Key'])['Body']
+                for line in body.iter_lines():
+                    if line.strip():
+                        yield json.loads(line)
+
+
+class BatchRunner:
+    """Emits requests as JSONL, submits them as batch jobs, polls and collects results"""
+
+    TERMINAL_STATUSES = {'Completed', 'PartiallyCompleted', 'Failed', 'Stopped', 'Expired'}
+
+    def __init__(self, backend, work_dir: str, poll_interval: float = 60.0,
+                 max_wait: float = 72 * 3600):
+        self.backend = backend
+        self.work_dir = Path(work_dir)
+        self.poll_interval = poll_interval
+        self.max_wait = max_wait
+        self.stats = {
+            'jobs': 0,
+            'records': 0,
+            'succeeded': 0,
+            'failed': 0
+        }
+
+    def write_input(self, job_name: str, requests: Dict[str, Dict[str, Any]]) -> Path:
+        """Stage 1: write one JSONL record per request, return the file path"""
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        input_path = self.work_dir / f"{job_name}.jsonl"
+        with open(input_path, 'w', encoding='utf-8') as f:
+            for record_id, body in requests.items():
+                f.write(json.dumps({'recordId': record_id, 'modelInput': body}, ensure_ascii=False) + '\n')
+        return input_path
+
+    def run(self, requests: Dict[str, Dict[str, Any]], job_prefix: str = 'convert-sql') -> Dict[str, Dict[str, Any]]:
+        """Run requests (record id -> model input) as batch jobs
+
+        Returns record id -> output record ({'modelOutput': ...} or {'error': ...}).
+        Records missing from the returned dict did not produce any output.
+        """
+        record_ids = list(requests)
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        jobs = {}
+
+        # Stage 2: submit (split at the per-job record limit)
+        for start in range(0, len(record_ids), self.backend.MAX_RECORDS):
+            chunk = {rid: requests[rid] for rid in record_ids[start:start + self.backend.MAX_RECORDS]}
+            job_name = f"{job_prefix}-{stamp}-{self.stats['jobs'] + 1}"
+            input_path = self.write_input(job_name, chunk)
+            job_id = self.backend.submit(job_name, input_path)
+            jobs[job_id] = job_name
+            self.stats['jobs'] += 1
+            self.stats['records'] += len(chunk)
+            print(f"  → Batch job submitted: {job_name} ({len(chunk)} records)")
+
+        # Stage 3: poll until every job reaches a terminal state
+        statuses = {}
+        deadline = time.time() + self.max_wait
+        while True:
+            for job_id in jobs:
+                if statuses.get(job_id) not in self.TERMINAL_STATUSES:
+                    statuses[job_id] = self.backend.get_status(job_id)
+            waiting = [job_id for job_id in jobs if statuses[job_id] not in self.TERMINAL_STATUSES]
+            if not waiting:
+                break
+            if time.time() > deadline:
+                raise BatchJobError(f"Batch jobs did not finish within {self.max_wait:.0f}s: "
+                                    f"{', '.join(jobs[job_id] for job_id in waiting)}")
+            print(f"  … {len(waiting)}/{len(jobs)} batch jobs running "
+                  f"({', '.join(sorted(set(statuses[job_id] for job_id in waiting)))})")
+            time.sleep(self.poll_interval)
+
+        # Collect results
+        results = {}
+        for job_id, job_name in jobs.items():
+            status = statuses[job_id]
+            mark = '✓' if status == 'Completed' else '⚠'
+            print(f"  {mark} Batch job {job_name}: {status}")
+            for record in self.backend.read_output(job_id):
+                results[record.get('recordId')] = record
+                if 'modelOutput' in record and not record.get('error'):
+                    self.stats['succeeded'] += 1
+                else:
+                    self.stats['failed'] += 1
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats)
+
+
+def main():
+    """Process submitted local batch jobs with real-time invoke_model calls"""
+    import argparse
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from bedrock_client import BedrockClient
+
+    parser = argparse.ArgumentParser(
+        description='Local batch inference worker: completes jobs submitted with --batch-backend local'
+    )
+    parser.add_argument('--batch-dir', default='./output/batch', help='Local batch directory (default: ./output/batch)')
+    parser.add_argument('--watch', action='store_true', help='Keep polling for new jobs')
+    parser.add_argument('--interval', type=float, default=10.0, help='Polling interval with --watch (default: 10)')
+    args = parser.parse_args()
+
+    model_id = os.getenv('BEDROCK_MODEL_ID')
+    if not model_id:
+        print("Error: BEDROCK_MODEL_ID not found in environment variables")
+        sys.exit(1)
+
+    client = BedrockClient(region_name=os.getenv('BEDROCK_REGION', 'ap-northeast-2'), model_id=model_id)
+    backend = LocalBatchBackend(args.batch_dir)
+
+    while True:
+        for job_id in backend.list_jobs('Submitted'):
+            print(f"Processing {job_id}...")
+            backend.process(job_id, client.invoke_model)
+            print(f"✓ {job_id}: {backend.get_status(job_id)}")
+        if not args.watch:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Bedrock Runtime Client
+Shared invoke_model / streaming wrapper with classified retries, jittered backoff,
+per-run retry budget, circuit breaker and retry metrics
+"""
+
+import json
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import (
+    ClientError,
+    ConnectionClosedError,
+    ConnectTimeoutError,
+    EndpointConnectionError,
+    ReadTimeoutError,
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised when the circuit breaker rejects a call"""
+
+
+class RetryBudget:
+    """Per-run cap on the total number of retries across all callers"""
+
+    def __init__(self, max_retries: int):
+        self.max_retries = max_retries
+        self.used = 0
+        self.lock = threading.Lock()
+
+    def try_consume(self) -> bool:
+        with self.lock:
+            if self.max_retries is not None and self.used >= self.max_retries:
+                return False
+            self.used += 1
+            return True
+
+    def remaining(self) -> Optional[int]:
+        with self.lock:
+            return None if self.max_retries is None else self.max_retries - self.used
+
+
+class CircuitBreaker:
+    """Opens after consecutive server-side failures, probes again after reset_timeout
+
+    While half-open exactly one probe call is in flight; other callers are rejected until the
+    probe records a success (closed) or a failure (open again).
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.lock = threading.Lock()
+        self.open_count = 0
+
+    def before_call(self) -> bool:
+        """Raise CircuitOpenError if the call may not proceed; True for the half-open probe"""
+        with self.lock:
+            if self.state == 'closed':
+                return False
+            if self.state == 'open':
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    raise CircuitOpenError(
+                        f"Bedrock circuit open after {self.failures} consecutive failures")
+                self.state = 'half_open'
+            # Let one probe call through
+            if self.probe_in_flight:
+                raise CircuitOpenError("Bedrock circuit half-open, waiting for the probe call")
+            self.probe_in_flight = True
+            return True
+
+    def release_probe(self):
+        """The probe ended without a breaker signal (e.g. throttled): let the next call probe"""
+        with self.lock:
+            self.probe_in_flight = False
+
+    def record_success(self):
+        with self.lock:
+            self.state = 'closed'
+            self.failures = 0
+            self.probe_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.probe_in_flight = False
+            self.failures += 1
+            if self.state == 'half_open' or self.failures >= self.failure_threshold:
+                if self.state != 'open':
+                    self.open_count += 1
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+
+
+class BedrockClient:
+    """bedrock-runtime client shared by the conversion tools"""
+
+    THROTTLE_CODES = {'ThrottlingException', 'TooManyRequestsException', 'ServiceQuotaExceededException'}
+    TIMEOUT_CODES = {'ModelTimeoutException', 'RequestTimeout', 'RequestTimeoutException'}
+    SERVER_ERROR_CODES = {'InternalServerException', 'ServiceUnavailableException',
+                          'ModelNotReadyException', 'ServiceUnavailable', 'InternalFailure',
+                          'ModelStreamErrorException'}
+
+    # Backoff base per error class (seconds); throttling needs longer waits
+    BASE_DELAYS = {'throttle': 2.0, 'timeout': 1.0, 'server_error': 1.0}
+
+    def __init__(self, region_name: str, model_id: Optional[str] = None,
+                 max_attempts: int = 6, max_delay: float = 60.0, retry_budget: Optional[int] = 500,
+                 breaker_threshold: int = 5, breaker_reset: float = 30.0,
+                 read_timeout: int = 300, connect_timeout: int = 10,
+                 rate_limiter=None, client=None):
+        """
+        Args:
+            max_attempts: Attempts per call including the first one
+            retry_budget: Total retries allowed for this client (None = unlimited)
+            rate_limiter: Optional AdaptiveRateLimiter fed with throttling/latency signals
+            client: Pre-built bedrock-runtime client (defaults to boto3)
+        """
+        self.model_id = model_id
+        self.max_attempts = max(1, max_attempts)
+        self.max_delay = max_delay
+        self.budget = RetryBudget(retry_budget)
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_reset)
+        self.rate_limiter = rate_limiter
+
+        # botocore retries are disabled - retry policy lives here
+        self.client = client or boto3.client(
+            service_name='bedrock-runtime',
+            region_name=region_name,
+            config=Config(
+                read_timeout=read_timeout,
+                connect_timeout=connect_timeout,
+                retries={'total_max_attempts': 1, 'mode': 'standard'}
+            )
+        )
+
+        self.stats_lock = threading.Lock()
+        self.stats = {
+            'calls': 0,
+            'attempts': 0,
+            'succeeded': 0,
+            'failed': 0,
+            'retries': {'throttle': 0, 'timeout': 0, 'server_error': 0},
+            'retry_wait_seconds': 0.0,
+            'retry_wait_seconds_by_class': {'throttle': 0.0, 'timeout': 0.0, 'server_error': 0.0},
+            'budget_exhausted': 0,
+            'circuit_rejections': 0,
+            'streamed': 0,
+            'stream_aborted': 0,
+            # input_tokens is the uncached part; cache reads/writes are billed separately
+            'tokens': {'input': 0, 'output': 0, 'cache_read': 0, 'cache_write': 0}
+        }
+
+    def classify_error(self, error: Exception) -> Optional[str]:
+        """Return 'throttle', 'timeout', 'server_error' or None (not retryable)"""
+        if isinstance(error, (ReadTimeoutError, ConnectTimeoutError)):
+            return 'timeout'
+        if isinstance(error, (EndpointConnectionError, ConnectionClosedError)):
+            return 'server_error'
+        if isinstance(error, ClientError):
+            code = error.response.get('Error', {}).get('Code', '')
+            # Mid-stream EventStreamError codes are lowerCamel (throttlingException)
+            code = code[:1].upper() + code[1:]
+            status = error.response.get('ResponseMetadata', {}).get('HTTPStatusCode', 0)
+            if code in self.THROTTLE_CODES or status == 429:
+                return 'throttle'
+            if code in self.TIMEOUT_CODES or status == 408:
+                return 'timeout'
+            if code in self.SERVER_ERROR_CODES or status >= 500:
+                return 'server_error'
+        return None
+
+    def backoff_delay(self, attempt: int, error_class: str) -> float:
+        """Full-jitter exponential backoff"""
+        ceiling = min(self.max_delay, self.BASE_DELAYS.get(error_class, 1.0) * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def _count(self, key: str, amount=1):
+        with self.stats_lock:
+            self.stats[key] += amount
+
+    def record_usage(self, usage: Dict[str, Any], default_input: int) -> int:
+        """Accumulate token usage, return total input tokens (cached + uncached)"""
+        input_tokens = usage.get('input_tokens', default_input)
+        cache_read = usage.get('cache_read_input_tokens') or 0
+        cache_write = usage.get('cache_creation_input_tokens') or 0
+        with self.stats_lock:
+            tokens = self.stats['tokens']
+            tokens['input'] += input_tokens
+            tokens['output'] += usage.get('output_tokens', 0)
+            tokens['cache_read'] += cache_read
+            tokens['cache_write'] += cache_write
+        return input_tokens + cache_read + cache_write
+
+    def call_with_retries(self, operation: Callable[[], Any], estimated_tokens: int = 0,
+                          on_result: Optional[Callable[[Any, float], None]] = None) -> Any:
+        """Run operation() with the retry policy
+
+        Args:
+            operation: Performs one Bedrock request and returns its result
+            estimated_tokens: Input token estimate for the rate limiter
+            on_result: Called with (result, latency) after a successful attempt
+        """
+        self._count('calls')
+        attempt = 0
+
+        while True:
+            try:
+                probe = self.breaker.before_call()
+            except CircuitOpenError:
+                self._count('circuit_rejections')
+                self._count('failed')
+                raise
+
+            if self.rate_limiter:
+                self.rate_limiter.acquire(estimated_tokens)
+
+            self._count('attempts')
+            start = time.time()
+            try:
+                result = operation()
+            except Exception as e:
+                error_class = self.classify_error(e)
+
+                if error_class == 'throttle' and self.rate_limiter:
+                    self.rate_limiter.on_throttle()
+                if error_class in ('timeout', 'server_error'):
+                    self.breaker.record_failure()
+                elif probe:
+                    self.breaker.release_probe()
+
+                if error_class is None or attempt + 1 >= self.max_attempts:
+                    self._count('failed')
+                    raise
+                if not self.budget.try_consume():
+                    self._count('budget_exhausted')
+                    self._count('failed')
+                    raise
+
+                delay = self.backoff_delay(attempt, error_class)
+                with self.stats_lock:
+                    self.stats['retries'][error_class] += 1
+                    self.stats['retry_wait_seconds'] += delay
+                    self.stats['retry_wait_seconds_by_class'][error_class] += delay
+                print(f"    ↻ Bedrock {error_class} ({type(e).__name__}), "
+                      f"retry {attempt + 1}/{self.max_attempts - 1} in {delay:.1f}s")
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            self.breaker.record_success()
+            self._count('succeeded')
+            if on_result:
+                on_result(result, time.time() - start)
+            return result
+
+    def invoke_model(self, body: Dict[str, Any], model_id: Optional[str] = None) -> Dict[str, Any]:
+        """Invoke a model and return the parsed response body (raises after retries are exhausted)"""
+        payload = json.dumps(body)
+        estimated_tokens = len(payload) // 4
+
+        def operation():
+            response = self.client.invoke_model(modelId=model_id or self.model_id, body=payload)
+            return json.loads(response['body'].read())
+
+        def on_result(response_body, latency):
+            usage = response_body.get('usage', {})
+            input_tokens = self.record_usage(usage, estimated_tokens)
+            if self.rate_limiter:
+                self.rate_limiter.on_success(
+                    latency,
+                    input_tokens=input_tokens,
+                    output_tokens=usage.get('output_tokens', 0),
+                    estimated_tokens=estimated_tokens
+                )
+
+        return self.call_with_retries(operation, estimated_tokens, on_result)
+
+    def invoke_model_stream(self, body: Dict[str, Any], on_text: Optional[Callable[[str], bool]] = None,
+                            on_restart: Optional[Callable[[], None]] = None,
+                            model_id: Optional[str] = None) -> Dict[str, Any]:
+        """Invoke a model with invoke_model_with_response_stream
+
+        Returns a dict shaped like the invoke_model response body. on_text receives each text
+        delta as it arrives; returning False stops reading and sets stop_reason to 'aborted'.
+        on_restart is called before a retry so listeners can drop the partial text.
+        """
+        payload = json.dumps(body)
+        estimated_tokens = len(payload) // 4
+        attempts = [0]
+
+        def operation():
+            if attempts[0] and on_restart:
+                on_restart()
+            attempts[0] += 1
+
+            response = self.client.invoke_model_with_response_stream(
+                modelId=model_id or self.model_id, body=payload)
+            stream = response['body']
+            chunks = []
+            usage = {}
+            stop_reason = None
+            first_token = None
+            start = time.time()
+
+            for event in stream:
+                if 'chunk' not in event:
+                    continue
+                data = json.loads(event['chunk']['bytes'])
+                event_type = data.get('type')
+                if event_type == 'message_start':
+                    usage.update(data.get('message', {}).get('usage', {}))
+                elif event_type == 'content_block_delta':
+                    text = data.get('delta', {}).get('text', '')
+                    if not text:
+                        continue
+                    if first_token is None:
+                        first_token = time.time() - start
+                    chunks.append(text)
+                    if on_text and on_text(text) is False:
+                        stop_reason = 'aborted'
+                        if hasattr(stream, 'close'):
+                            stream.close()
+                        break
+                elif event_type == 'message_delta':
+                    stop_reason = data.get('delta', {}).get('stop_reason') or stop_reason
+                    usage.update(data.get('usage', {}))
+
+            text = ''.join(chunks)
+            # Aborted streams end before message_delta reports output usage
+            usage.setdefault('output_tokens', len(text) // 4)
+            return {
+                'content': [{'type': 'text', 'text': text}],
+                'stop_reason': stop_reason or 'end_turn',
+                'usage': usage,
+                'first_token_seconds': first_token
+            }
+
+        def on_result(response_body, latency):
+            with self.stats_lock:
+                self.stats['streamed'] += 1
+                if response_body['stop_reason'] == 'aborted':
+                    self.stats['stream_aborted'] += 1
+            input_tokens = self.record_usage(response_body['usage'], estimated_tokens)
+            if self.rate_limiter:
+                self.rate_limiter.on_success(
+                    latency,
+                    input_tokens=input_tokens,
+                    output_tokens=response_body['usage'].get('output_tokens', 0),
+                    estimated_tokens=estimated_tokens
+                )
+
+        return self.call_with_retries(operation, estimated_tokens, on_result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return retry metrics for reports"""
+        with self.stats_lock:
+            stats = json.loads(json.dumps(self.stats))
+        stats['retry_wait_seconds'] = round(stats['retry_wait_seconds'], 2)
+        stats['retry_wait_seconds_by_class'] = {
+            error_class: round(seconds, 2) for error_class, seconds in stats['retry_wait_seconds_by_class'].items()}
+        stats['total_retries'] = sum(stats['retries'].values())
+        stats['retry_budget_remaining'] = self.budget.remaining()
+        stats['circuit_state'] = self.breaker.state
+        stats['circuit_opened'] = self.breaker.open_count
+        return stats
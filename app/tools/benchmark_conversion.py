@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""
+Conversion Benchmark
+Runs convert_sql.py, scan_ognl.py and fix_type_errors.py against synthetic split mapper
+corpora through the fake Bedrock endpoint and reports throughput, latency and memory
+"""
+
+import os
+import sys
+import json
+import time
+import shlex
+import random
+import shutil
+import platform
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fake_bedrock import FakeBedrockServer
+
+
+TOOLS_DIR = Path(__file__).resolve().parent
+MAPPER_BASE = 'oms-common-sql-oracle'   # file prefix fix_type_errors.py expects
+XML_HEADER = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+              '<!DOCTYPE mapper PUBLIC "-//mybatis.org//DTD Mapper 3.0//EN" '
+              '"http://mybatis.org/dtd/mybatis-3-mapper.dtd">\n')
+
+
+class CorpusGenerator:
+    """Synthetic split mapper files, Oracle dictionary and type-cast error report"""
+
+    COLUMN_TYPES = [
+        ('VARCHAR2', {'data_length': 20}), ('VARCHAR2', {'data_length': 100}), ('CHAR', {'data_length': 1}),
+        ('NUMBER', {'data_precision': 10, 'data_scale': 0}), ('NUMBER', {'data_precision': 12, 'data_scale': 2}),
+        ('DATE', {})
+    ]
+    FRAGMENTS = 20
+    OGNL_CLASSES = ['com.bench.util.StringUtil', 'com.bench.util.DateUtil', 'com.bench.util.NumberUtil']
+    OGNL_METHODS = ['isEmpty', 'isNotEmpty', 'isBlank', 'nvl']
+
+    def __init__(self, statements: int, tables: int = 200, duplicate_rate: float = 0.1,
+                 ognl_rate: float = 0.05, type_error_rate: float = 0.01, seed: int = 42):
+        self.statements = statements
+        self.tables = tables
+        self.duplicate_rate = duplicate_rate
+        self.ognl_rate = ognl_rate
+        self.type_error_rate = type_error_rate
+        self.seed = seed
+        self.random = random.Random(seed)
+
+    def manifest(self) -> Dict[str, Any]:
+        return {
+            'statements': self.statements,
+            'tables': self.tables,
+            'duplicate_rate': self.duplicate_rate,
+            'ognl_rate': self.ognl_rate,
+            'type_error_rate': self.type_error_rate,
+            'seed': self.seed
+        }
+
+    def build_dictionary(self) -> Dict[str, Any]:
+        tables = {}
+        for t in range(1, self.tables + 1):
+            name = f"TB_BENCH_{t:04d}"
+            columns = [{'column_name': 'ID', 'data_type': 'NUMBER', 'data_precision': 10,
+                        'data_scale': 0, 'nullable': False}]
+            for c in range(1, self.random.randint(6, 14)):
+                data_type, extra = self.random.choice(self.COLUMN_TYPES)
+                columns.append(dict({'column_name': f"COL_{c:02d}", 'data_type': data_type,
+                                     'nullable': self.random.random() > 0.2}, **extra))
+            tables[name] = {'table_name': name, 'row_count': self.random.randint(0, 1000000),
+                            'comment': None, 'columns': columns, 'primary_key': ['ID']}
+        return {'schema': 'BENCH', 'generated_at': datetime.now().isoformat(),
+                'table_count': len(tables), 'tables': tables}
+
+    def _table(self) -> str:
+        return f"TB_BENCH_{self.random.randint(1, self.tables):04d}"
+
+    def _statement(self, index: int) -> str:
+        """One statement element with a unique id (ids contain no '_', see split file naming)"""
+        a, b = self._table(), self._table()
+        kind = self.random.choice(['select', 'select', 'select', 'join', 'insert', 'update', 'delete',
+                                   'dual', 'include', 'dynamic'])
+        if self.random.random() < self.ognl_rate:
+            kind = 'ognl'
+
+        if kind == 'select':
+            return (f'<select id="selectBench{index:06d}" parameterType="map" resultType="map">\n'
+                    f'    SELECT ID, NVL(COL_01, \'-\') AS COL_01, COL_02\n      FROM {a}\n'
+                    f'     WHERE ID = #{{id}}\n       AND COL_02 &gt;= #{{fromValue}}\n</select>')
+        if kind == 'join':
+            return (f'<select id="selectBenchJoin{index:06d}" parameterType="map" resultType="map">\n'
+                    f'    SELECT A.ID, A.COL_01, B.COL_02, DECODE(A.COL_03, \'Y\', 1, 0) AS FLAG\n'
+                    f'      FROM {a} A\n     INNER JOIN {b} B ON A.ID = B.ID\n'
+                    f'     WHERE A.COL_01 = #{{code}}\n       AND ROWNUM &lt;= 100\n</select>')
+        if kind == 'insert':
+            return (f'<insert id="insertBench{index:06d}" parameterType="map">\n'
+                    f'    INSERT INTO {a} (ID, COL_01, COL_02)\n'
+                    f'    VALUES (#{{id}}, #{{col01}}, SYSDATE)\n</insert>')
+        if kind == 'update':
+            return (f'<update id="updateBench{index:06d}" parameterType="map">\n'
+                    f'    UPDATE {a}\n       SET COL_01 = NVL(#{{col01}}, COL_01)\n'
+                    f'     WHERE ID = #{{id}}\n</update>')
+        if kind == 'delete':
+            return (f'<delete id="deleteBench{index:06d}" parameterType="map">\n'
+                    f'    DELETE FROM {a} WHERE ID = #{{id}}\n</delete>')
+        if kind == 'dual':
+            return (f'<select id="selectBenchSeq{index:06d}" resultType="long">\n'
+                    f'    SELECT SQ_BENCH_{index % 50:02d}.NEXTVAL FROM DUAL\n</select>')
+        if kind == 'include':
+            return (f'<select id="selectBenchInc{index:06d}" parameterType="map" resultType="map">\n'
+                    f'    SELECT ID, COL_01\n      FROM {a}\n'
+                    f'    <include refid="benchWhere{self.random.randint(1, self.FRAGMENTS):02d}"/>\n</select>')
+        if kind == 'dynamic':
+            return (f'<select id="selectBenchDyn{index:06d}" parameterType="map" resultType="map">\n'
+                    f'    SELECT ID, COL_01, COL_02\n      FROM {a}\n    <where>\n'
+                    f'      <if test="code != null">AND COL_01 = #{{code}}</if>\n'
+                    f'      <if test="ids != null">AND ID IN\n'
+                    f'        <foreach collection="ids" item="item" open="(" separator="," close=")">'
+                    f'#{{item}}</foreach>\n      </if>\n    </where>\n</select>')
+
+        ognl_class = self.random.choice(self.OGNL_CLASSES)
+        method = self.random.choice(self.OGNL_METHODS)
+        return (f'<select id="selectBenchOgnl{index:06d}" parameterType="map" resultType="map">\n'
+                f'    SELECT ID, COL_01\n      FROM {a}\n    <where>\n'
+                f'      <if test="@{ognl_class}@{method}(code)">AND COL_01 = #{{code}}</if>\n'
+                f'    </where>\n</select>')
+
+    @staticmethod
+    def _write_split_file(path: Path, element: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(XML_HEADER)
+            f.write(f'<mapper namespace="com.bench.mapper.BenchMapper">\n  {element}\n</mapper>\n')
+
+    def generate(self, corpus_dir: Path):
+        """Write source/, output/oracle_dictionary.json and output/type-cast-errors.json"""
+        source_dir = corpus_dir / 'source'
+        output_dir = corpus_dir / 'output'
+        if corpus_dir.exists():
+            shutil.rmtree(corpus_dir)
+        source_dir.mkdir(parents=True)
+        output_dir.mkdir(parents=True)
+
+        with open(output_dir / 'oracle_dictionary.json', 'w', encoding='utf-8') as f:
+            json.dump(self.build_dictionary(), f, ensure_ascii=False)
+
+        for n in range(1, self.FRAGMENTS + 1):
+            refid = f"benchWhere{n:02d}"
+            self._write_split_file(
+                source_dir / f"{MAPPER_BASE}_fragment_{refid}.xml",
+                f'<sql id="{refid}">\n    WHERE ID = #{{id}}\n      AND NVL(COL_01, \' \') = #{{code}}\n</sql>')
+
+        statement_ids = []
+        generated: List[str] = []
+        for index in range(1, self.statements + 1):
+            if generated and self.random.random() < self.duplicate_rate:
+                # Copy-pasted statement: same SQL, new id
+                source = self.random.choice(generated)
+                old_id = source.split('id="', 1)[1].split('"', 1)[0]
+                element = source.replace(f'id="{old_id}"', f'id="{old_id}Copy{index:06d}"', 1)
+            else:
+                element = self._statement(index)
+                generated.append(element)
+            statement_id = element.split('id="', 1)[1].split('"', 1)[0]
+            statement_ids.append(statement_id)
+            self._write_split_file(source_dir / f"{MAPPER_BASE}_{statement_id}.xml", element)
+
+        errors = [{'sql_id': statement_id,
+                   'pg_error': 'ERROR: operator does not exist: character varying = integer'}
+                  for statement_id in self.random.sample(
+                      statement_ids, max(1, round(len(statement_ids) * self.type_error_rate)))]
+        with open(output_dir / 'type-cast-errors.json', 'w', encoding='utf-8') as f:
+            json.dump({'errors': errors}, f, indent=2)
+
+        with open(corpus_dir / 'manifest.json', 'w', encoding='utf-8') as f:
+            json.dump(self.manifest(), f, indent=2)
+
+    def ensure(self, corpus_dir: Path) -> bool:
+        """Generate the corpus unless an identical one exists; True if generated"""
+        manifest_path = corpus_dir / 'manifest.json'
+        if manifest_path.exists():
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                if json.load(f) == self.manifest():
+                    return False
+        self.generate(corpus_dir)
+        return True
+
+
+class ConversionBenchmark:
+    """Runs each tool as a subprocess against the fake endpoint and collects measurements"""
+
+    TOOLS = ['convert_sql', 'scan_ognl', 'fix_type_errors']
+
+    def __init__(self, work_dir: str, server: FakeBedrockServer, model_id: str,
+                 convert_args: Optional[List[str]] = None, timeout: Optional[float] = None):
+        self.work_dir = Path(work_dir).resolve()
+        self.server = server
+        self.model_id = model_id
+        self.convert_args = convert_args or []
+        self.timeout = timeout
+
+    def tool_env(self) -> Dict[str, str]:
+        env = dict(os.environ)
+        env.update({
+            'AWS_ENDPOINT_URL_BEDROCK_RUNTIME': self.server.endpoint_url,
+            'AWS_ACCESS_KEY_ID': 'fake',
+            'AWS_SECRET_ACCESS_KEY': 'fake',
+            'BEDROCK_MODEL_ID': self.model_id,
+            'BEDROCK_REGION': 'us-east-1',
+            'PYTHONUNBUFFERED': '1'
+        })
+        env.pop('AWS_SESSION_TOKEN', None)
+        env.pop('AWS_PROFILE', None)
+        return env
+
+    def command(self, tool: str, corpus_dir: Path) -> List[str]:
+        """Command line for a tool; resets the directories the tool writes to"""
+        python = sys.executable
+        if tool == 'convert_sql':
+            target_dir = corpus_dir / 'convert'
+            shutil.rmtree(target_dir, ignore_errors=True)
+            target_dir.mkdir()
+            return [python, str(TOOLS_DIR / 'convert_sql.py'),
+                    '--source-dir', str(corpus_dir / 'source'), '--target-dir', str(target_dir),
+                    '--dict-path', str(corpus_dir / 'output' / 'oracle_dictionary.json'),
+                    '--no-cache'] + self.convert_args
+        if tool == 'scan_ognl':
+            handler_dir = corpus_dir / 'ognl_handlers'
+            shutil.rmtree(handler_dir, ignore_errors=True)
+            return [python, str(TOOLS_DIR / 'scan_ognl.py'),
+                    '--source-dir', str(corpus_dir / 'source'), '--output-dir', str(handler_dir),
+                    '--generate', '--skip-build', '--skip-env-update']
+        # fix_type_errors rewrites files in place: work on a copy of the converted (or source) files
+        fix_dir = corpus_dir / 'fix'
+        shutil.rmtree(fix_dir, ignore_errors=True)
+        converted = corpus_dir / 'convert'
+        shutil.copytree(converted if any(converted.glob('*.xml')) else corpus_dir / 'source', fix_dir)
+        return [python, str(TOOLS_DIR / 'fix_type_errors.py'),
+                str(corpus_dir / 'output' / 'type-cast-errors.json'), str(fix_dir)]
+
+    @staticmethod
+    def items(tool: str, corpus_dir: Path) -> int:
+        """Units of work a tool processes (for throughput)"""
+        if tool == 'fix_type_errors':
+            with open(corpus_dir / 'output' / 'type-cast-errors.json', 'r', encoding='utf-8') as f:
+                return len(json.load(f)['errors'])
+        return sum(1 for _ in (corpus_dir / 'source').glob('*.xml'))
+
+    def run_tool(self, tool: str, size: int, corpus_dir: Path) -> Dict[str, Any]:
+        command = self.command(tool, corpus_dir)
+        log_path = corpus_dir / 'logs' / f"{tool}.log"
+        log_path.parent.mkdir(exist_ok=True)
+        items = self.items(tool, corpus_dir)
+
+        print(f"  → {tool}: {items:,} items")
+        self.server.reset_stats()
+        start = time.time()
+        timed_out = False
+        with open(log_path, 'w', encoding='utf-8') as log:
+            process = subprocess.Popen(command, cwd=corpus_dir, env=self.tool_env(),
+                                       stdout=log, stderr=subprocess.STDOUT)
+            # wait4 (instead of Popen.wait) also reports the child's peak resident set size
+            deadline = start + self.timeout if self.timeout else None
+            while True:
+                pid, status, rusage = os.wait4(process.pid, os.WNOHANG if deadline else 0)
+                if pid:
+                    break
+                if time.time() > deadline:
+                    timed_out = True
+                    process.kill()
+                    deadline = None
+                    continue
+                time.sleep(0.2)
+            process.returncode = os.waitstatus_to_exitcode(status)
+        wall = time.time() - start
+
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        peak_rss_mb = rusage.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+        result = {
+            'size': size,
+            'tool': tool,
+            'items': items,
+            'exit_code': process.returncode,
+            'timed_out': timed_out,
+            'wall_seconds': round(wall, 2),
+            'throughput_per_second': round(items / wall, 2) if wall > 0 else None,
+            'peak_rss_mb': round(peak_rss_mb, 1),
+            'server': self.server.get_stats(),
+            'log': str(log_path)
+        }
+
+        if tool == 'convert_sql':
+            report_path = corpus_dir / 'output' / 'conversion-report.json'
+            if report_path.exists():
+                with open(report_path, 'r', encoding='utf-8') as f:
+                    report = json.load(f)
+                summary = report.get('conversion_summary', {})
+                performance = report.get('conversion_performance', {})
+                metrics = performance.get('llm_metrics', {})
+                result['conversion'] = {
+                    'converted_files': summary.get('converted_files'),
+                    'failed_files': summary.get('failed_files'),
+                    'llm_calls': performance.get('llm_calls'),
+                    'dedupe': performance.get('dedupe'),
+                    'llm_latency_seconds': metrics.get('latency_seconds'),
+                    'llm_latency_by_call_type': {
+                        call_type: entry.get('latency_seconds')
+                        for call_type, entry in metrics.get('by_call_type', {}).items()},
+                    'tokens': metrics.get('tokens')
+                }
+
+        mark = '✓' if process.returncode == 0 and not timed_out else '✗'
+        latency = result['server']['latency_seconds']
+        print(f"  {mark} {tool}: {wall:.1f}s, {result['throughput_per_second']}/s, "
+              f"peak RSS {result['peak_rss_mb']} MB, {result['server']['requests']} LLM requests "
+              f"(server p50/p95/p99 {latency['p50']}/{latency['p95']}/{latency['p99']}s)")
+        if process.returncode != 0 or timed_out:
+            print(f"    See log: {log_path}")
+        return result
+
+
+def compare_with_baseline(runs: List[Dict[str, Any]], baseline: Dict[str, Any],
+                          tolerance: float) -> List[Dict[str, Any]]:
+    """Throughput drops, memory growth and latency growth beyond tolerance"""
+    previous = {(run['size'], run['tool']): run for run in baseline.get('runs', [])}
+    regressions = []
+
+    def check(run, metric, current, before, higher_is_better):
+        if current is None or not before:
+            return
+        change = (current - before) / before
+        if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+            regressions.append({'size': run['size'], 'tool': run['tool'], 'metric': metric,
+                                'baseline': before, 'current': current,
+                                'change': f"{change * 100:+.1f}%"})
+
+    for run in runs:
+        before = previous.get((run['size'], run['tool']))
+        if not before:
+            continue
+        check(run, 'throughput_per_second', run['throughput_per_second'], before['throughput_per_second'], True)
+        check(run, 'peak_rss_mb', run['peak_rss_mb'], before['peak_rss_mb'], False)
+        if 'conversion' in run and 'conversion' in before:
+            current_p95 = (run['conversion'].get('llm_latency_seconds') or {}).get('p95')
+            before_p95 = (before['conversion'].get('llm_latency_seconds') or {}).get('p95')
+            check(run, 'llm_latency_p95_seconds', current_p95, before_p95, False)
+    return regressions
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Benchmark the conversion tools against synthetic corpora and a fake Bedrock endpoint'
+    )
+    parser.add_argument('--sizes', default='1000',
+                        help='Comma-separated corpus sizes in statements, e.g. 1000,10000,100000 (default: 1000)')
+    parser.add_argument('--tools', default=','.join(ConversionBenchmark.TOOLS),
+                        help=f"Comma-separated tools to run (default: {','.join(ConversionBenchmark.TOOLS)})")
+    parser.add_argument('--work-dir', default='./output/benchmark',
+                        help='Corpora, tool outputs and logs (default: ./output/benchmark)')
+    parser.add_argument('--report', default='./output/benchmark-report.json',
+                        help='Benchmark report path (default: ./output/benchmark-report.json)')
+    parser.add_argument('--baseline', help='Previous benchmark report to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help='Relative change counted as a regression (default: 0.10)')
+    parser.add_argument('--convert-args', default='',
+                        help='Extra convert_sql.py arguments, e.g. --convert-args="--engine thread --parallel 16"')
+    parser.add_argument('--timeout', type=float, help='Kill a tool run after this many seconds')
+    parser.add_argument('--model-id', default='fake.anthropic.claude-bench',
+                        help='Model id sent to the fake endpoint (default: fake.anthropic.claude-bench)')
+
+    corpus = parser.add_argument_group('synthetic corpus')
+    corpus.add_argument('--tables', type=int, default=200, help='Tables in the synthetic dictionary (default: 200)')
+    corpus.add_argument('--duplicate-rate', type=float, default=0.1,
+                        help='Fraction of copy-pasted statements (default: 0.1)')
+    corpus.add_argument('--ognl-rate', type=float, default=0.05,
+                        help='Fraction of statements with OGNL expressions (default: 0.05)')
+    corpus.add_argument('--type-error-rate', type=float, default=0.01,
+                        help='Fraction of statements listed in the type-cast error report (default: 0.01)')
+    corpus.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+
+    fake = parser.add_argument_group('fake Bedrock endpoint')
+    fake.add_argument('--latency-ms', type=float, default=50, help='Base latency per request (default: 50)')
+    fake.add_argument('--ms-per-token', type=float, default=0.2,
+                      help='Generation time per output token (default: 0.2)')
+    fake.add_argument('--jitter-ms', type=float, default=20, help='Uniform random extra latency (default: 20)')
+    fake.add_argument('--throttle-rate', type=float, default=0.0,
+                      help='Fraction of requests throttled (default: 0)')
+    fake.add_argument('--max-rps', type=float, help='Throttle requests above this rate (default: unlimited)')
+    fake.add_argument('--server-error-rate', type=float, default=0.0,
+                      help='Fraction of requests failing with a 500 (default: 0)')
+    fake.add_argument('--malformed-rate', type=float, default=0.0,
+                      help='Fraction of conversion answers with malformed JSON (default: 0)')
+    fake.add_argument('--truncate-rate', type=float, default=0.0,
+                      help='Fraction of answers truncated at max_tokens (default: 0)')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    tools = [tool.strip() for tool in args.tools.split(',') if tool.strip()]
+    unknown = [tool for tool in tools if tool not in ConversionBenchmark.TOOLS]
+    if unknown:
+        print(f"Error: unknown tools: {', '.join(unknown)}")
+        sys.exit(1)
+
+    fake_settings = {
+        'latency_ms': args.latency_ms, 'ms_per_token': args.ms_per_token, 'jitter_ms': args.jitter_ms,
+        'throttle_rate': args.throttle_rate, 'server_error_rate': args.server_error_rate,
+        'max_rps': args.max_rps, 'malformed_rate': args.malformed_rate,
+        'truncate_rate': args.truncate_rate, 'seed': args.seed
+    }
+    server = FakeBedrockServer(**fake_settings).start()
+    benchmark = ConversionBenchmark(args.work_dir, server, args.model_id,
+                                    convert_args=shlex.split(args.convert_args), timeout=args.timeout)
+
+    print("=== Conversion Benchmark ===\n")
+    print(f"Fake Bedrock: {server.endpoint_url}")
+    print(f"Sizes: {', '.join(f'{size:,}' for size in sizes)} statements")
+    print(f"Tools: {', '.join(tools)}\n")
+
+    runs = []
+    try:
+        for size in sizes:
+            corpus_dir = benchmark.work_dir / f"corpus-{size}"
+            generator = CorpusGenerator(size, tables=args.tables, duplicate_rate=args.duplicate_rate,
+                                        ognl_rate=args.ognl_rate, type_error_rate=args.type_error_rate,
+                                        seed=args.seed)
+            start = time.time()
+            if generator.ensure(corpus_dir):
+                print(f"[{size:,}] Corpus generated in {time.time() - start:.1f}s: {corpus_dir}")
+            else:
+                print(f"[{size:,}] Reusing corpus: {corpus_dir}")
+
+            for tool in tools:
+                runs.append(benchmark.run_tool(tool, size, corpus_dir))
+            print()
+    finally:
+        server.stop()
+
+    report = {
+        'generated_at': datetime.now().isoformat(),
+        'host': {'python': platform.python_version(), 'platform': platform.platform(),
+                 'cpu_count': os.cpu_count()},
+        'fake_bedrock': fake_settings,
+        'convert_args': args.convert_args,
+        'runs': runs,
+        'regressions': []
+    }
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            report['regressions'] = compare_with_baseline(runs, json.load(f), args.tolerance)
+        report['baseline'] = args.baseline
+
+    report_path = Path(args.report)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print("=" * 70)
+    print(f"{'Tool':<18}{'Size':>9}{'Wall(s)':>10}{'Items/s':>10}{'RSS(MB)':>10}{'p95(s)':>9}")
+    print("=" * 70)
+    for run in runs:
+        print(f"{run['tool']:<18}{run['size']:>9,}{run['wall_seconds']:>10}"
+              f"{run['throughput_per_second'] or 0:>10}{run['peak_rss_mb'] or 0:>10}"
+              f"{run['server']['latency_seconds']['p95'] or '-':>9}")
+    print("=" * 70)
+    print(f"\n✓ Benchmark report saved to: {report_path}")
+
+    failed = [run for run in runs if run['exit_code'] != 0 or run['timed_out']]
+    if failed:
+        print(f"✗ {len(failed)} tool runs failed: "
+              f"{', '.join(run['tool'] + '@' + str(run['size']) for run in failed)}")
+    if args.baseline:
+        if report['regressions']:
+            print(f"⚠ {len(report['regressions'])} regressions vs {args.baseline} (tolerance {args.tolerance:.0%}):")
+            for regression in report['regressions']:
+                print(f"  - {regression['tool']}@{regression['size']:,} {regression['metric']}: "
+                      f"{regression['baseline']} → {regression['current']} ({regression['change']})")
+        else:
+            print(f"✓ No regressions vs {args.baseline}")
+
+    if failed or report['regressions']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
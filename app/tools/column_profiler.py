@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Column Profiler
+Value ranges, null fractions and maximum lengths of all columns of a table in one aggregate scan
+"""
+
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import oracledb
+
+
+class ColumnProfiler:
+    """Opt-in data profile for the Oracle dictionary
+
+    One SELECT of aggregates per table (COUNT(*) plus, per column, the non-null count and the
+    type-specific aggregates below), optionally over SAMPLE (sample_percent) SEED (1):
+
+        NUMBER/FLOAT     min, max, has_fraction (any value with a fractional part)
+        DATE             min, max, has_fraction (any value with a time of day)
+        TIMESTAMP        min, max
+        character        min, max (cut to MAX_VALUE_CHARS), max_length
+        CLOB/BLOB/RAW    max_length (characters or bytes)
+
+    Per column: {"null_fraction", "min", "max", "max_length", "has_fraction"} without the keys
+    that do not apply. Columns of other types (LONG, BFILE, XMLTYPE, ...) are not profiled.
+    Values of a sampled profile are estimates: min/max are those of the sampled rows.
+    """
+
+    NUMERIC_TYPES = ('NUMBER', 'FLOAT', 'BINARY_FLOAT', 'BINARY_DOUBLE')
+    CHAR_TYPES = ('VARCHAR2', 'VARCHAR', 'CHAR', 'NVARCHAR2', 'NCHAR')
+    LOB_TYPES = ('CLOB', 'NCLOB', 'BLOB')
+    # Oracle allows 1000 select list expressions: wide tables are profiled in several scans
+    MAX_EXPRESSIONS = 900
+    MAX_VALUE_CHARS = 100
+
+    def __init__(self, schema: str, sample_percent: Optional[float] = None):
+        self.schema = schema
+        self.sample_percent = sample_percent
+
+        self._lock = threading.Lock()
+        self.stats = {
+            'tables': 0,
+            'queries': 0,
+            'columns_profiled': 0,
+            'fallbacks': 0,
+            'errors': 0
+        }
+
+    @staticmethod
+    def _quote(identifier: str) -> str:
+        return '"' + identifier.replace('"', '""') + '"'
+
+    def _expressions(self, column: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """(profile key, aggregate) pairs of one column, empty for unprofiled types"""
+        data_type = (column.get('data_type') or '').upper()
+        name = self._quote(column['column_name'])
+        if data_type in self.NUMERIC_TYPES or data_type == 'DATE':
+            return [('count', f"COUNT({name})"), ('min', f"MIN({name})"), ('max', f"MAX({name})"),
+                    ('has_fraction', f"MAX(CASE WHEN {name} <> TRUNC({name}) THEN 1 ELSE 0 END)")]
+        if data_type.startswith('TIMESTAMP'):
+            return [('count', f"COUNT({name})"), ('min', f"MIN({name})"), ('max', f"MAX({name})")]
+        if data_type in self.CHAR_TYPES:
+            return [('count', f"COUNT({name})"),
+                    ('min', f"SUBSTR(MIN({name}), 1, {self.MAX_VALUE_CHARS})"),
+                    ('max', f"SUBSTR(MAX({name}), 1, {self.MAX_VALUE_CHARS})"),
+                    ('max_length', f"MAX(LENGTH({name}))")]
+        if data_type in self.LOB_TYPES:
+            return [('count', f"COUNT(CASE WHEN {name} IS NOT NULL THEN 1 END)"),
+                    ('max_length', f"MAX(DBMS_LOB.GETLENGTH({name}))")]
+        if data_type == 'RAW':
+            return [('count', f"COUNT({name})"), ('max_length', f"MAX(UTL_RAW.LENGTH({name}))")]
+        return []
+
+    @staticmethod
+    def _value(value: Any) -> Any:
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if value is None or isinstance(value, (int, float, str)):
+            return value
+        return str(value)
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def _chunks(self, columns: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        chunks, current, size = [], [], 0
+        for column in columns:
+            width = len(self._expressions(column))
+            if current and size + width > self.MAX_EXPRESSIONS:
+                chunks.append(current)
+                current, size = [], 0
+            current.append(column)
+            size += width
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _scan(self, connection, table_name: str, columns: List[Dict[str, Any]],
+              profiles: Dict[str, Dict[str, Any]]) -> int:
+        """One aggregate query over the given columns; returns the number of rows scanned"""
+        layout = [(column['column_name'], key) for column in columns
+                  for key, _ in self._expressions(column)]
+        expressions = [expression for column in columns for _, expression in self._expressions(column)]
+        source = f"{self._quote(self.schema)}.{self._quote(table_name)}"
+        if self.sample_percent:
+            # A fixed seed keeps the chunks of a wide table on the same sampled rows
+            source += f" SAMPLE ({self.sample_percent}) SEED (1)"
+
+        cursor = connection.cursor()
+        try:
+            cursor.execute(f"SELECT COUNT(*), {', '.join(expressions)} FROM {source}")
+            self._count('queries')
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+
+        rows = row[0]
+        raw: Dict[str, Dict[str, Any]] = {}
+        for (column_name, key), value in zip(layout, row[1:]):
+            raw.setdefault(column_name, {})[key] = value
+        for column_name, values in raw.items():
+            count = values.pop('count')
+            profile = {"null_fraction": round(1 - count / rows, 4) if rows else None}
+            for key, value in values.items():
+                if key == 'has_fraction':
+                    profile[key] = bool(value) if count else None
+                else:
+                    profile[key] = self._value(value)
+            profiles[column_name] = {key: value for key, value in profile.items()
+                                     if value is not None}
+        return rows
+
+    def profile_table(self, connection, table_name: str,
+                      columns: List[Dict[str, Any]]) -> Tuple[Optional[int], Dict[str, Dict[str, Any]]]:
+        """(rows scanned, column_name -> profile) for one table"""
+        profiled_columns = [column for column in columns if self._expressions(column)]
+        profiles: Dict[str, Dict[str, Any]] = {}
+        if not profiled_columns:
+            return None, profiles
+        self._count('tables')
+
+        rows = None
+        for chunk in self._chunks(profiled_columns):
+            try:
+                rows = self._scan(connection, table_name, chunk, profiles)
+            except oracledb.Error:
+                # e.g. an aggregate a column type does not support: isolate it per column
+                self._count('fallbacks')
+                for column in chunk:
+                    try:
+                        rows = self._scan(connection, table_name, [column], profiles)
+                    except oracledb.Error:
+                        self._count('errors')
+
+        self._count('columns_profiled', len(profiles))
+        return rows, profiles
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats, sample_percent=self.sample_percent)
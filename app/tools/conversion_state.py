@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Conversion State Journal
+Durable per-file conversion state used by convert_sql.py --resume
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, Iterable
+
+
+class ConversionJournal:
+    """Append-only JSON lines journal: one record per file conversion attempt (last record wins)"""
+
+    SUCCESS_STATUSES = {'success'}
+
+    def __init__(self, journal_path: Path):
+        self.journal_path = Path(journal_path)
+        self.lock = threading.Lock()
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self.load()
+
+    @staticmethod
+    def hash_file(path: Path) -> Optional[str]:
+        """SHA-256 of a file's bytes, None if it does not exist"""
+        try:
+            digest = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+            return digest.hexdigest()
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def hash_files(paths: Iterable[Path]) -> Optional[str]:
+        """Combined hash of several output files (missing files are skipped)"""
+        digest = hashlib.sha256()
+        found = False
+        for path in paths:
+            file_hash = ConversionJournal.hash_file(path)
+            if file_hash:
+                digest.update(f"{Path(path).name}:{file_hash}\n".encode('utf-8'))
+                found = True
+        return digest.hexdigest() if found else None
+
+    def load(self):
+        """Replay the journal; a torn last line from a crash is cut off before appending"""
+        self.records = {}
+        if not self.journal_path.exists():
+            return
+
+        valid_end = 0
+        with open(self.journal_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                valid_end += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line.decode('utf-8'))
+                except (UnicodeDecodeError, json.JSONDecodeError):
+                    continue
+                self.records[record['file']] = record
+
+        if valid_end < self.journal_path.stat().st_size:
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(valid_end)
+
+    def record(self, file_name: str, status: str, input_hash: Optional[str],
+               prompt_version: str, output_hash: Optional[str] = None, error: Optional[str] = None):
+        """Append one record and fsync so it survives a crash"""
+        record = {
+            'file': file_name,
+            'status': status,
+            'input_hash': input_hash,
+            'output_hash': output_hash,
+            'prompt_version': prompt_version,
+            'error': error,
+            'updated_at': datetime.now().isoformat()
+        }
+
+        with self.lock:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self.records[file_name] = record
+
+    def is_up_to_date(self, file_name: str, input_hash: str, prompt_version: str) -> bool:
+        """True if the file already converted successfully from the same input and prompt version"""
+        record = self.records.get(file_name)
+        return bool(
+            record
+            and record['status'] in self.SUCCESS_STATUSES
+            and record['input_hash'] == input_hash
+            and record['prompt_version'] == prompt_version
+        )
+
+    def compact(self):
+        """Rewrite the journal with only the latest record per file (atomic replace)"""
+        with self.lock:
+            if not self.records:
+                return
+            fd, tmp_path = tempfile.mkstemp(dir=self.journal_path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                for file_name in sorted(self.records):
+                    f.write(json.dumps(self.records[file_name], ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.journal_path)
@@ -7,8 +7,8 @@ Generates test case files with bind variable mappings
 
 import os
 import sys
+import copy
 import json
-import boto3
 import xml.etree.ElementTree as ET
 from pathlib import Path
 from typing import Dict, List, Any, Optional
@@ -20,21 +20,53 @@ from datetime import datetime
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from llm_cache import LLMCache
+from dictionary_index import DictionaryIndex
+from dictionary_client import is_dictionary_url
+from dictionary_store import load_dictionary_file
+from sql_table_parser import SQLTableParser
+from async_engine import AdaptiveRateLimiter, AsyncConversionEngine
+from bedrock_client import BedrockClient
+from conversion_state import ConversionJournal
+from stream_json import IncrementalJSONValidator
+from bedrock_batch import BatchPending, BatchRunner, BedrockBatchBackend, LocalBatchBackend
+from sql_fingerprint import SQLFingerprinter
+from fragment_index import FragmentIndex
+from schema_context import SchemaContextBuilder
+from llm_metrics import LLMMetrics
+
 
 class SQLConverter:
     """SQL converter using Bedrock LLM"""
 
+    # Bump whenever prompts or output post-processing change, so --resume reconverts
+    PROMPT_VERSION = '4'
+
+    # Bedrock does not cache prompt prefixes shorter than this (Claude Sonnet/Opus minimum)
+    MIN_CACHE_PREFIX_TOKENS = 1024
+
+    # Batch inference rounds (table extraction -> conversion -> json_fix)
+    MAX_BATCH_ROUNDS = 4
+
     def __init__(self, source_dir: str, target_dir: str, dict_path: str,
-                 target_db: str, bedrock_region: str, model_id: str, max_workers: int = 7):
+                 target_db: str, bedrock_region: str, model_id: str, max_workers: int = 7,
+                 use_cache: bool = True, cache_dir: Optional[str] = None,
+                 cache_max_size_mb: int = 1024, cache_max_age_days: int = 30,
+                 engine: str = 'async', max_concurrency: int = 64, resume: bool = False,
+                 stream: bool = False, prompt_caching: bool = True,
+                 batch_backend=None, batch_dir: str = './output/batch', batch_poll_interval: float = 60.0,
+                 dedupe: bool = True, metrics_file: Optional[str] = None,
+                 schema_context: str = 'referenced', schema_token_budget: Optional[int] = 2000):
         # Convert to absolute paths
         self.source_dir = Path(source_dir).resolve()
         self.target_dir = Path(target_dir).resolve()
-        self.dict_path = Path(dict_path).resolve()
+        # A dictionary server URL (http://, unix://) is used as is
+        self.dict_path = dict_path if is_dictionary_url(dict_path) else Path(dict_path).resolve()
 
         # Validate paths
         if not self.source_dir.exists():
             raise FileNotFoundError(f"Source directory not found: {self.source_dir}")
-        if not self.dict_path.exists():
+        if not is_dictionary_url(self.dict_path) and not self.dict_path.exists():
             raise FileNotFoundError(f"Dictionary file not found: {self.dict_path}")
 
         # Create target directory
@@ -44,14 +76,79 @@ class SQLConverter:
         self.bedrock_region = bedrock_region
         self.model_id = model_id
         self.max_workers = max_workers
+        self.engine = engine
+        self.resume = resume
+        self.stream = stream  # invoke_model_with_response_stream + incremental JSON validation
+        self.prompt_caching = prompt_caching  # Bedrock cache points on system prompt / schema block
+
+        # Token / latency metrics per LLM call (optionally exported for Prometheus)
+        self.metrics = LLMMetrics()
+        self.metrics_file = metrics_file
+
+        # Statement deduplication: convert one file per SQL fingerprint, reuse for the rest
+        self.dedupe = dedupe
+        self.fingerprinter = SQLFingerprinter()
+        self.file_fingerprints = {}        # file name -> fingerprint
+        self.dedupe_representatives = {}   # fingerprint -> file converted with the LLM
+        self.dedupe_candidates = {}        # fingerprint -> conversion of the representative
+        self.dedupe_results = {}           # fingerprint -> conversion reusable by duplicates
+        self.llm_requests = threading.local()  # LLM requests made by the current file
+
+        # Batch inference mode: collect requests, run them as batch jobs, replay files
+        self.batch_runner = (BatchRunner(batch_backend, batch_dir, poll_interval=batch_poll_interval)
+                             if batch_backend else None)
+        self.batch_collecting = False
+        self.batch_requests = {}   # LLM cache key -> (call type, request body) for the next job
+        self.batch_responses = {}  # LLM cache key -> response text from finished jobs
+        self.batch_realtime_keys = set()  # requests whose batch output was truncated
+        self.batch_stats = {
+            'rounds': 0,
+            'truncated': 0,
+            'realtime_files': 0
+        }
+
+        # Durable per-file state journal (status, input hash, output hash)
+        self.journal = ConversionJournal(self.target_dir / '.conversion-state.jsonl')
+        self.prompt_version = f"{self.PROMPT_VERSION}:{target_db}:{model_id}"
+        self.input_hashes = {}  # file name -> source hash for this run
+
+        # Adaptive concurrency / rate limiting for the async engine
+        # (starts at max_workers in-flight files and learns the account quota)
+        self.rate_limiter = None
+        if engine == 'async':
+            self.rate_limiter = AdaptiveRateLimiter(
+                initial_concurrency=max_workers,
+                max_concurrency=max_concurrency
+            )
 
         # Load Oracle dictionary
         self.oracle_dict = self.load_dictionary()
+        self.dict_index = DictionaryIndex(self.oracle_dict)
+
+        # <sql> fragment files, parsed once and shared by all workers
+        self.fragment_index = FragmentIndex(self.source_dir)
 
-        # Initialize Bedrock client
-        self.bedrock = boto3.client(
-            service_name='bedrock-runtime',
-            region_name=bedrock_region
+        # Local table extractor (LLM is only used when the parser is not confident);
+        # views and synonyms count as known tables
+        self.table_parser = SQLTableParser(known_tables=self.dict_index.object_names())
+
+        # Step 2 schema block: referenced columns within a token budget, or every column (full)
+        self.schema_context = schema_context
+        self.schema_builder = SchemaContextBuilder(self.dict_index, token_budget=schema_token_budget)
+
+        # Initialize Bedrock client (retries, backoff and circuit breaker are shared across tools)
+        self.bedrock = BedrockClient(
+            region_name=bedrock_region,
+            model_id=model_id,
+            rate_limiter=self.rate_limiter
+        )
+
+        # Persistent LLM response cache (reruns skip identical prompts)
+        self.llm_cache = LLMCache(
+            cache_dir=cache_dir or './output/llm_cache',
+            max_size_mb=cache_max_size_mb,
+            max_age_days=cache_max_age_days,
+            enabled=use_cache
         )
 
         # Thread lock for stats
@@ -61,6 +158,7 @@ class SQLConverter:
             'converted_files': 0,
             'failed_files': 0,
             'skipped_files': 0,
+            'resumed_files': 0,
             'errors': [],
             'conversion_times': {},  # file -> seconds
             'llm_calls': {
@@ -68,6 +166,33 @@ class SQLConverter:
                 'sql_conversion': 0,
                 'json_fix': 0
             },
+            'table_extraction': {
+                'parser': 0,
+                'llm_fallback': 0
+            },
+            'streaming': {
+                'malformed_json_aborts': 0,
+                'json_repaired_locally': 0
+            },
+            'cache_points': {
+                'system': 0,
+                'schema': 0,
+                'below_minimum': 0
+            },
+            'dedupe': {
+                'groups': 0,
+                'duplicate_files': 0,
+                'reused_files': 0,
+                'llm_calls_saved': 0
+            },
+            'schema_context': {
+                'prompts': 0,
+                'tokens': 0,
+                'columns_available': 0,
+                'columns_included': 0,
+                'columns_omitted': 0,
+                'budget_truncated': 0
+            },
             'tables_discovered': set(),
             'tables_matched': set(),
             'tables_not_found': set(),
@@ -79,43 +204,17 @@ class SQLConverter:
         self.end_time = None
 
     def load_dictionary(self) -> Dict:
-        """Load Oracle dictionary"""
-        if not self.dict_path.exists():
+        """Load Oracle dictionary (JSON, or a SQLite dictionary / dictionary server opened lazily)"""
+        if not is_dictionary_url(self.dict_path) and not self.dict_path.exists():
             print(f"Warning: Oracle dictionary not found at {self.dict_path}")
             return {}
 
-        with open(self.dict_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return load_dictionary_file(self.dict_path)
 
     def lookup_column(self, table_column: str) -> Optional[Dict[str, Any]]:
         """Lookup column info from dictionary"""
-        try:
-            parts = table_column.upper().split('.')
-            if len(parts) != 2:
-                return None
-
-            table_name, column_name = parts
-
-            if table_name not in self.oracle_dict.get('tables', {}):
-                return None
-
-            table_info = self.oracle_dict['tables'][table_name]
-
-            for column in table_info.get('columns', []):
-                if column['column_name'] == column_name:
-                    return {
-                        'table_name': table_name,
-                        'column_name': column_name,
-                        'data_type': column['data_type'],
-                        'data_length': column.get('data_length'),
-                        'data_precision': column.get('data_precision'),
-                        'data_scale': column.get('data_scale'),
-                        'sample_value': column.get('sample_value'),
-                        'nullable': column.get('nullable')
-                    }
-            return None
-        except Exception:
-            return None
+        record = self.dict_index.lookup_qualified(table_column)
+        return record.to_dict() if record else None
 
     def extract_sql_from_xml(self, xml_path: Path) -> Optional[Dict[str, Any]]:
         """Extract SQL content and common elements from mapper XML"""
@@ -149,97 +248,142 @@ class SQLConverter:
             return None
 
     def find_included_fragments(self, sql_xml: str, xml_path: Path) -> Dict[str, str]:
-        """Find and load fragment files referenced by <include refid="..."/>"""
-
-        # Extract base mapper name (e.g., oms-common-sql-oracle from oms-common-sql-oracle_selectXXX.xml)
-        base_name = xml_path.stem.rsplit('_', 1)[0] if '_' in xml_path.stem else xml_path.stem
-
-        # Parse SQL XML to find <include> tags
-        refids = []
-        try:
-            # Wrap in temporary root if needed
-            if not sql_xml.strip().startswith('<?xml'):
-                wrapped_xml = f'<root>{sql_xml}</root>'
-            else:
-                wrapped_xml = sql_xml
-
-            temp_root = ET.fromstring(wrapped_xml)
-
-            # Find all <include> elements recursively
-            for elem in temp_root.iter('include'):
-                refid = elem.get('refid')
-                if refid:
-                    refids.append(refid)
-        except ET.ParseError:
-            # If XML parsing fails, SQL might be malformed but continue anyway
-            pass
+        """Find fragments referenced by <include refid="..."/>, including nested and cross-namespace ones
 
-        fragments = {}
-        for refid in refids:
-            # Look for fragment file: base_name_fragment_refid.xml
-            fragment_file = self.source_dir / f"{base_name}_fragment_{refid}.xml"
-
-            if fragment_file.exists():
-                try:
-                    tree = ET.parse(fragment_file)
-                    root = tree.getroot()
-
-                    # Find the sql element with matching id
-                    for child in root:
-                        if child.tag == 'sql' and child.get('id') == refid:
-                            fragment_content = ET.tostring(child, encoding='unicode', method='xml')
-                            fragments[refid] = fragment_content
-                            break
-                except Exception as e:
-                    print(f"    ⚠ Error loading fragment {refid}: {e}")
-
-        return fragments
+        Fragment files are parsed once per run by the shared FragmentIndex.
+        """
+        index = self.fragment_index.build()
+        return index.fragments_for(sql_xml, index.base_name(xml_path))
 
-    def call_bedrock(self, prompt: str, system_prompt: str, call_type: str = 'other') -> Optional[str]:
+    def call_bedrock(self, prompt: str, system_prompt: str, call_type: str = 'other',
+                     json_validator: Optional[IncrementalJSONValidator] = None,
+                     prompt_prefix: Optional[str] = None, cache_prefix: bool = True) -> Optional[str]:
         """Call Bedrock LLM with continuation support for long responses
 
         Args:
             call_type: 'table_extraction', 'sql_conversion', 'json_fix', or 'other'
+            json_validator: Fed with the response text; in streaming mode generation stops
+                            as soon as it reports malformed JSON
+            prompt_prefix: Leading part of the user prompt (e.g. schema information)
+            cache_prefix: prompt_prefix repeats across calls and gets its own prompt-cache point
         """
+        # Check response cache first (keyed on the full prompt text, cache points or not)
+        full_prompt = f"{prompt_prefix}\n\n{prompt}" if prompt_prefix else prompt
+        cache_key = LLMCache.make_key(self.model_id, system_prompt, full_prompt, call_type)
+        cached_response = self.batch_responses.get(cache_key)
+        cache_source = 'batch'
+        if cached_response is None:
+            cached_response = self.llm_cache.get(cache_key)
+            cache_source = 'response_cache'
+
+        # LLM calls of the current file (what reusing its conversion saves); batch results
+        # count, local response cache hits cost nothing
+        if cached_response is None or cache_source == 'batch':
+            self.llm_requests.count = getattr(self.llm_requests, 'count', 0) + 1
+
+        if cached_response is not None:
+            self.metrics.record_cache_hit(call_type, cache_source)
+            if json_validator:
+                json_validator.feed(cached_response)
+            return cached_response
+
+        if self.prompt_caching:
+            # Cache points: system prompt, then system prompt + shared prefix, each only when
+            # the prefix up to it is long enough for Bedrock to cache
+            cache_point = {"type": "ephemeral"}
+            system = [{"type": "text", "text": system_prompt}]
+            content = [{"type": "text", "text": prompt}]
+            prefix_tokens = SchemaContextBuilder.estimate_tokens(system_prompt)
+            placed = []
+            if prefix_tokens >= self.MIN_CACHE_PREFIX_TOKENS:
+                system[0]["cache_control"] = cache_point
+                placed.append('system')
+            if prompt_prefix:
+                content.insert(0, {"type": "text", "text": prompt_prefix})
+                prefix_tokens += SchemaContextBuilder.estimate_tokens(prompt_prefix)
+                if cache_prefix and prefix_tokens >= self.MIN_CACHE_PREFIX_TOKENS:
+                    content[0]["cache_control"] = cache_point
+                    placed.append('schema')
+            with self.stats_lock:
+                for point in placed or ['below_minimum']:
+                    self.stats['cache_points'][point] += 1
+        else:
+            system = system_prompt
+            content = full_prompt
+
+        messages = [
+            {
+                "role": "user",
+                "content": content
+            }
+        ]
+
+        # Batch mode: queue the request; the file is converted again once the job finishes
+        # (batch jobs are already discounted, so no prompt-cache points)
+        if self.batch_collecting:
+            self.defer_to_batch(cache_key, {
+                "anthropic_version": "bedrock-2023-05-31",
+                "max_tokens": 8192,
+                "system": system_prompt,
+                "messages": [{"role": "user", "content": full_prompt}]
+            }, call_type)
+
         # Record LLM call
         if call_type in self.stats['llm_calls']:
             with self.stats_lock:
                 self.stats['llm_calls'][call_type] += 1
 
         try:
-            messages = [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
 
             full_response = ""
             max_continuations = 3  # Prevent infinite loops
             continuation_count = 0
+            call_start = time.time()
+            usage = {}  # summed over continuation segments
 
             while continuation_count < max_continuations:
                 body = {
                     "anthropic_version": "bedrock-2023-05-31",
                     "max_tokens": 8192,
-                    "system": system_prompt,
+                    "system": system,
                     "messages": messages
                 }
 
                 # Note: temperature is deprecated for Opus 4.7+ models
                 # Do not add temperature parameter
 
-                response = self.bedrock.invoke_model(
-                    modelId=self.model_id,
-                    body=json.dumps(body)
-                )
-
-                response_body = json.loads(response['body'].read())
+                if self.stream:
+                    def restart_validation():
+                        # A retried attempt streams this segment again from the start
+                        json_validator.reset()
+                        json_validator.feed(full_response)
+
+                    response_body = self.bedrock.invoke_model_stream(
+                        body,
+                        on_text=json_validator.feed if json_validator else None,
+                        on_restart=restart_validation if json_validator else None
+                    )
+                else:
+                    response_body = self.bedrock.invoke_model(body)
                 content = response_body['content'][0]['text']
                 stop_reason = response_body.get('stop_reason', 'end_turn')
+                for key, value in response_body.get('usage', {}).items():
+                    if isinstance(value, int):
+                        usage[key] = usage.get(key, 0) + value
 
                 full_response += content
 
+                if not self.stream and json_validator:
+                    json_validator.feed(content)
+
+                if stop_reason == 'aborted':
+                    # Malformed JSON: no point generating the rest of it
+                    print(f"    ⚠ Malformed JSON while streaming ({json_validator.error}), stopped early")
+                    with self.stats_lock:
+                        self.stats['streaming']['malformed_json_aborts'] += 1
+                    self.record_llm_metrics(call_type, usage, call_start, continuation_count)
+                    return full_response
+
                 # If response completed naturally, we're done
                 if stop_reason != 'max_tokens':
                     break
@@ -260,33 +404,56 @@ class SQLConverter:
 
             if continuation_count >= max_continuations:
                 print(f"    ⚠ Warning: Response may be incomplete after {max_continuations} continuations")
+            else:
+                # Only cache complete responses
+                self.llm_cache.put(cache_key, full_response, {
+                    'model_id': self.model_id,
+                    'call_type': call_type
+                })
 
+            self.record_llm_metrics(call_type, usage, call_start, continuation_count)
             return full_response
 
         except Exception as e:
             print(f"  ✗ Bedrock error: {e}")
             return None
 
-    def convert_sql(self, xml_path: Path) -> Optional[Dict[str, Any]]:
-        """Convert SQL using LLM"""
-        print(f"  Converting: {xml_path.name}")
-
-        # Extract SQL and common elements from XML
-        extracted = self.extract_sql_from_xml(xml_path)
-        if not extracted or not extracted['sql_element']:
-            return None
-
-        sql_xml = extracted['sql_element']
-        namespace = extracted['namespace']
-        common_elements = extracted['common_elements']
-
-        # Find and load included fragments
-        included_fragments = self.find_included_fragments(sql_xml, xml_path)
-        if included_fragments:
-            print(f"    ℹ Found {len(included_fragments)} included fragments: {', '.join(included_fragments.keys())}")
-
-        # Step 1: Ask LLM to extract table names from SQL
-        print(f"    → Step 1: LLM extracts table names from SQL")
+    def record_llm_metrics(self, call_type: str, usage: Dict[str, Any], call_start: float,
+                           continuations: int):
+        """Record tokens and end-to-end latency of one call for the current file"""
+        self.metrics.record(call_type, usage, latency=time.time() - call_start,
+                            continuations=continuations,
+                            file_name=getattr(self.llm_requests, 'file', None))
+
+    def defer_to_batch(self, cache_key: str, body: Dict[str, Any], call_type: str):
+        """Queue a request for the next batch job and stop converting the current file"""
+        if cache_key in self.batch_realtime_keys:
+            raise BatchPending(call_type, realtime=True)
+        with self.stats_lock:
+            if cache_key not in self.batch_requests:
+                self.batch_requests[cache_key] = (call_type, body)
+                if call_type in self.stats['llm_calls']:
+                    self.stats['llm_calls'][call_type] += 1
+        raise BatchPending(call_type)
+
+    def extract_tables(self, sql_xml: str) -> List[str]:
+        """Extract table names with the local parser, falling back to the LLM"""
+        parsed = self.table_parser.parse(sql_xml)
+
+        if parsed['confidence'] == 'high':
+            with self.stats_lock:
+                self.stats['table_extraction']['parser'] += 1
+            tables = parsed['tables']
+            print(f"    → Step 1: Parser found {len(tables)} tables: {', '.join(tables)}")
+            return tables
+
+        with self.stats_lock:
+            self.stats['table_extraction']['llm_fallback'] += 1
+        print(f"    → Step 1: Parser not confident ({', '.join(parsed['reasons'])}), LLM extracts table names")
+        return self.extract_tables_with_llm(sql_xml)
+
+    def extract_tables_with_llm(self, sql_xml: str) -> List[str]:
+        """Ask LLM to extract table names from SQL"""
         table_extraction_prompt = f"""Analyze this SQL and extract all table names used.
 
 SQL:
@@ -334,15 +501,67 @@ Output JSON only, no markdown."""
                 # Fallback: empty list (LLM will still convert SQL without schema info)
                 tables = []
 
+        return tables
+
+    def convert_sql(self, xml_path: Path) -> Optional[Dict[str, Any]]:
+        """Convert SQL using LLM"""
+        print(f"  Converting: {xml_path.name}")
+        self.llm_requests.file = xml_path.name
+
+        # Extract SQL and common elements from XML
+        extracted = self.extract_sql_from_xml(xml_path)
+        if not extracted or not extracted['sql_element']:
+            return None
+
+        sql_xml = extracted['sql_element']
+        namespace = extracted['namespace']
+        common_elements = extracted['common_elements']
+
+        # Find and load included fragments
+        included_fragments = self.find_included_fragments(sql_xml, xml_path)
+        if included_fragments:
+            print(f"    ℹ Found {len(included_fragments)} included fragments: {', '.join(included_fragments.keys())}")
+
+        # Same SQL as an already converted statement: reuse its conversion
+        fingerprint = self.file_fingerprints.get(xml_path.name)
+        if fingerprint in self.dedupe_results:
+            result = self.reuse_conversion(self.dedupe_results[fingerprint], sql_xml,
+                                           namespace, common_elements)
+            if result:
+                return result
+        self.llm_requests.count = 0
+
+        # Step 1: Extract table names locally, fall back to LLM on low confidence
+        tables = self.extract_tables(sql_xml)
+
         # Step 2: Build column type information from dictionary
+        # (a remote dictionary serves all tables of the statement in one request)
+        self.dict_index.prefetch(tables)
         column_types_info = ""
-        if self.oracle_dict and 'tables' in self.oracle_dict and tables:
-            column_types_info = "\n\n=== Oracle Schema Information ===\n"
-
-            for table_name in tables:
+        if self.schema_context == 'referenced' and tables:
+            # Columns referenced by the statement or its fragments, resolved through the alias map
+            parsed = self.table_parser.parse(sql_xml + ''.join(included_fragments.values()))
+            column_types_info, context_stats = self.schema_builder.build(parsed, tables)
+            with self.stats_lock:
+                context_totals = self.stats['schema_context']
+                context_totals['prompts'] += 1
+                context_totals['tokens'] += context_stats['tokens']
+                context_totals['columns_available'] += context_stats['columns_available']
+                context_totals['columns_included'] += context_stats['columns_included']
+                context_totals['columns_omitted'] += context_stats['columns_omitted']
+                if context_stats['columns_omitted']:
+                    context_totals['budget_truncated'] += 1
+            print(f"    → Step 2: Schema information built for {len(tables)} tables "
+                  f"({context_stats['columns_included']}/{context_stats['columns_available']} columns, "
+                  f"~{context_stats['tokens']} tokens)")
+        elif self.oracle_dict and 'tables' in self.oracle_dict and tables:
+            column_types_info = "=== Oracle Schema Information ===\n"
+
+            # Sorted so statements over the same tables share one prompt-cache prefix
+            for table_name in sorted(set(t.upper() for t in tables)):
                 table_upper = table_name.upper()
-                if table_upper in self.oracle_dict['tables']:
-                    table_info = self.oracle_dict['tables'][table_upper]
+                table_info = self.dict_index.get_object_info(table_upper)
+                if table_info is not None:
                     column_types_info += f"\nTable: {table_upper}\n"
                     for col in table_info.get('columns', [])[:50]:  # Limit to 50 columns
                         column_types_info += f"  {col['column_name']}: {col['data_type']}"
@@ -368,7 +587,7 @@ Output JSON only, no markdown."""
 
                         column_types_info += "\n"
 
-        print(f"    → Step 2: Schema information built for {len(tables)} tables")
+            print(f"    → Step 2: Schema information built for {len(tables)} tables")
 
         # Prepare LLM prompt
         system_prompt = f"""You are an expert database migration specialist.
@@ -381,7 +600,7 @@ IMPORTANT: Whether this is a <select>/<insert>/<update>/<delete> OR a <sql> frag
 
 Key requirements:
 1. Convert Oracle syntax to {self.target_db} syntax
-2. Add EXPLICIT TYPE CASTING for ALL operations using Schema Information below:
+2. Add EXPLICIT TYPE CASTING for ALL operations using the Schema Information in the user message:
 
    A. ARITHMETIC OPERATIONS (+ - * /):
       - Check column type in Schema Information
@@ -418,7 +637,7 @@ Key requirements:
    - VARCHAR2(20): max 20 characters
    - NUMBER(10,2): max 10 digits total, 2 decimal places
    - NOT NULL: never use null values
-   - Use column length/precision from schema info below
+   - Use column length/precision from the Schema Information
 
 TYPE CASTING DECISION TABLE (Use Schema Information):
 Column Type | Operation Type | Cast To
@@ -438,25 +657,7 @@ Output MUST be valid JSON with this structure:
   "test_cases": [
     {{"description": "...", "parameters": {{...}}}}
   ]
-}}"""
-
-        # Add fragment information if any
-        fragment_info = ""
-        if included_fragments:
-            fragment_info = "\n\n=== Included SQL Fragments ===\n"
-            fragment_info += "NOTE: This main SQL includes fragments via <include refid=\"...\"/> tags.\n"
-            fragment_info += "IMPORTANT:\n"
-            fragment_info += "- KEEP <include> tags as-is in the converted XML (do NOT inline fragment content)\n"
-            fragment_info += "- Use fragment content below ONLY for extracting bind variables and generating test cases\n"
-            fragment_info += "- Fragment files themselves are converted separately\n\n"
-            for refid, fragment_content in included_fragments.items():
-                fragment_info += f"Fragment ID: {refid}\n{fragment_content}\n\n"
-
-        prompt = f"""Convert this Oracle MyBatis mapper to {self.target_db}:
-
-{sql_xml}
-{column_types_info}
-{fragment_info}
+}}
 
 Requirements:
 - Convert Oracle functions (NVL→COALESCE, DECODE, etc)
@@ -472,7 +673,7 @@ TEST CASE VALUE RULES:
 - Check NOT NULL: never generate null for NOT NULL columns
 - Generate realistic business values based on column name and type
 
-TYPE CASTING RULES based on schema above:
+TYPE CASTING RULES based on the Schema Information:
 - NUMBER columns → ::INTEGER (for IDs, counts) or ::NUMERIC (for rates, amounts)
 - DATE/TIMESTAMP columns → ::TIMESTAMP
 - VARCHAR/CHAR columns → NO CASTING (do not add ::VARCHAR)
@@ -483,11 +684,38 @@ Example:
   #{{createDate}}::TIMESTAMP (if createDate is DATE)
   #{{userName}}            (if userName is VARCHAR - NO CASTING)
 
+INCLUDED SQL FRAGMENTS (when the mapper includes fragments via <include refid="..."/> tags,
+their content is listed under "=== Included SQL Fragments ==="):
+- KEEP <include> tags as-is in the converted XML (do NOT inline fragment content)
+- Use fragment content ONLY for extracting bind variables and generating test cases
+- Fragment files themselves are converted separately
+
+Output JSON only, no markdown."""
+
+        # Add fragment information if any
+        fragment_info = ""
+        if included_fragments:
+            fragment_info = "\n\n=== Included SQL Fragments ===\n"
+            for refid, fragment_content in included_fragments.items():
+                fragment_info += f"Fragment ID: {refid}\n{fragment_content}\n\n"
+
+        # Fixed rules live in the system prompt and schema information precedes the statement,
+        # so the prompt-cache prefix is the same for every statement (and its tables, with full context)
+        prompt = f"""Convert this Oracle MyBatis mapper to {self.target_db}:
+
+{sql_xml}
+{fragment_info}
+
 Output JSON only, no markdown."""
 
         # Step 3: Call LLM for SQL conversion
         print(f"    → Step 3: LLM converts SQL to {self.target_db}")
-        response = self.call_bedrock(prompt, system_prompt, call_type='sql_conversion')
+        json_validator = IncrementalJSONValidator()
+        # The schema block is only shared across statements when it lists whole tables
+        response = self.call_bedrock(prompt, system_prompt, call_type='sql_conversion',
+                                     json_validator=json_validator,
+                                     prompt_prefix=column_types_info or None,
+                                     cache_prefix=self.schema_context == 'full')
         if not response:
             return None
 
@@ -507,58 +735,65 @@ Output JSON only, no markdown."""
             try:
                 result = json.loads(response)
             except json.JSONDecodeError as e:
-                # If parsing fails, ask LLM to fix the JSON
-                print(f"  ⚠ JSON parsing failed: {e}")
-                print(f"  → Asking LLM to regenerate valid JSON...")
+                if json_validator.is_valid():
+                    # Only raw newlines / stray backslashes in strings - repaired while reading
+                    result = json_validator.result()
+                    print(f"  ✓ JSON repaired locally ({json_validator.repairs} fixes), json_fix skipped")
+                    with self.stats_lock:
+                        self.stats['streaming']['json_repaired_locally'] += 1
+                else:
+                    # If parsing fails, ask LLM to fix the JSON
+                    print(f"  ⚠ JSON parsing failed: {e}")
+                    print(f"  → Asking LLM to regenerate valid JSON...")
 
-                fix_prompt = f"""The previous JSON response was malformed. Please regenerate it with proper escaping.
+                    fix_prompt = f"""The previous JSON response was malformed. Please regenerate it with proper escaping.
 
-Original (broken) JSON:
-{response[:1000]}...
+    Original (broken) JSON:
+    {response[:1000]}...
 
-Requirements:
-- Escape all special characters in XML content (newlines, quotes, etc.)
-- Ensure valid JSON structure
-- Do NOT use markdown code blocks
-
-Output ONLY the corrected JSON, nothing else."""
-
-                fixed_response = self.call_bedrock(fix_prompt,
-                                                   "You are a JSON formatter. Fix malformed JSON.",
-                                                   call_type='json_fix')
-
-                if not fixed_response:
-                    print(f"  ✗ Failed to fix JSON")
-                    return None
-
-                # Clean and try parsing fixed response
-                fixed_response = fixed_response.strip()
-                if fixed_response.startswith('```json'):
-                    fixed_response = fixed_response[7:]
-                if fixed_response.startswith('```'):
-                    fixed_response = fixed_response[3:]
-                if fixed_response.endswith('```'):
-                    fixed_response = fixed_response[:-3]
-                fixed_response = fixed_response.strip()
-
-                # Find JSON object boundaries
-                json_start = fixed_response.find('{')
-                json_end = fixed_response.rfind('}') + 1
-
-                if json_start >= 0 and json_end > json_start:
-                    json_str = fixed_response[json_start:json_end]
-
-                    # Try parsing again
-                    try:
-                        result = json.loads(json_str)
-                        print(f"  ✓ JSON fixed by LLM")
-                    except json.JSONDecodeError as e2:
-                        print(f"  ✗ JSON still invalid after LLM fix: {e2}")
-                        print(f"  → Giving up on this file")
+    Requirements:
+    - Escape all special characters in XML content (newlines, quotes, etc.)
+    - Ensure valid JSON structure
+    - Do NOT use markdown code blocks
+
+    Output ONLY the corrected JSON, nothing else."""
+
+                    fixed_response = self.call_bedrock(fix_prompt,
+                                                       "You are a JSON formatter. Fix malformed JSON.",
+                                                       call_type='json_fix')
+
+                    if not fixed_response:
+                        print(f"  ✗ Failed to fix JSON")
+                        return None
+
+                    # Clean and try parsing fixed response
+                    fixed_response = fixed_response.strip()
+                    if fixed_response.startswith('```json'):
+                        fixed_response = fixed_response[7:]
+                    if fixed_response.startswith('```'):
+                        fixed_response = fixed_response[3:]
+                    if fixed_response.endswith('```'):
+                        fixed_response = fixed_response[:-3]
+                    fixed_response = fixed_response.strip()
+
+                    # Find JSON object boundaries
+                    json_start = fixed_response.find('{')
+                    json_end = fixed_response.rfind('}') + 1
+
+                    if json_start >= 0 and json_end > json_start:
+                        json_str = fixed_response[json_start:json_end]
+
+                        # Try parsing again
+                        try:
+                            result = json.loads(json_str)
+                            print(f"  ✓ JSON fixed by LLM")
+                        except json.JSONDecodeError as e2:
+                            print(f"  ✗ JSON still invalid after LLM fix: {e2}")
+                            print(f"  → Giving up on this file")
+                            return None
+                    else:
+                        print(f"  ✗ Could not find JSON boundaries in fixed response")
                         return None
-                else:
-                    print(f"  ✗ Could not find JSON boundaries in fixed response")
-                    return None
 
             # Add namespace, common elements, original SQL, and tables to result
             result['namespace'] = namespace
@@ -566,22 +801,54 @@ Output ONLY the corrected JSON, nothing else."""
             result['original_sql'] = sql_xml
             result['tables_found'] = tables  # From Phase 2
 
+            # Keep the conversion for duplicates of this statement (used once the file is written)
+            if fingerprint and self.dedupe_representatives.get(fingerprint) == xml_path.name:
+                self.dedupe_candidates[fingerprint] = {
+                    'file': xml_path.name,
+                    'llm_requests': self.llm_requests.count,
+                    'result': copy.deepcopy({key: result[key] for key in
+                                             ('converted_xml', 'bind_variables', 'test_cases', 'tables_found')
+                                             if key in result})
+                }
+
             # Record tables statistics
             with self.stats_lock:
                 for table in tables:
                     self.stats['tables_discovered'].add(table)
-                    if table.upper() in self.oracle_dict.get('tables', {}):
+                    if self.dict_index.has_table(table):
                         self.stats['tables_matched'].add(table)
                     else:
                         self.stats['tables_not_found'].add(table)
 
             return result
 
+        except BatchPending:
+            raise
         except (json.JSONDecodeError, Exception) as e:
             print(f"  ✗ JSON parse error: {e}")
             print(f"  Response preview: {response[:200]}...")
             return None
 
+    def reuse_conversion(self, shared: Dict[str, Any], sql_xml: str, namespace: str,
+                         common_elements: List[Any]) -> Optional[Dict[str, Any]]:
+        """Result of a statement with the same fingerprint, rewritten for this statement's id"""
+        result = copy.deepcopy(shared['result'])
+        statement_id = self.fingerprinter.statement_id(sql_xml)
+        if statement_id:
+            result['converted_xml'] = self.fingerprinter.rewrite_id(result['converted_xml'], statement_id)
+            if self.fingerprinter.statement_id(result['converted_xml']) != statement_id:
+                return None  # converted XML has no recognizable root element - convert normally
+
+        result['namespace'] = namespace
+        result['common_elements'] = common_elements
+        result['original_sql'] = sql_xml
+
+        with self.stats_lock:
+            self.stats['dedupe']['reused_files'] += 1
+            self.stats['dedupe']['llm_calls_saved'] += shared['llm_requests']
+        print(f"    ≡ Same SQL as {shared['file']}, reusing its conversion")
+        return result
+
     def add_explicit_casting(self, xml_content: str, bind_mappings: Dict[str, str]) -> str:
         """Add explicit type casting for numeric and date types"""
         modified = xml_content
@@ -612,7 +879,7 @@ Output ONLY the corrected JSON, nothing else."""
     def extract_schema_info_from_xml(self, xml_content: str) -> str:
         """
         Extract schema information for tables mentioned in XML
-        Uses LLM-based approach (no regex) - asks LLM to identify tables
+        Uses the shared table matcher (Aho-Corasick over dictionary table names)
         """
         if not self.oracle_dict or 'tables' not in self.oracle_dict:
             return ""
@@ -624,18 +891,14 @@ Output ONLY the corrected JSON, nothing else."""
         schema_info = "\n=== Oracle Schema Information ===\n"
         schema_info += "Note: Column types in Oracle (for type casting reference)\n\n"
 
-        # Get tables that are likely relevant (from XML content)
-        # Simple string matching without regex
-        relevant_tables = []
-        for table_name in self.oracle_dict['tables'].keys():
-            if table_name in xml_content.upper():
-                relevant_tables.append(table_name)
+        # Get tables that are likely relevant (whole-word matches in a single pass)
+        relevant_tables = self.dict_index.find_tables(xml_content)
 
         if not relevant_tables:
             return ""
 
         for table_name in relevant_tables[:5]:  # Limit to 5 tables
-            table_info = self.oracle_dict['tables'][table_name]
+            table_info = self.dict_index.get_object_info(table_name) or {}
             schema_info += f"Table: {table_name}\n"
             for col in table_info.get('columns', [])[:20]:  # Limit to 20 columns
                 col_info = f"  {col['column_name']}: {col['data_type']}"
@@ -646,6 +909,9 @@ Output ONLY the corrected JSON, nothing else."""
                     scale = col.get('data_scale')
                     if prec is not None and scale is not None:
                         col_info += f"({prec},{scale})"
+                value_range = SchemaContextBuilder.profile_range(col.get('profile'))
+                if value_range:
+                    col_info += f" range={value_range}"
                 schema_info += col_info + "\n"
             schema_info += "\n"
 
@@ -965,6 +1231,8 @@ Return ONLY the complete XML (starting with <?xml). No explanations."""
 
             return True
 
+        except BatchPending:
+            raise
         except Exception as e:
             error_msg = f"{xml_path.name}: {e}"
             print(f"    ✗ {xml_path.name} - Error: {e}")
@@ -986,7 +1254,18 @@ Return ONLY the complete XML (starting with <?xml). No explanations."""
         print(f"Dictionary: {self.dict_path}")
         print(f"Target DB: {self.target_db}")
         print(f"Model: {self.model_id}")
-        print(f"Parallel workers: {self.max_workers}\n")
+        if self.batch_runner:
+            print(f"Engine: batch inference ({type(self.batch_runner.backend).__name__}, "
+                  f"remaining files on the {self.engine} engine)")
+        elif self.engine == 'async':
+            print(f"Engine: async (adaptive concurrency, starting at {self.max_workers}, "
+                  f"max {self.rate_limiter.max_concurrency})")
+        else:
+            print(f"Engine: thread (parallel workers: {self.max_workers})")
+        if self.llm_cache.enabled:
+            print(f"LLM cache: {self.llm_cache.cache_dir}\n")
+        else:
+            print(f"LLM cache: disabled\n")
 
         if not self.source_dir.exists():
             print(f"✗ Source directory not found: {self.source_dir}")
@@ -995,25 +1274,143 @@ Return ONLY the complete XML (starting with <?xml). No explanations."""
         # Create target directory
         self.target_dir.mkdir(parents=True, exist_ok=True)
 
-        # Copy all source files to target directory first
+        # Drop expired / oversized cache entries before the run
+        evicted = self.llm_cache.evict()
+        if evicted['expired'] or evicted['evicted']:
+            print(f"LLM cache: removed {evicted['expired']} expired, {evicted['evicted']} evicted entries\n")
+
+        # Copy source files to target directory first (resume keeps up-to-date conversions)
         import shutil
         source_files = list(self.source_dir.glob('*.xml'))
+        xml_files = []
         for src_file in source_files:
+            input_hash = ConversionJournal.hash_file(src_file)
+            self.input_hashes[src_file.name] = input_hash
+
+            if (self.resume
+                    and self.journal.is_up_to_date(src_file.name, input_hash, self.prompt_version)
+                    and (self.target_dir / src_file.name).exists()):
+                self.stats['resumed_files'] += 1
+                continue
+
             shutil.copy2(src_file, self.target_dir / src_file.name)
-        print(f"Copied {len(source_files)} files from source to target\n")
+            xml_files.append(self.target_dir / src_file.name)
+        print(f"Copied {len(xml_files)} files from source to target\n")
+
+        if self.resume:
+            print(f"Resume: {self.stats['resumed_files']} files already converted, "
+                  f"{len(xml_files)} new/changed/failed files to convert\n")
 
-        # Find all XML files in target directory for conversion
-        xml_files = list(self.target_dir.glob('*.xml'))
-        self.stats['total_files'] = len(xml_files)
+        self.stats['total_files'] = len(source_files)
 
         if not xml_files:
-            print("No XML files found")
+            print("No XML files to convert")
+            self.end_time = datetime.now()
+            self.print_summary()
+            self.save_conversion_report()
             return
 
         print(f"Found {len(xml_files)} mapper files")
         print(f"Starting parallel conversion...\n")
 
-        # Process files in parallel
+        # Pre-warm the fragment index before workers start
+        fragment_stats = self.fragment_index.build().get_stats()
+        if fragment_stats['fragments']:
+            print(f"Fragment index: {fragment_stats['fragments']} fragments from {fragment_stats['files']} files\n")
+
+        duplicates = []
+        if self.dedupe:
+            xml_files, duplicates = self.group_by_fingerprint(xml_files)
+
+        self.run_engine(xml_files)
+
+        if duplicates:
+            print(f"\nApplying conversions to {len(duplicates)} duplicate statements...\n")
+            self.run_engine(duplicates)
+
+        print()
+        self.journal.compact()
+        self.end_time = datetime.now()
+        self.print_summary()
+        self.save_conversion_report()
+        if self.metrics_file:
+            self.write_metrics_file()
+
+    def group_by_fingerprint(self, xml_files: List[Path]):
+        """Split files into one representative per SQL fingerprint and its duplicates"""
+        representatives = []
+        duplicates = []
+        group_sizes = {}
+
+        for xml_file in xml_files:
+            extracted = None
+            if '_resultMap_' not in xml_file.name:
+                extracted = self.extract_sql_from_xml(xml_file)
+            if not extracted or not extracted['sql_element']:
+                representatives.append(xml_file)
+                continue
+
+            sql_xml = extracted['sql_element']
+            fingerprint = self.fingerprinter.fingerprint(
+                sql_xml, self.find_included_fragments(sql_xml, xml_file))
+            self.file_fingerprints[xml_file.name] = fingerprint
+            group_sizes[fingerprint] = group_sizes.get(fingerprint, 0) + 1
+
+            if fingerprint in self.dedupe_representatives:
+                duplicates.append(xml_file)
+            else:
+                self.dedupe_representatives[fingerprint] = xml_file.name
+                representatives.append(xml_file)
+
+        self.stats['dedupe']['groups'] = sum(1 for size in group_sizes.values() if size > 1)
+        self.stats['dedupe']['duplicate_files'] = len(duplicates)
+        if duplicates:
+            print(f"Deduplication: {len(duplicates)} duplicate statements in "
+                  f"{self.stats['dedupe']['groups']} groups, converting "
+                  f"{len(representatives)} unique statements first\n")
+        return representatives, duplicates
+
+    def run_engine(self, xml_files: List[Path]):
+        """Convert files with the configured engine"""
+        if self.batch_runner:
+            self.run_batch_engine(xml_files)
+        elif self.engine == 'async':
+            self.run_async_engine(xml_files)
+        else:
+            self.run_thread_engine(xml_files)
+
+    def record_file_result(self, xml_file: Path, converted: Optional[bool], error: Optional[Exception]):
+        """Record the outcome of one convert_file() call"""
+        # Duplicates only reuse conversions that were written successfully
+        fingerprint = self.file_fingerprints.get(xml_file.name)
+        if fingerprint in self.dedupe_candidates:
+            candidate = self.dedupe_candidates.pop(fingerprint)
+            if converted and candidate['file'] == xml_file.name:
+                self.dedupe_results[fingerprint] = candidate
+        output_hash = ConversionJournal.hash_files([
+            self.target_dir / xml_file.name,
+            self.target_dir / f"{xml_file.stem}.tc.json"
+        ]) if converted else None
+        self.journal.record(
+            xml_file.name,
+            'success' if converted else 'failed',
+            self.input_hashes.get(xml_file.name),
+            self.prompt_version,
+            output_hash=output_hash,
+            error=str(error) if error else None
+        )
+
+        if error:
+            error_msg = f"{xml_file.name}: {error}"
+            print(f"    ✗ {xml_file.name} - Exception: {error}")
+            with self.stats_lock:
+                self.stats['errors'].append(error_msg)
+        elif converted:
+            with self.stats_lock:
+                self.stats['converted_files'] += 1
+
+    def run_thread_engine(self, xml_files: List[Path]):
+        """Convert files on a fixed-size thread pool"""
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             # Submit all tasks
             future_to_file = {
@@ -1025,19 +1422,103 @@ Return ONLY the complete XML (starting with <?xml). No explanations."""
             for future in as_completed(future_to_file):
                 xml_file = future_to_file[future]
                 try:
-                    if future.result():
-                        with self.stats_lock:
-                            self.stats['converted_files'] += 1
+                    self.record_file_result(xml_file, future.result(), None)
                 except Exception as e:
-                    error_msg = f"{xml_file.name}: {e}"
-                    print(f"    ✗ {xml_file.name} - Exception: {e}")
-                    with self.stats_lock:
-                        self.stats['errors'].append(error_msg)
+                    self.record_file_result(xml_file, None, e)
 
-        print()
-        self.end_time = datetime.now()
-        self.print_summary()
-        self.save_conversion_report()
+    def run_batch_engine(self, xml_files: List[Path]):
+        """Convert files through Bedrock batch inference jobs
+
+        Each round converts every pending file up to its first LLM request without a
+        response. Those requests run as batch jobs and the files are converted again with
+        the results. Files left over (too few requests for a job, truncated or failed
+        records, round limit) are finished with the real-time engine.
+        """
+        pending = list(xml_files)
+        realtime = []
+
+        for round_no in range(1, self.MAX_BATCH_ROUNDS + 1):
+            self.batch_collecting = True
+            self.batch_requests = {}
+            deferred = []
+
+            # Collection pass makes no Bedrock calls, so files run sequentially
+            for xml_file in pending:
+                extraction_counts = dict(self.stats['table_extraction'])
+                context_totals = dict(self.stats['schema_context'])
+                try:
+                    converted = self.convert_file(xml_file)
+                except BatchPending as e:
+                    # Table extraction and schema context are counted again when the file is replayed
+                    self.stats['table_extraction'] = extraction_counts
+                    self.stats['schema_context'] = context_totals
+                    (realtime if e.realtime else deferred).append(xml_file)
+                    continue
+                except Exception as e:
+                    self.record_file_result(xml_file, None, e)
+                    continue
+                self.record_file_result(xml_file, converted, None)
+
+            self.batch_collecting = False
+            pending = deferred
+            if not pending:
+                break
+
+            if len(self.batch_requests) < self.batch_runner.backend.MIN_RECORDS:
+                print(f"\n  ℹ {len(self.batch_requests)} requests is below the batch job minimum "
+                      f"({self.batch_runner.backend.MIN_RECORDS}), converting in real time")
+                break
+
+            self.batch_stats['rounds'] += 1
+            print(f"\nBatch round {round_no}: {len(self.batch_requests)} requests for {len(pending)} files")
+            self.collect_batch_results()
+            print()
+
+        remaining = pending + realtime
+        self.batch_requests = {}
+        if remaining:
+            self.batch_stats['realtime_files'] += len(remaining)
+            print(f"\nConverting {len(remaining)} remaining files in real time\n")
+            if self.engine == 'async':
+                self.run_async_engine(remaining)
+            else:
+                self.run_thread_engine(remaining)
+
+    def collect_batch_results(self):
+        """Run queued requests as batch jobs and store the responses for replay"""
+        record_keys = {f"REC{i:08d}": key for i, key in enumerate(self.batch_requests)}
+        results = self.batch_runner.run(
+            {record_id: self.batch_requests[key][1] for record_id, key in record_keys.items()})
+
+        for record_id, key in record_keys.items():
+            record = results.get(record_id, {})
+            output = record.get('modelOutput')
+            if not output or record.get('error'):
+                continue  # queued again in the next round
+
+            self.bedrock.record_usage(output.get('usage', {}), 0)
+            self.metrics.record(self.batch_requests[key][0], output.get('usage', {}))
+            if output.get('stop_reason') == 'max_tokens':
+                # Continuation needs another turn - make this request in real time
+                self.batch_stats['truncated'] += 1
+                self.batch_realtime_keys.add(key)
+                continue
+
+            text = ''.join(block.get('text', '') for block in output.get('content', []))
+            self.batch_responses[key] = text
+            self.llm_cache.put(key, text, {
+                'model_id': self.model_id,
+                'call_type': self.batch_requests[key][0]
+            })
+
+    def run_async_engine(self, xml_files: List[Path]):
+        """Convert files on the asyncio engine with adaptive concurrency"""
+        engine = AsyncConversionEngine(self.convert_file, self.rate_limiter)
+        engine.run(xml_files, on_done=self.record_file_result)
+
+        limiter_stats = self.rate_limiter.get_stats()
+        print(f"\n  Adaptive concurrency: final {limiter_stats['final_concurrency']}, "
+              f"peak {limiter_stats['peak_concurrency']}, throttles {limiter_stats['throttles']}")
 
     def print_summary(self):
         """Print conversion summary"""
@@ -1047,11 +1528,23 @@ Return ONLY the complete XML (starting with <?xml). No explanations."""
         print(f"  Converted files: {self.stats['converted_files']}")
         print(f"  Failed files: {self.stats['failed_files']}")
         print(f"  Skipped files: {self.stats['skipped_files']}")
+        if self.resume:
+            print(f"  Resumed (already converted): {self.stats['resumed_files']}")
 
-        if self.stats['converted_files'] > 0:
-            success_rate = (self.stats['converted_files'] / self.stats['total_files']) * 100
+        done_files = self.stats['converted_files'] + self.stats['resumed_files']
+        if done_files > 0:
+            success_rate = (done_files / self.stats['total_files']) * 100
             print(f"  Success rate: {success_rate:.2f}%")
 
+        if self.stats['dedupe']['reused_files']:
+            print(f"  Deduplicated: {self.stats['dedupe']['reused_files']} files reused a conversion "
+                  f"({self.stats['dedupe']['llm_calls_saved']} LLM calls saved)")
+
+        tokens = self.bedrock.get_stats()['tokens']
+        if self.prompt_caching and (tokens['cache_read'] or tokens['cache_write']):
+            print(f"  Prompt cache: {tokens['cache_read']:,} cached / "
+                  f"{tokens['input'] + tokens['cache_write']:,} uncached input tokens")
+
         if self.stats['errors']:
             print(f"\n  Errors: {len(self.stats['errors'])}")
             for error in self.stats['errors'][:5]:
@@ -1084,11 +1577,20 @@ Return ONLY the complete XML (starting with <?xml). No explanations."""
                           key=lambda x: x['conversion_time'],
                           default={'file': 'N/A', 'conversion_time': 0})
 
+        # Prompt caching: cached (read) vs uncached input tokens
+        bedrock_stats = self.bedrock.get_stats()
+        tokens = bedrock_stats['tokens']
+        total_input = tokens['input'] + tokens['cache_read'] + tokens['cache_write']
+
         tables_discovered = len(self.stats['tables_discovered'])
         tables_matched = len(self.stats['tables_matched'])
         tables_not_found = len(self.stats['tables_not_found'])
         match_rate = (tables_matched / tables_discovered * 100) if tables_discovered > 0 else 0
 
+        parser_count = self.stats['table_extraction']['parser']
+        fallback_count = self.stats['table_extraction']['llm_fallback']
+        extraction_total = parser_count + fallback_count
+
         # Build report
         report = {
             "conversion_summary": {
@@ -1099,12 +1601,17 @@ Return ONLY the complete XML (starting with <?xml). No explanations."""
                 "converted_files": self.stats['converted_files'],
                 "failed_files": self.stats['failed_files'],
                 "skipped_files": self.stats['skipped_files'],
-                "success_rate": f"{(self.stats['converted_files'] / self.stats['total_files'] * 100):.2f}%"
+                "resumed_files": self.stats['resumed_files'],
+                "success_rate": f"{((self.stats['converted_files'] + self.stats['resumed_files']) / self.stats['total_files'] * 100):.2f}%"
                                if self.stats['total_files'] > 0 else "0%"
             },
             "oracle_dictionary": {
                 "dictionary_path": str(self.dict_path),
                 "total_tables_in_dict": len(self.oracle_dict.get('tables', {})),
+                "total_views_in_dict": len(self.oracle_dict.get('views', {})),
+                "total_synonyms_in_dict": len(self.dict_index.synonyms),
+                "format": ("server" if is_dictionary_url(self.dict_path) else
+                           "sqlite" if getattr(self.oracle_dict.get('tables'), 'lazy', False) else "json"),
                 "schema": self.oracle_dict.get('schema', 'UNKNOWN')
             },
             "conversion_details": {
@@ -1133,16 +1640,64 @@ Return ONLY the complete XML (starting with <?xml). No explanations."""
                     "sql_conversion": self.stats['llm_calls']['sql_conversion'],
                     "json_fix": self.stats['llm_calls']['json_fix'],
                     "total": sum(self.stats['llm_calls'].values())
+                },
+                "engine": 'batch' if self.batch_runner else self.engine,
+                "batch": dict(self.batch_runner.get_stats(), **self.batch_stats) if self.batch_runner else None,
+                "adaptive_concurrency": self.rate_limiter.get_stats() if self.rate_limiter else None,
+                "bedrock_client": bedrock_stats,
+                "prompt_cache": {
+                    "enabled": self.prompt_caching,
+                    "cache_points": dict(self.stats['cache_points']),
+                    "cached_input_tokens": tokens['cache_read'],
+                    "cache_write_input_tokens": tokens['cache_write'],
+                    "uncached_input_tokens": tokens['input'],
+                    "cached_input_ratio": f"{(tokens['cache_read'] / total_input * 100):.2f}%"
+                                          if total_input > 0 else "0%"
+                },
+                "llm_cache": self.llm_cache.get_stats(),
+                "streaming": {
+                    "enabled": self.stream,
+                    "malformed_json_aborts": self.stats['streaming']['malformed_json_aborts'],
+                    "json_repaired_locally": self.stats['streaming']['json_repaired_locally']
+                },
+                "dedupe": dict(self.stats['dedupe'], enabled=self.dedupe),
+                "fragment_index": self.fragment_index.get_stats(),
+                "schema_context": dict(
+                    self.stats['schema_context'],
+                    mode=self.schema_context,
+                    token_budget=self.schema_builder.token_budget,
+                    avg_tokens=round(self.stats['schema_context']['tokens'] / self.stats['schema_context']['prompts'])
+                               if self.stats['schema_context']['prompts'] else 0
+                ),
+                "llm_metrics": dict(
+                    self.metrics.get_report(),
+                    throttle_wait_seconds=bedrock_stats['retry_wait_seconds_by_class']['throttle'],
+                    rate_limit_wait_seconds=(self.rate_limiter.get_stats()['rate_wait_seconds']
+                                             if self.rate_limiter else 0)
+                ),
+                "table_extraction": {
+                    "parser": parser_count,
+                    "llm_fallback": fallback_count,
+                    "llm_fallback_ratio": f"{(fallback_count / extraction_total * 100):.2f}%"
+                                          if extraction_total > 0 else "0%"
                 }
             },
             "errors": [
                 {"message": err} for err in self.stats['errors']
             ],
-            "file_details": sorted(self.stats['file_details'],
-                                  key=lambda x: x['conversion_time'],
-                                  reverse=True)[:20]  # Top 20 slowest files
+            "file_details": [
+                dict(detail, llm_tokens=self.metrics.files.get(detail['file']))
+                for detail in sorted(self.stats['file_details'],
+                                     key=lambda x: x['conversion_time'],
+                                     reverse=True)[:20]  # Top 20 slowest files
+            ]
         }
 
+        remote_tables = self.oracle_dict.get('tables')
+        if hasattr(remote_tables, 'loaded_count'):
+            # Tables actually fetched from the dictionary server
+            report['oracle_dictionary']['tables_fetched'] = remote_tables.loaded_count()
+
         # Save to file
         output_dir = Path('output')
         output_dir.mkdir(exist_ok=True)
@@ -1153,6 +1708,40 @@ Return ONLY the complete XML (starting with <?xml). No explanations."""
 
         print(f"\n✓ Conversion report saved to: {report_path}")
 
+    def write_metrics_file(self):
+        """Export LLM metrics and pipeline counters in Prometheus text format"""
+        bedrock_stats = self.bedrock.get_stats()
+        extra = {
+            'files_total': ('counter', 'Mapper files by conversion outcome', {
+                (('status', 'converted'),): self.stats['converted_files'],
+                (('status', 'failed'),): self.stats['failed_files'],
+                (('status', 'skipped'),): self.stats['skipped_files'],
+                (('status', 'resumed'),): self.stats['resumed_files'],
+                (('status', 'deduplicated'),): self.stats['dedupe']['reused_files']
+            }),
+            'llm_calls_saved_total': ('counter', 'LLM calls avoided by statement deduplication', {
+                None: self.stats['dedupe']['llm_calls_saved']
+            }),
+            'bedrock_retries_total': ('counter', 'Bedrock retries by error class', {
+                (('error_class', error_class),): count
+                for error_class, count in bedrock_stats['retries'].items()
+            }),
+            'bedrock_retry_wait_seconds_total': ('counter', 'Seconds spent in retry backoff by error class', {
+                (('error_class', error_class),): seconds
+                for error_class, seconds in bedrock_stats['retry_wait_seconds_by_class'].items()
+            }),
+            'rate_limit_wait_seconds_total': ('counter', 'Seconds spent waiting for the adaptive rate limiter', {
+                None: self.rate_limiter.get_stats()['rate_wait_seconds'] if self.rate_limiter else 0
+            })
+        }
+        if self.rate_limiter:
+            extra['concurrency'] = ('gauge', 'Adaptive in-flight limit at the end of the run', {
+                None: self.rate_limiter.get_stats()['final_concurrency']
+            })
+
+        self.metrics.write_prometheus(self.metrics_file, extra)
+        print(f"✓ Metrics written to: {self.metrics_file}")
+
 
 def main():
     """Main entry point"""
@@ -1178,19 +1767,129 @@ def main():
         type=str,
         help='Path to Oracle dictionary JSON (default: from environment)'
     )
+    parser.add_argument(
+        '--dict-url',
+        type=str,
+        help='Running dictionary server, http://host:port or unix:///path '
+        '(default: from environment ORACLE_DICT_URL; overrides --dict-path)'
+    )
     parser.add_argument(
         '--parallel',
         type=int,
-        help='Number of parallel workers (default: from environment MAX_WORKERS or 7)'
+        help='Number of parallel workers; initial concurrency for the async engine '
+             '(default: from environment MAX_WORKERS or 7)'
+    )
+    parser.add_argument(
+        '--engine',
+        choices=['async', 'thread'],
+        default=os.getenv('CONVERT_ENGINE', 'async'),
+        help='async: adaptive concurrency learned from Bedrock throttling (default); '
+             'thread: fixed --parallel thread pool'
+    )
+    parser.add_argument(
+        '--max-concurrency',
+        type=int,
+        default=64,
+        help='Upper bound of in-flight files for the async engine (default: 64)'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Stream Bedrock responses and validate JSON as it arrives (stops early on malformed JSON)'
+    )
+    parser.add_argument(
+        '--no-prompt-cache',
+        action='store_true',
+        help='Do not add Bedrock prompt-caching cache points to requests'
+    )
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='Convert through Bedrock batch inference jobs instead of real-time calls'
+    )
+    parser.add_argument(
+        '--batch-backend',
+        choices=['bedrock', 'local'],
+        default=os.getenv('BATCH_BACKEND', 'bedrock'),
+        help='bedrock: create_model_invocation_job with S3 (needs BEDROCK_BATCH_ROLE_ARN and '
+             'BEDROCK_BATCH_S3_URI); local: directory stand-in processed by bedrock_batch.py (default: bedrock)'
+    )
+    parser.add_argument(
+        '--batch-dir',
+        type=str,
+        default='./output/batch',
+        help='Directory for batch input JSONL files and local batch jobs (default: ./output/batch)'
+    )
+    parser.add_argument(
+        '--batch-poll-interval',
+        type=float,
+        default=60,
+        help='Seconds between batch job status checks (default: 60)'
+    )
+    parser.add_argument(
+        '--no-dedupe',
+        action='store_true',
+        help='Convert every statement with the LLM, even when its SQL is identical to another one'
+    )
+    parser.add_argument(
+        '--schema-context',
+        choices=['referenced', 'full'],
+        default=os.getenv('SCHEMA_CONTEXT', 'referenced'),
+        help='referenced: only columns the SQL references, compact signatures (default); '
+             'full: up to 50 columns per table with sample values'
+    )
+    parser.add_argument(
+        '--schema-token-budget',
+        type=int,
+        default=int(os.getenv('SCHEMA_TOKEN_BUDGET', '2000')),
+        help='Approximate token limit of the schema block with --schema-context referenced; bind-variable '
+             'columns first, then join keys, then other columns (0 = unlimited, default: 2000)'
+    )
+    parser.add_argument(
+        '--metrics-file',
+        type=str,
+        default=os.getenv('METRICS_FILE'),
+        help='Also write LLM token/latency metrics in Prometheus text format to this file '
+             '(default: from environment METRICS_FILE)'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Skip files that already converted successfully from the same input and prompt version '
+             '(state journal: <target-dir>/.conversion-state.jsonl)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Disable the LLM response cache (always call Bedrock)'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        type=str,
+        help='LLM response cache directory (default: from environment LLM_CACHE_DIR or ./output/llm_cache)'
+    )
+    parser.add_argument(
+        '--cache-max-size-mb',
+        type=int,
+        default=1024,
+        help='Evict least recently used cache entries above this size (default: 1024)'
+    )
+    parser.add_argument(
+        '--cache-max-age-days',
+        type=int,
+        default=30,
+        help='Expire cache entries older than this (default: 30)'
     )
 
     args = parser.parse_args()
 
     # Get all settings from environment variables
-    dict_path = args.dict_path or os.getenv('ORACLE_DICT_PATH', './output/oracle_dictionary.json')
+    dict_path = (args.dict_url or args.dict_path or os.getenv('ORACLE_DICT_URL') or
+                 os.getenv('ORACLE_DICT_PATH', './output/oracle_dictionary.json'))
     target_db = os.getenv('TARGET_DB_TYPE', 'postgres')
     bedrock_region = os.getenv('BEDROCK_REGION', 'ap-northeast-2')
     model_id = os.getenv('BEDROCK_MODEL_ID')
+    cache_dir = args.cache_dir or os.getenv('LLM_CACHE_DIR', './output/llm_cache')
 
     # Get max_workers from: CLI arg > ENV var > default(7)
     max_workers = args.parallel
@@ -1202,6 +1901,19 @@ def main():
         print("Please ensure .env is loaded (skills automatically do this)")
         sys.exit(1)
 
+    batch_backend = None
+    if args.batch:
+        if args.batch_backend == 'local':
+            batch_backend = LocalBatchBackend(args.batch_dir)
+        else:
+            role_arn = os.getenv('BEDROCK_BATCH_ROLE_ARN')
+            s3_uri = os.getenv('BEDROCK_BATCH_S3_URI')
+            if not role_arn or not s3_uri:
+                print("Error: --batch needs BEDROCK_BATCH_ROLE_ARN and BEDROCK_BATCH_S3_URI "
+                      "(or --batch-backend local)")
+                sys.exit(1)
+            batch_backend = BedrockBatchBackend(bedrock_region, model_id, role_arn, s3_uri)
+
     converter = SQLConverter(
         source_dir=args.source_dir,
         target_dir=args.target_dir,
@@ -1209,7 +1921,23 @@ def main():
         target_db=target_db,
         bedrock_region=bedrock_region,
         model_id=model_id,
-        max_workers=max_workers
+        max_workers=max_workers,
+        use_cache=not args.no_cache,
+        cache_dir=cache_dir,
+        cache_max_size_mb=args.cache_max_size_mb,
+        cache_max_age_days=args.cache_max_age_days,
+        engine=args.engine,
+        max_concurrency=args.max_concurrency,
+        resume=args.resume,
+        stream=args.stream,
+        prompt_caching=not args.no_prompt_cache,
+        batch_backend=batch_backend,
+        batch_dir=args.batch_dir,
+        batch_poll_interval=args.batch_poll_interval,
+        dedupe=not args.no_dedupe,
+        metrics_file=args.metrics_file,
+        schema_context=args.schema_context,
+        schema_token_budget=args.schema_token_budget
     )
 
     converter.convert_all()
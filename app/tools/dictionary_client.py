@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Oracle Dictionary Client
+Access to a running dictionary_server.py over HTTP or a Unix socket
+"""
+
+import http.client
+import json
+import socket
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote, urlparse
+
+URL_SCHEMES = ('http://', 'unix://')
+
+
+def is_dictionary_url(location) -> bool:
+    """True for http://host:port and unix:///path/to.sock dictionary locations"""
+    return isinstance(location, str) and location.startswith(URL_SCHEMES)
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection over a Unix domain socket"""
+
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class DictionaryClient:
+    """Client for the dictionary server API (one keep-alive connection per thread)"""
+
+    def __init__(self, url: str, timeout: float = 30.0):
+        if not is_dictionary_url(url):
+            raise ValueError(f"Unsupported dictionary URL: {url} "
+                             f"(use http://host:port or unix:///path)")
+        self.url = url
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        parsed = urlparse(self.url)
+        if parsed.scheme == 'unix':
+            return UnixHTTPConnection(parsed.path, self.timeout)
+        return http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=self.timeout)
+
+    def _request(self, method: str, path: str,
+                 payload: Optional[Dict[str, Any]] = None) -> Tuple[int, Any]:
+        body = json.dumps(payload).encode('utf-8') if payload is not None else None
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        # A kept-alive connection may have been closed by the server: retry once on a fresh one
+        for attempt in range(2):
+            connection = getattr(self._local, 'connection', None)
+            if connection is None:
+                connection = self._local.connection = self._new_connection()
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                return response.status, json.loads(response.read().decode('utf-8'))
+            except (http.client.HTTPException, ConnectionError, socket.timeout):
+                connection.close()
+                self._local.connection = None
+                if attempt:
+                    raise
+
+    def health(self) -> Dict[str, Any]:
+        return self._request('GET', '/health')[1]
+
+    def catalog(self) -> Dict[str, Any]:
+        """Top-level fields (schema, views, synonyms, ...), table names and per-table errors"""
+        return self._request('GET', '/tables')[1]
+
+    def lookup(self, table_column: str) -> Dict[str, Any]:
+        """Same result as OracleDictionary.lookup"""
+        return self._request('GET', f"/lookup?column={quote(table_column)}")[1]
+
+    def lookup_many(self, table_columns: List[str]) -> Dict[str, Dict[str, Any]]:
+        """TABLE.COLUMN -> lookup result for a batch, in one round trip"""
+        return self._request('POST', '/lookup_many', {'columns': list(table_columns)})[1]['results']
+
+    def get_table_info(self, table_name: str) -> Optional[Dict[str, Any]]:
+        status, result = self._request('GET', f"/table?name={quote(table_name)}")
+        return result if status == 200 else None
+
+    def resolve(self, name: str) -> Dict[str, Any]:
+        """{"name", "resolved", "kind"} of a table, view or synonym name"""
+        return self._request('GET', f"/resolve?name={quote(name)}")[1]
+
+    def get_sequence(self, sequence_name: str) -> Optional[Dict[str, Any]]:
+        status, result = self._request('GET', f"/sequence?name={quote(sequence_name)}")
+        return result if status == 200 else None
+
+    def get_tables(self, table_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Full info of several tables in one round trip (unknown tables are omitted)"""
+        return self._request('POST', '/tables', {'names': list(table_names)})[1]['tables']
+
+    def find_tables(self, sql_text: str) -> List[str]:
+        """Dictionary tables referenced in SQL text (server-side table matcher)"""
+        return self._request('POST', '/match', {'text': sql_text})[1]['tables']
+
+    def reload(self) -> Dict[str, Any]:
+        """Make the server re-read its dictionary file (e.g. after --refresh)"""
+        return self._request('POST', '/reload', {})[1]
+
+
+class RemoteTables(Mapping):
+    """Read-only table_name -> table info mapping served by a dictionary server
+
+    Same lazy protocol as dictionary_store.LazyTables: names and errors are fetched once,
+    a table's info on first access.
+    """
+
+    lazy = True
+
+    def __init__(self, client: DictionaryClient, catalog: Dict[str, Any]):
+        self.client = client
+        self._names: List[str] = catalog.get('tables', [])
+        self._name_set = set(self._names)
+        self.errors: Dict[str, str] = catalog.get('errors', {})
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, table_name: str) -> Dict[str, Any]:
+        with self._lock:
+            cached = self._cache.get(table_name)
+        if cached is not None:
+            return cached
+        if table_name not in self._name_set:
+            raise KeyError(table_name)
+        table_info = self.client.get_table_info(table_name)
+        if table_info is None:
+            raise KeyError(table_name)
+        with self._lock:
+            self._cache[table_name] = table_info
+        return table_info
+
+    def __contains__(self, table_name) -> bool:
+        return table_name in self._name_set
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def valid_names(self) -> List[str]:
+        return [name for name in self._names if name not in self.errors]
+
+    def prefetch(self, table_names: List[str]):
+        """Fetch several uncached tables in one round trip"""
+        with self._lock:
+            missing = [name for name in table_names
+                       if name in self._name_set and name not in self._cache]
+        if missing:
+            tables = self.client.get_tables(missing)
+            with self._lock:
+                self._cache.update(tables)
+
+    def loaded_count(self) -> int:
+        with self._lock:
+            return len(self._cache)
+
+
+def open_remote_dictionary(url: str) -> Dict[str, Any]:
+    """Dictionary-shaped view of a running server: top-level fields plus lazy RemoteTables"""
+    client = DictionaryClient(url)
+    catalog = client.catalog()
+    dictionary = {key: value for key, value in catalog.items() if key not in ('tables', 'errors')}
+    dictionary['tables'] = RemoteTables(client, catalog)
+    return dictionary
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Oracle Dictionary Index
+Precomputed O(1) column lookup structure shared by dictionary consumers
+"""
+
+import threading
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from table_matcher import TableMatcher
+
+
+class ColumnRecord:
+    """Compact column metadata record"""
+
+    __slots__ = ('table_name', 'column_name', 'data_type', 'data_length', 'data_precision',
+                 'data_scale', 'nullable', 'sample_value', 'comment', 'is_primary_key',
+                 'num_distinct', 'num_nulls', 'low_value', 'high_value', 'profile')
+
+    def __init__(self, table_name: str, column: Dict[str, Any], is_primary_key: bool = False):
+        self.table_name = table_name
+        self.column_name = column['column_name']
+        self.data_type = column.get('data_type')
+        self.data_length = column.get('data_length')
+        self.data_precision = column.get('data_precision')
+        self.data_scale = column.get('data_scale')
+        self.nullable = column.get('nullable')
+        self.sample_value = column.get('sample_value')
+        self.comment = column.get('comment')
+        self.is_primary_key = is_primary_key
+        self.num_distinct = column.get('num_distinct')
+        self.num_nulls = column.get('num_nulls')
+        self.low_value = column.get('low_value')
+        self.high_value = column.get('high_value')
+        self.profile = column.get('profile')
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return column info in the dictionary lookup format"""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+class DictionaryIndex:
+    """Index over oracle_dictionary.json: (TABLE, COLUMN) -> ColumnRecord
+
+    With a lazily loaded dictionary (dictionary_store.LazyTables) a table is indexed on first
+    lookup instead of up front. Views are indexed like tables; synonyms are resolved once, when
+    the index is built, to the table or view they name, so every lookup accepts synonym names.
+    """
+
+    # Longest synonym -> synonym chain followed before giving up
+    MAX_SYNONYM_DEPTH = 10
+
+    def __init__(self, dictionary: Dict[str, Any]):
+        self.columns: Dict[Tuple[str, str], ColumnRecord] = {}
+        self.table_columns: Dict[str, Dict[str, ColumnRecord]] = {}
+        self.table_errors: Dict[str, str] = {}
+        self._table_matcher: Optional[TableMatcher] = None
+        self._matcher_lock = threading.Lock()
+        self._dictionary = dictionary or {}
+        self.views: Dict[str, str] = {}      # VIEW -> name in dictionary['views']
+        self.synonyms: Dict[str, str] = {}   # SYNONYM -> resolved TABLE or VIEW
+        self.sequences: Dict[str, Dict[str, Any]] = {
+            name.upper(): info for name, info in self._dictionary.get('sequences', {}).items()}
+
+        for view_name, view_info in self._dictionary.get('views', {}).items():
+            self.views[view_name.upper()] = view_name
+            self._index_table(view_name.upper(), view_info)
+
+        tables = self._dictionary.get('tables', {})
+        self._lazy_tables = tables if getattr(tables, 'lazy', False) else None
+        self._pending: Dict[str, str] = {}   # TABLE -> name in the lazy store, not indexed yet
+        self._load_lock = threading.Lock()
+        if self._lazy_tables is not None:
+            self.table_errors.update({name.upper(): error
+                                      for name, error in self._lazy_tables.errors.items()})
+            self._pending = {name.upper(): name for name in self._lazy_tables.valid_names()}
+        else:
+            for table_name, table_info in tables.items():
+                self.add_table(table_name, table_info)
+        self._resolve_synonyms(self._dictionary.get('synonyms', {}))
+
+    def _is_object(self, name: str) -> bool:
+        return name in self.table_columns or name in self.table_errors or name in self._pending
+
+    def _resolve_synonyms(self, synonyms: Dict[str, Dict[str, Any]]):
+        """SYNONYM -> base object for synonyms that end at a table or view of the dictionary
+
+        Synonyms over a database link or into objects outside the dictionary stay unresolved.
+        """
+        schema = (self._dictionary.get('schema') or '').upper()
+        targets = {name.upper(): info for name, info in synonyms.items()}
+        for synonym_name, info in targets.items():
+            for _ in range(self.MAX_SYNONYM_DEPTH):
+                if info.get('db_link'):
+                    break
+                target = (info.get('table_name') or '').upper()
+                owner = (info.get('table_owner') or '').upper()
+                if (not schema or owner == schema) and self._is_object(target):
+                    self.synonyms[synonym_name] = target
+                    break
+                info = targets.get(target)
+                if info is None:
+                    break
+
+    def _ensure_loaded(self, table_name: str):
+        """Index a lazily loaded table on first use"""
+        if table_name not in self._pending:
+            return
+        with self._load_lock:
+            if table_name in self._pending:
+                self._index_table(table_name, self._lazy_tables[self._pending[table_name]])
+                del self._pending[table_name]
+
+    def add_table(self, table_name: str, table_info: Dict[str, Any]):
+        """Index (or re-index) a single table"""
+        table_name = table_name.upper()
+        self.remove_table(table_name)
+        self._index_table(table_name, table_info)
+
+    def _index_table(self, table_name: str, table_info: Dict[str, Any]):
+        if 'error' in table_info:
+            self.table_errors[table_name] = table_info['error']
+            return
+
+        pk_columns = set(table_info.get('primary_key', []))
+        column_map = {}
+        for column in table_info.get('columns', []):
+            record = ColumnRecord(table_name, column, column['column_name'] in pk_columns)
+            column_map[record.column_name] = record
+            self.columns[(table_name, record.column_name)] = record
+
+        self.table_columns[table_name] = column_map
+
+    def remove_table(self, table_name: str):
+        """Drop a table from the index"""
+        table_name = table_name.upper()
+        self._table_matcher = None
+        self._pending.pop(table_name, None)
+        self.table_errors.pop(table_name, None)
+        for column_name in self.table_columns.pop(table_name, {}):
+            self.columns.pop((table_name, column_name), None)
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Dictionary table or view behind a name (synonyms resolved), None if unknown"""
+        name = name.upper()
+        if self._is_object(name):
+            return name
+        return self.synonyms.get(name)
+
+    def has_table(self, table_name: str) -> bool:
+        """True for tables, views and synonyms of either"""
+        return self.resolve(table_name) is not None
+
+    def is_view(self, table_name: str) -> bool:
+        return self.resolve(table_name) in self.views
+
+    def get_table_error(self, table_name: str) -> Optional[str]:
+        return self.table_errors.get(self.resolve(table_name) or table_name.upper())
+
+    def get_object_info(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """Raw dictionary entry of a table or view, by its own name or a synonym"""
+        resolved = self.resolve(table_name)
+        if resolved is None:
+            return None
+        if resolved in self.views:
+            return self._dictionary['views'][self.views[resolved]]
+        tables = self._dictionary.get('tables', {})
+        stored_name = self._pending.get(resolved, resolved)
+        return tables[stored_name] if stored_name in tables else None
+
+    def get_sequence(self, sequence_name: str) -> Optional[Dict[str, Any]]:
+        return self.sequences.get(sequence_name.upper())
+
+    def object_names(self) -> Set[str]:
+        """Every name a query can use for a dictionary object: tables, views, synonyms"""
+        with self._load_lock:
+            names = set(self.table_columns) | set(self.table_errors) | set(self._pending)
+        return names | set(self.synonyms)
+
+    def get_table_columns(self, table_name: str) -> Dict[str, ColumnRecord]:
+        """Column name -> ColumnRecord for one table or view (empty if unknown)"""
+        table_name = self.resolve(table_name) or table_name.upper()
+        self._ensure_loaded(table_name)
+        return self.table_columns.get(table_name, {})
+
+    def prefetch(self, table_names: List[str]):
+        """Load several not yet indexed tables in one round trip when the store supports it"""
+        prefetch = getattr(self._lazy_tables, 'prefetch', None)
+        if prefetch is None:
+            return
+        with self._load_lock:
+            stored_names = [self._pending[name] for name in
+                            dict.fromkeys(self.resolve(t) or t.upper() for t in table_names)
+                            if name in self._pending]
+        if stored_names:
+            prefetch(stored_names)
+
+    def get_table_matcher(self) -> TableMatcher:
+        """Aho-Corasick matcher over all table, view and synonym names (built once, on first use)"""
+        with self._matcher_lock:
+            if self._table_matcher is None:
+                with self._load_lock:
+                    names = list(self.table_columns.keys()) + list(self._pending)
+                # A PUBLIC synonym may share its name with the table it points to
+                self._table_matcher = TableMatcher(list(dict.fromkeys(names + list(self.synonyms))))
+            return self._table_matcher
+
+    def find_tables(self, sql_text: str) -> List[str]:
+        """Dictionary tables and views referenced in SQL text, in order of appearance
+
+        Synonyms are reported as the object they resolve to, each object once.
+        """
+        found = []
+        for name in self.get_table_matcher().find_all(sql_text):
+            resolved = self.synonyms.get(name, name)
+            if resolved not in found:
+                found.append(resolved)
+        return found
+
+    def lookup(self, table_name: str, column_name: str) -> Optional[ColumnRecord]:
+        """Lookup a column by table (or view/synonym) and column name"""
+        table_name = self.resolve(table_name) or table_name.upper()
+        self._ensure_loaded(table_name)
+        return self.columns.get((table_name, column_name.upper()))
+
+    def lookup_qualified(self, table_column: str) -> Optional[ColumnRecord]:
+        """Lookup a column by TABLE_NAME.COLUMN_NAME format"""
+        if not isinstance(table_column, str):
+            return None
+        parts = table_column.split('.')
+        if len(parts) != 2:
+            return None
+        return self.lookup(parts[0], parts[1])
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Oracle Dictionary Journal
+Append-only NDJSON file of completed tables: bounds build memory and lets a failed build resume
+"""
+
+import json
+import os
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+JOURNAL_FORMAT = 'oracle-dictionary-journal'
+JOURNAL_VERSION = 1
+
+
+class JournalTables(Mapping):
+    """Read-only table_name -> table info mapping over a journal (file offset per table)
+
+    Same lazy protocol as dictionary_store.LazyTables; nothing is cached, a table is parsed from
+    its journal line on every access.
+    """
+
+    lazy = True
+
+    def __init__(self, path, offsets: Dict[str, int], errors: Dict[str, str], names: List[str]):
+        self.path = Path(path)
+        self._offsets = offsets
+        self._names = [name for name in names if name in offsets]
+        self.errors = {name: errors[name] for name in self._names if name in errors}
+        self._file = open(self.path, 'rb')
+        self._lock = threading.Lock()
+
+    def __getitem__(self, table_name: str) -> Dict[str, Any]:
+        offset = self._offsets.get(table_name)
+        if offset is None:
+            raise KeyError(table_name)
+        with self._lock:
+            self._file.seek(offset)
+            line = self._file.readline()
+        return json.loads(line.decode('utf-8'))['entry']
+
+    def __contains__(self, table_name) -> bool:
+        return table_name in self._offsets
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def valid_names(self) -> List[str]:
+        return [name for name in self._names if name not in self.errors]
+
+    def loaded_count(self) -> int:
+        return 0
+
+    def close(self):
+        """Release the journal file handle; the mapping cannot be read afterwards"""
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class DictionaryJournal:
+    """Build journal next to the dictionary output
+
+    The first line is a header (schema, generated_at); every following line is one completed
+    table, {"table": name, "error": message or null, "entry": {...}}, flushed as soon as it is
+    written. A later line of the same table wins, so retried tables simply append again. A line
+    cut short by a crash is dropped when the journal is reopened.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.generated_at: Optional[str] = None
+        self._offsets: Dict[str, int] = {}
+        self._errors: Dict[str, str] = {}
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _read(self, schema: str) -> bool:
+        """Index an existing journal of the same schema; False if it cannot be resumed"""
+        with open(self.path, 'rb') as f:
+            try:
+                header = json.loads(f.readline().decode('utf-8'))
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                return False
+            if (header.get('format') != JOURNAL_FORMAT or header.get('version') != JOURNAL_VERSION
+                    or header.get('schema') != schema):
+                return False
+            self.generated_at = header.get('generated_at')
+
+            valid_end = f.tell()
+            while True:
+                offset = f.tell()
+                line = f.readline()
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    record = json.loads(line.decode('utf-8'))
+                except (UnicodeDecodeError, json.JSONDecodeError):
+                    break
+                self._offsets[record['table']] = offset
+                if record.get('error') is not None:
+                    self._errors[record['table']] = record['error']
+                else:
+                    self._errors.pop(record['table'], None)
+                valid_end = f.tell()
+
+        # Drop a partially written last line before appending
+        with open(self.path, 'r+b') as f:
+            f.truncate(valid_end)
+        return True
+
+    def open(self, schema: str, generated_at: str, resume: bool = False) -> bool:
+        """Open for appending; returns True when an existing journal was resumed"""
+        resumed = resume and self.path.exists() and self._read(schema)
+        if not resumed:
+            self._offsets, self._errors = {}, {}
+            self.generated_at = generated_at
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'wb') as f:
+                header = {'format': JOURNAL_FORMAT, 'version': JOURNAL_VERSION,
+                          'schema': schema, 'generated_at': generated_at}
+                f.write(json.dumps(header).encode('utf-8') + b'\n')
+        self._file = open(self.path, 'ab')
+        return resumed
+
+    def completed_tables(self) -> Set[str]:
+        """Tables extracted without error (failed tables are extracted again on resume)"""
+        return set(self._offsets) - set(self._errors)
+
+    def append(self, table_name: str, entry: Dict[str, Any]):
+        line = json.dumps({'table': table_name, 'error': entry.get('error'), 'entry': entry},
+                          ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+        with self._lock:
+            offset = self._file.tell()
+            self._file.write(line)
+            self._file.flush()
+            self._offsets[table_name] = offset
+            if 'error' in entry:
+                self._errors[table_name] = entry['error']
+            else:
+                self._errors.pop(table_name, None)
+
+    def tables(self, names: List[str]) -> JournalTables:
+        """Lazy mapping of the journaled tables among names, in that order"""
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            return JournalTables(self.path, dict(self._offsets), dict(self._errors), names)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        """Delete the journal once the dictionary has been written"""
+        self.close()
+        if self.path.exists():
+            self.path.unlink()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Oracle Dictionary Server
+Serves one warm OracleDictionary to concurrently running tools over HTTP or a Unix socket
+"""
+
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from oracle_dictionary import OracleDictionary
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class DictionaryServer:
+    """HTTP API over OracleDictionary
+
+    GET  /health                      status, schema, table count, request counters
+    GET  /tables                      schema, generated_at, table names, per-table errors
+    GET  /table?name=T                table or view info, synonyms resolved (404 if unknown)
+    GET  /resolve?name=N              {"name", "resolved", "kind"}: table, view or null
+    GET  /sequence?name=S             sequence info (404 if unknown)
+    GET  /lookup?column=T.C           OracleDictionary.lookup result
+    POST /tables      {"names": []}   {"tables": {name: info}}
+    POST /lookup_many {"columns": []} {"results": {T.C: lookup result}}
+    POST /match       {"text": sql}   {"tables": [...]} via the Aho-Corasick table matcher
+    POST /reload                      re-read the dictionary file
+    """
+
+    def __init__(self, input_path: str, host: str = '127.0.0.1', port: int = 8766,
+                 socket_path: Optional[str] = None):
+        self.input_path = input_path
+        self.oracle_dict = self._load(input_path)
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+        self.requests: Dict[str, int] = {}
+
+        handler = self._make_handler()
+        self.socket_path = socket_path
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            self.httpd = ThreadingUnixHTTPServer(socket_path, handler)
+        else:
+            self.httpd = ThreadingHTTPServer((host, port), handler)
+            self.httpd.daemon_threads = True
+        self.thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _load(input_path: str) -> OracleDictionary:
+        # No database access: connection settings are only needed for --build
+        oracle_dict = OracleDictionary(host=None, port=0, sid=None, user=None, password=None,
+                                       schema=os.getenv('ORACLE_SCHEMA') or '')
+        oracle_dict.load_dictionary(input_path)
+        oracle_dict.schema = oracle_dict.dictionary.get('schema') or oracle_dict.schema
+        return oracle_dict
+
+    @property
+    def url(self) -> str:
+        if self.socket_path:
+            return f"unix://{Path(self.socket_path).resolve()}"
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'DictionaryServer':
+        """Serve in a background thread"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.socket_path and os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def reload(self) -> Dict[str, Any]:
+        """Swap in a freshly loaded dictionary; requests in flight keep the old one"""
+        oracle_dict = self._load(self.input_path)
+        with self.lock:
+            self.oracle_dict = oracle_dict
+        return {'status': 'ok', 'tables': len(oracle_dict.dictionary.get('tables', {}))}
+
+    def _count(self, endpoint: str):
+        with self.lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+
+    def catalog(self, oracle_dict: OracleDictionary) -> Dict[str, Any]:
+        dictionary = oracle_dict.dictionary
+        tables = dictionary.get('tables', {})
+        errors = {}
+        for name in tables:
+            error = oracle_dict.index.get_table_error(name)
+            if error:
+                errors[name] = error
+        result = {key: value for key, value in dictionary.items() if key != 'tables'}
+        result.update({'tables': list(tables), 'errors': errors})
+        return result
+
+    def handle(self, method: str, path: str, query: Dict[str, str],
+               payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """(status, JSON body) for one request"""
+        with self.lock:
+            oracle_dict = self.oracle_dict
+        tables = oracle_dict.dictionary.get('tables', {})
+
+        if method == 'GET' and path == '/health':
+            with self.lock:
+                requests = dict(self.requests)
+            return 200, {'status': 'ok', 'schema': oracle_dict.dictionary.get('schema'),
+                         'tables': len(tables),
+                         'uptime_seconds': round(time.time() - self.started_at, 1),
+                         'requests': requests}
+        if method == 'GET' and path == '/tables':
+            return 200, self.catalog(oracle_dict)
+        if method == 'GET' and path == '/table':
+            info = oracle_dict.get_table_info(query.get('name', ''))
+            if info is None:
+                return 404, {'error': f"Table '{query.get('name', '')}' not found"}
+            return 200, info
+        if method == 'GET' and path == '/resolve':
+            name = query.get('name', '').upper()
+            resolved = oracle_dict.index.resolve(name)
+            kind = None if resolved is None else 'view' if oracle_dict.index.is_view(name) else 'table'
+            return 200, {'name': name, 'resolved': resolved, 'kind': kind}
+        if method == 'GET' and path == '/sequence':
+            info = oracle_dict.get_sequence_info(query.get('name', ''))
+            if info is None:
+                return 404, {'error': f"Sequence '{query.get('name', '')}' not found"}
+            return 200, info
+        if method == 'GET' and path == '/lookup':
+            return 200, oracle_dict.lookup(query.get('column', ''))
+        if method == 'POST' and path == '/tables':
+            found = {}
+            for name in payload.get('names', []):
+                info = oracle_dict.get_table_info(name)
+                if info is not None:
+                    found[name] = info
+            return 200, {'tables': found}
+        if method == 'POST' and path == '/lookup_many':
+            return 200, {'results': {column: oracle_dict.lookup(column)
+                                     for column in payload.get('columns', [])}}
+        if method == 'POST' and path == '/match':
+            return 200, {'tables': oracle_dict.index.find_tables(payload.get('text', ''))}
+        if method == 'POST' and path == '/reload':
+            return 200, self.reload()
+        return 404, {'error': f"Unknown endpoint: {method} {path}"}
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, payload: Dict[str, Any]):
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _dispatch(self, method: str):
+                parsed = urlparse(self.path)
+                query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+                payload = {}
+                if method == 'POST':
+                    raw = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                    try:
+                        payload = json.loads(raw.decode('utf-8')) if raw else {}
+                    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+                        self._send_json(400, {'error': f"Invalid JSON body: {e}"})
+                        return
+                server._count(parsed.path)
+                try:
+                    status, body = server.handle(method, parsed.path, query, payload)
+                except Exception as e:
+                    status, body = 500, {'error': str(e)}
+                self._send_json(status, body)
+
+            def do_GET(self):
+                self._dispatch('GET')
+
+            def do_POST(self):
+                self._dispatch('POST')
+
+        return Handler
+
+
+def main():
+    """Run the dictionary server in the foreground"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Serve the Oracle dictionary to concurrently running tools'
+    )
+    parser.add_argument('--input', type=str,
+                        default=os.getenv('ORACLE_DICT_PATH', './output/oracle_dictionary.json'),
+                        help='Dictionary file, JSON or SQLite (default: ORACLE_DICT_PATH)')
+    parser.add_argument('--host', default='127.0.0.1', help='Bind address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8766, help='Port (default: 8766)')
+    parser.add_argument('--socket', type=str, help='Listen on this Unix socket instead of TCP')
+    args = parser.parse_args()
+
+    if not Path(args.input).exists():
+        print(f"✗ Dictionary not found: {args.input}")
+        sys.exit(1)
+
+    server = DictionaryServer(args.input, host=args.host, port=args.port, socket_path=args.socket)
+    print(f"✓ Dictionary server listening on {server.url}")
+    print(f"  export ORACLE_DICT_URL={server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping")
+        server.httpd.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
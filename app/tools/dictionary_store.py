@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Oracle Dictionary Store
+Compact SQLite container for oracle_dictionary data with lazy per-table loading
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+import zlib
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from dictionary_client import is_dictionary_url, open_remote_dictionary
+
+SQLITE_MAGIC = b'SQLite format 3\x00'
+SQLITE_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+FORMAT_VERSION = '1'
+
+SCHEMA_SQL = """
+    CREATE TABLE meta (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    );
+    CREATE TABLE tables (
+        table_name TEXT PRIMARY KEY,
+        error TEXT,
+        data BLOB NOT NULL
+    );
+"""
+
+
+def is_sqlite_dictionary(path) -> bool:
+    """True if the file is a SQLite container (checked by header, not by extension)"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+    except OSError:
+        return False
+
+
+def _encode(table_info: Dict[str, Any]) -> bytes:
+    return zlib.compress(json.dumps(table_info, ensure_ascii=False, separators=(',', ':'))
+                         .encode('utf-8'))
+
+
+def _decode(data: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(data).decode('utf-8'))
+
+
+class LazyTables(Mapping):
+    """Read-only table_name -> table info mapping backed by a SQLite dictionary
+
+    Only table names and errors are read when opened; a table's columns are decoded on first
+    access and cached. The primary key index of the tables table is the per-table offset index.
+    """
+
+    lazy = True
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self._connection = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True,
+                                           check_same_thread=False)
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        rows = self._connection.execute(
+            "SELECT table_name, error FROM tables ORDER BY rowid").fetchall()
+        self._names: List[str] = [name for name, _ in rows]
+        self._name_set = set(self._names)
+        self.errors: Dict[str, str] = {name: error for name, error in rows if error is not None}
+
+    def __getitem__(self, table_name: str) -> Dict[str, Any]:
+        with self._lock:
+            cached = self._cache.get(table_name)
+            if cached is not None:
+                return cached
+            if table_name not in self._name_set:
+                raise KeyError(table_name)
+            row = self._connection.execute(
+                "SELECT data FROM tables WHERE table_name = ?", (table_name,)).fetchone()
+            table_info = _decode(row[0])
+            self._cache[table_name] = table_info
+            return table_info
+
+    def __contains__(self, table_name) -> bool:
+        return table_name in self._name_set
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def meta(self) -> Dict[str, Any]:
+        """Top-level dictionary fields (schema, generated_at, ...)"""
+        with self._lock:
+            rows = self._connection.execute("SELECT key, value FROM meta").fetchall()
+        return {key: json.loads(value) for key, value in rows if key != 'format_version'}
+
+    def valid_names(self) -> List[str]:
+        """Tables that were extracted without error"""
+        return [name for name in self._names if name not in self.errors]
+
+    def loaded_count(self) -> int:
+        with self._lock:
+            return len(self._cache)
+
+    def close(self):
+        self._connection.close()
+
+
+def load_dictionary_file(path) -> Dict[str, Any]:
+    """Open a dictionary in either format: JSON is parsed fully, SQLite is opened lazily
+
+    An http:// or unix:// location opens a running dictionary_server.py instead.
+    """
+    if is_dictionary_url(path):
+        return open_remote_dictionary(path)
+    if is_sqlite_dictionary(path):
+        tables = LazyTables(path)
+        dictionary = tables.meta()
+        dictionary['tables'] = tables
+        return dictionary
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_sqlite_dictionary(dictionary: Dict[str, Any], db_path):
+    """Write a dictionary as a SQLite container (atomically replaces db_path)"""
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = db_path.with_name(db_path.name + '.tmp')
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    connection = sqlite3.connect(tmp_path)
+    try:
+        connection.executescript(SCHEMA_SQL)
+        meta = {key: value for key, value in dictionary.items() if key != 'tables'}
+        meta['format_version'] = FORMAT_VERSION
+        connection.executemany("INSERT INTO meta (key, value) VALUES (?, ?)",
+                               [(key, json.dumps(value, ensure_ascii=False))
+                                for key, value in meta.items()])
+        tables = dictionary.get('tables', {})
+        # Generator: tables are read (and, from a lazy source, decoded) one at a time
+        connection.executemany(
+            "INSERT INTO tables (table_name, error, data) VALUES (?, ?, ?)",
+            ((name, entry.get('error'), _encode(entry))
+             for name, entry in ((name, tables[name]) for name in tables)))
+        connection.commit()
+    finally:
+        connection.close()
+    os.replace(tmp_path, db_path)
+
+
+def _indented(value: Any, level: int) -> str:
+    """json.dumps(indent=2) of a value nested `level` levels deep in the document"""
+    return json.dumps(value, indent=2, ensure_ascii=False).replace('\n', '\n' + '  ' * level)
+
+
+def write_json_dictionary(dictionary: Dict[str, Any], json_path):
+    """Write a dictionary (either source format) as oracle_dictionary.json
+
+    Tables are serialized one at a time, so a lazy source is never fully in memory; the output
+    is identical to json.dump(indent=2) and atomically replaces json_path.
+    """
+    json_path = Path(json_path)
+    json_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = json_path.with_name(json_path.name + '.tmp')
+
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write('{')
+        for position, (key, value) in enumerate(dictionary.items()):
+            f.write(f"{',' if position else ''}\n  {json.dumps(key, ensure_ascii=False)}: ")
+            if key != 'tables':
+                f.write(_indented(value, 1))
+                continue
+            f.write('{')
+            for table_position, name in enumerate(value):
+                f.write(f"{',' if table_position else ''}\n    "
+                        f"{json.dumps(name, ensure_ascii=False)}: {_indented(value[name], 2)}")
+            f.write('\n  }' if len(value) else '}')
+        f.write('\n}' if len(dictionary) else '}')
+    os.replace(tmp_path, json_path)
+
+
+def wants_sqlite(path) -> bool:
+    """Output format of a dictionary path, chosen by its extension"""
+    return Path(path).suffix.lower() in SQLITE_SUFFIXES
+
+
+def main():
+    """Convert between oracle_dictionary.json and the SQLite container"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Convert an Oracle dictionary between JSON and SQLite (lazy per-table loading)')
+    parser.add_argument('input', help='Existing dictionary (JSON or SQLite)')
+    parser.add_argument('output', help='Target path: .db/.sqlite/.sqlite3 writes SQLite, '
+                                       'anything else writes JSON')
+    args = parser.parse_args()
+
+    if not Path(args.input).exists():
+        print(f"✗ Dictionary not found: {args.input}")
+        sys.exit(1)
+
+    dictionary = load_dictionary_file(args.input)
+    if wants_sqlite(args.output):
+        write_sqlite_dictionary(dictionary, args.output)
+    else:
+        write_json_dictionary(dictionary, args.output)
+
+    tables = dictionary.get('tables', {})
+    print(f"✓ {len(tables)} tables: {args.input} ({os.path.getsize(args.input):,} bytes) -> "
+          f"{args.output} ({os.path.getsize(args.output):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
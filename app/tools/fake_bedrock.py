@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Fake Bedrock Runtime
+Local stand-in for the bedrock-runtime invoke_model / invoke_model_with_response_stream API
+with configurable latency, throttling and response shapes, and canned outputs for the
+conversion tools (load testing without a live endpoint)
+
+Point boto3 at it with:
+  AWS_ENDPOINT_URL_BEDROCK_RUNTIME=http://127.0.0.1:<port>
+"""
+
+import re
+import sys
+import json
+import time
+import base64
+import random
+import struct
+import binascii
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from llm_metrics import percentile
+
+
+def encode_event(headers: Dict[str, str], payload: bytes) -> bytes:
+    """One AWS event-stream message (string headers only)"""
+    header_bytes = b''
+    for name, value in headers.items():
+        name_raw = name.encode('utf-8')
+        value_raw = value.encode('utf-8')
+        header_bytes += struct.pack('!B', len(name_raw)) + name_raw
+        header_bytes += struct.pack('!BH', 7, len(value_raw)) + value_raw   # 7 = string
+
+    total_length = 12 + len(header_bytes) + len(payload) + 4
+    prelude = struct.pack('!II', total_length, len(header_bytes))
+    prelude += struct.pack('!I', binascii.crc32(prelude) & 0xffffffff)
+    message = prelude + header_bytes + payload
+    return message + struct.pack('!I', binascii.crc32(message) & 0xffffffff)
+
+
+def encode_chunk(event: Dict[str, Any]) -> bytes:
+    """Bedrock response-stream chunk carrying one Anthropic streaming event"""
+    payload = json.dumps({'bytes': base64.b64encode(json.dumps(event).encode('utf-8')).decode('ascii')})
+    return encode_event({
+        ':event-type': 'chunk',
+        ':content-type': 'application/json',
+        ':message-type': 'event'
+    }, payload.encode('utf-8'))
+
+
+class CannedResponder:
+    """Builds deterministic responses for the prompts used by the app tools"""
+
+    STATEMENT_PATTERN = re.compile(r'<(select|insert|update|delete|sql)\b[^>]*>.*?</\1>', re.DOTALL)
+    TABLE_PATTERN = re.compile(r'\b(?:FROM|JOIN|INTO|UPDATE)\s+([A-Za-z_][\w$#]*)', re.IGNORECASE)
+    BIND_PATTERN = re.compile(r'[#$]\{\s*(\w+)[^}]*\}')
+    XML_DOC_PATTERN = re.compile(r'<\?xml.*?</mapper>', re.DOTALL)
+    SQL_KEYWORDS = {'SELECT', 'WHERE', 'SET', 'VALUES', 'DUAL'}
+
+    def kind(self, system: str, prompt: str) -> str:
+        """Which tool/call type a request comes from"""
+        if 'SQL parser' in system:
+            return 'table_extraction'
+        if 'JSON formatter' in system:
+            return 'json_fix'
+        if 'database migration specialist' in system:
+            return 'sql_conversion'
+        if 'type casting specialist' in system:
+            return 'type_casting'
+        if 'PostgreSQL SQL expert' in system:
+            return 'fix_type_error'
+        if 'OGNL' in system:
+            return 'ognl_handler'
+        if 'OGNL' in prompt:
+            return 'ognl_guide'
+        return 'other'
+
+    def tables(self, sql: str) -> List[str]:
+        found = []
+        for name in self.TABLE_PATTERN.findall(sql):
+            name = name.upper()
+            if name not in self.SQL_KEYWORDS and name not in found:
+                found.append(name)
+        return found
+
+    def convert_statement(self, statement: str) -> str:
+        """Cheap Oracle -> PostgreSQL rewrite so outputs differ from inputs"""
+        statement = re.sub(r'\bNVL\s*\(', 'COALESCE(', statement, flags=re.IGNORECASE)
+        statement = re.sub(r'\bSYSDATE\b', 'CURRENT_TIMESTAMP', statement, flags=re.IGNORECASE)
+        return re.sub(r'\s+FROM\s+DUAL\b', '', statement, flags=re.IGNORECASE)
+
+    def conversion_json(self, statement: str) -> str:
+        tables = self.tables(statement) or ['UNKNOWN']
+        binds = list(dict.fromkeys(self.BIND_PATTERN.findall(statement)))
+        return json.dumps({
+            'converted_xml': self.convert_statement(statement),
+            'bind_variables': {f"#{{{name}}}": f"{tables[0]}.{name.upper()}" for name in binds},
+            'test_cases': [{'description': 'default', 'parameters': {name: '1' for name in binds}}]
+        }, ensure_ascii=False)
+
+    def respond(self, kind: str, system: str, prompt: str) -> str:
+        if kind == 'table_extraction':
+            return json.dumps(self.tables(prompt.split('Output ONLY', 1)[0]))
+
+        if kind == 'sql_conversion':
+            statement = self.STATEMENT_PATTERN.search(prompt.split('=== Included SQL Fragments ===', 1)[0])
+            return self.conversion_json(statement.group(0) if statement else '<select id="unknown">SELECT 1</select>')
+
+        if kind == 'json_fix':
+            # Recover converted_xml from the broken JSON quoted in the prompt
+            marker = prompt.find('"converted_xml"')
+            if marker >= 0:
+                try:
+                    value_start = prompt.index('"', prompt.index(':', marker))
+                    statement = json.JSONDecoder().raw_decode(prompt, value_start)[0]
+                    return self.conversion_json(statement)
+                except ValueError:
+                    pass
+            return self.conversion_json('<select id="unknown">SELECT 1</select>')
+
+        if kind in ('type_casting', 'fix_type_error'):
+            document = self.XML_DOC_PATTERN.search(prompt)
+            return self.convert_statement(document.group(0)) if document else prompt
+
+        if kind == 'ognl_handler':
+            package = re.search(r'Package:\s*([\w.]+)', prompt)
+            class_name = re.search(r'Class name:\s*(\w+)', prompt)
+            methods = re.findall(r'^- (\w+)\(\):', prompt, re.MULTILINE)
+            body = '\n'.join(
+                f"    public static boolean {method}(Object value) {{\n        return value != null;\n    }}\n"
+                for method in methods)
+            return (f"package {package.group(1) if package else 'generated'};\n\n"
+                    f"public class {class_name.group(1) if class_name else 'Handler'} {{\n{body}}}\n")
+
+        if kind == 'ognl_guide':
+            return "## 1. Overview\nGenerated by the fake Bedrock endpoint.\n"
+
+        return 'OK'
+
+
+class FakeBedrockServer:
+    """Threaded HTTP server answering bedrock-runtime requests
+
+    Response shapes (fractions of requests, decided per request):
+      throttle_rate      429 ThrottlingException
+      server_error_rate  500 InternalServerException
+      malformed_rate     conversion JSON with a structural error (forces json_fix)
+      truncate_rate      first half of the answer with stop_reason max_tokens
+                         (continuation requests get the rest)
+    max_rps additionally throttles requests above a token-bucket rate.
+    """
+
+    CACHE_TTL = 300.0   # Bedrock prompt cache entries live 5 minutes
+    STREAM_CHUNK_CHARS = 64
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0,
+                 latency_ms: float = 200.0, ms_per_token: float = 1.0, jitter_ms: float = 50.0,
+                 throttle_rate: float = 0.0, server_error_rate: float = 0.0, max_rps: Optional[float] = None,
+                 malformed_rate: float = 0.0, truncate_rate: float = 0.0, seed: Optional[int] = None):
+        self.latency_ms = latency_ms
+        self.ms_per_token = ms_per_token
+        self.jitter_ms = jitter_ms
+        self.throttle_rate = throttle_rate
+        self.server_error_rate = server_error_rate
+        self.max_rps = max_rps
+        self.malformed_rate = malformed_rate
+        self.truncate_rate = truncate_rate
+
+        self.responder = CannedResponder()
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.bucket_tokens = max_rps or 0.0
+        self.bucket_updated = time.monotonic()
+        self.prompt_cache: Dict[str, float] = {}
+        self.reset_stats()
+
+        handler = self._make_handler()
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def endpoint_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FakeBedrockServer':
+        """Serve in a background thread"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def reset_stats(self):
+        with self.lock:
+            self.stats = {
+                'requests': 0,
+                'streamed': 0,
+                'throttled': 0,
+                'server_errors': 0,
+                'malformed': 0,
+                'truncated': 0,
+                'client_disconnects': 0,
+                'by_kind': {},
+                'tokens': {'input': 0, 'output': 0, 'cache_read': 0, 'cache_write': 0}
+            }
+            self.latencies: List[float] = []
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Server-side counters and latency percentiles (seconds)"""
+        with self.lock:
+            stats = json.loads(json.dumps(self.stats))
+            values = sorted(self.latencies)
+        stats['latency_seconds'] = {f'p{pct}': round(percentile(values, pct), 3) if values else None
+                                    for pct in (50, 95, 99)}
+        stats['latency_seconds']['max'] = round(values[-1], 3) if values else None
+        return stats
+
+    def _count(self, key: str, amount: int = 1):
+        with self.lock:
+            self.stats[key] += amount
+
+    def _roll(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self.lock:
+            return self.random.random() < rate
+
+    def _over_rate(self) -> bool:
+        """Token bucket of max_rps requests per second (burst = one second)"""
+        if not self.max_rps:
+            return False
+        with self.lock:
+            now = time.monotonic()
+            self.bucket_tokens = min(self.max_rps,
+                                     self.bucket_tokens + (now - self.bucket_updated) * self.max_rps)
+            self.bucket_updated = now
+            if self.bucket_tokens < 1:
+                return True
+            self.bucket_tokens -= 1
+            return False
+
+    @staticmethod
+    def _text(content) -> str:
+        if isinstance(content, str):
+            return content
+        return ''.join(block.get('text', '') for block in content if isinstance(block, dict))
+
+    def _usage(self, body: Dict[str, Any], output_text: str) -> Dict[str, int]:
+        """Token counts (len/4), splitting input at the last cache point like Bedrock does"""
+        segments: List[Tuple[str, bool]] = []
+        system = body.get('system', '')
+        if isinstance(system, list):
+            segments += [(block.get('text', ''), 'cache_control' in block) for block in system]
+        else:
+            segments.append((system or '', False))
+        for message in body.get('messages', []):
+            content = message.get('content', '')
+            if isinstance(content, list):
+                segments += [(block.get('text', ''), 'cache_control' in block) for block in content]
+            else:
+                segments.append((content, False))
+
+        last_point = max((i for i, (_, cached) in enumerate(segments) if cached), default=-1)
+        prefix = ''.join(text for text, _ in segments[:last_point + 1])
+        rest = ''.join(text for text, _ in segments[last_point + 1:])
+        usage = {'input_tokens': len(rest) // 4, 'output_tokens': max(1, len(output_text) // 4),
+                 'cache_read_input_tokens': 0, 'cache_creation_input_tokens': 0}
+
+        if prefix:
+            key = hashlib.sha256(prefix.encode('utf-8')).hexdigest()
+            now = time.monotonic()
+            with self.lock:
+                hit = now - self.prompt_cache.get(key, -self.CACHE_TTL) < self.CACHE_TTL
+                self.prompt_cache[key] = now
+            usage['cache_read_input_tokens' if hit else 'cache_creation_input_tokens'] = len(prefix) // 4
+
+        with self.lock:
+            self.stats['tokens']['input'] += usage['input_tokens']
+            self.stats['tokens']['output'] += usage['output_tokens']
+            self.stats['tokens']['cache_read'] += usage['cache_read_input_tokens']
+            self.stats['tokens']['cache_write'] += usage['cache_creation_input_tokens']
+        return usage
+
+    def build_response(self, body: Dict[str, Any]) -> Tuple[str, str, str]:
+        """Return (kind, text, stop_reason) for a request body"""
+        messages = body.get('messages', [])
+        system = self._text(body.get('system', ''))
+        prompt = self._text(messages[0].get('content', '')) if messages else ''
+        kind = self.responder.kind(system, prompt)
+        full_text = self.responder.respond(kind, system, prompt)
+
+        # Continuation request: answer with what follows the assistant's partial text
+        partial = ''.join(self._text(m.get('content', '')) for m in messages if m.get('role') == 'assistant')
+        if partial:
+            return kind, full_text[len(partial):] if full_text.startswith(partial) else '', 'end_turn'
+
+        if kind == 'sql_conversion' and self._roll(self.malformed_rate):
+            self._count('malformed')
+            return kind, full_text[:-1] + ',}', 'end_turn'
+        if self._roll(self.truncate_rate) and len(full_text) > 1:
+            self._count('truncated')
+            return kind, full_text[:len(full_text) // 2], 'max_tokens'
+        return kind, full_text, 'end_turn'
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            PATH_PATTERN = re.compile(r'^/model/([^/]+)/(invoke|invoke-with-response-stream)$')
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, payload: Dict[str, Any], error_type: Optional[str] = None):
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                if error_type:
+                    self.send_header('x-amzn-ErrorType', error_type)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path == '/stats':
+                    self._send_json(200, server.get_stats())
+                else:
+                    self._send_json(404, {'message': 'Not found'})
+
+            def do_POST(self):
+                raw = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                match = self.PATH_PATTERN.match(self.path.split('?', 1)[0])
+                if not match:
+                    self._send_json(404, {'message': f'Unknown path {self.path}'}, 'UnknownOperationException')
+                    return
+
+                start = time.time()
+                server._count('requests')
+                if server._over_rate() or server._roll(server.throttle_rate):
+                    server._count('throttled')
+                    self._send_json(429, {'message': 'Too many requests, please wait before trying again.'},
+                                    'ThrottlingException')
+                    return
+                if server._roll(server.server_error_rate):
+                    server._count('server_errors')
+                    self._send_json(500, {'message': 'Internal server error'}, 'InternalServerException')
+                    return
+
+                try:
+                    body = json.loads(raw)
+                except ValueError:
+                    self._send_json(400, {'message': 'Malformed input request'}, 'ValidationException')
+                    return
+
+                kind, text, stop_reason = server.build_response(body)
+                usage = server._usage(body, text)
+                with server.lock:
+                    server.stats['by_kind'][kind] = server.stats['by_kind'].get(kind, 0) + 1
+
+                try:
+                    if match.group(2) == 'invoke':
+                        server._sleep(usage['output_tokens'])
+                        self._send_json(200, {
+                            'id': f"msg_fake_{server.stats['requests']}",
+                            'type': 'message',
+                            'role': 'assistant',
+                            'content': [{'type': 'text', 'text': text}],
+                            'stop_reason': stop_reason,
+                            'usage': usage
+                        })
+                    else:
+                        server._count('streamed')
+                        self._stream(text, stop_reason, usage)
+                except (BrokenPipeError, ConnectionResetError):
+                    server._count('client_disconnects')
+                    self.close_connection = True
+                finally:
+                    with server.lock:
+                        server.latencies.append(time.time() - start)
+
+            def _write_chunk(self, data: bytes):
+                self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b'\r\n')
+                self.wfile.flush()
+
+            def _stream(self, text: str, stop_reason: str, usage: Dict[str, int]):
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/vnd.amazon.eventstream')
+                self.send_header('X-Amzn-Bedrock-Content-Type', 'application/json')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+
+                server._sleep(0)   # time to first token
+                input_usage = {key: value for key, value in usage.items() if key != 'output_tokens'}
+                self._write_chunk(encode_chunk({'type': 'message_start', 'message': {
+                    'role': 'assistant', 'content': [], 'usage': dict(input_usage, output_tokens=1)}}))
+                self._write_chunk(encode_chunk({'type': 'content_block_start', 'index': 0,
+                                                'content_block': {'type': 'text', 'text': ''}}))
+                step = server.STREAM_CHUNK_CHARS
+                for offset in range(0, len(text), step):
+                    piece = text[offset:offset + step]
+                    time.sleep(len(piece) / 4 * server.ms_per_token / 1000.0)
+                    self._write_chunk(encode_chunk({'type': 'content_block_delta', 'index': 0,
+                                                    'delta': {'type': 'text_delta', 'text': piece}}))
+                self._write_chunk(encode_chunk({'type': 'content_block_stop', 'index': 0}))
+                self._write_chunk(encode_chunk({'type': 'message_delta', 'delta': {'stop_reason': stop_reason},
+                                                'usage': {'output_tokens': usage['output_tokens']}}))
+                self._write_chunk(encode_chunk({'type': 'message_stop'}))
+                self.wfile.write(b'0\r\n\r\n')
+                self.wfile.flush()
+
+        return Handler
+
+    def _sleep(self, output_tokens: int):
+        """Base latency + jitter + per-output-token generation time"""
+        with self.lock:
+            jitter = self.random.uniform(0, self.jitter_ms)
+        time.sleep((self.latency_ms + jitter + output_tokens * self.ms_per_token) / 1000.0)
+
+
+def main():
+    """Run the fake endpoint in the foreground"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Local fake bedrock-runtime endpoint for load tests (no AWS calls)'
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='Bind address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Port (default: 8765)')
+    parser.add_argument('--latency-ms', type=float, default=200, help='Base latency per request (default: 200)')
+    parser.add_argument('--ms-per-token', type=float, default=1.0,
+                        help='Generation time per output token (default: 1.0)')
+    parser.add_argument('--jitter-ms', type=float, default=50, help='Uniform random extra latency (default: 50)')
+    parser.add_argument('--throttle-rate', type=float, default=0.0,
+                        help='Fraction of requests rejected with ThrottlingException (default: 0)')
+    parser.add_argument('--max-rps', type=float, help='Throttle requests above this rate (default: unlimited)')
+    parser.add_argument('--server-error-rate', type=float, default=0.0,
+                        help='Fraction of requests failing with InternalServerException (default: 0)')
+    parser.add_argument('--malformed-rate', type=float, default=0.0,
+                        help='Fraction of conversion answers with malformed JSON (default: 0)')
+    parser.add_argument('--truncate-rate', type=float, default=0.0,
+                        help='Fraction of answers cut off with stop_reason max_tokens (default: 0)')
+    parser.add_argument('--seed', type=int, help='Random seed for reproducible response shapes')
+    args = parser.parse_args()
+
+    server = FakeBedrockServer(
+        host=args.host, port=args.port,
+        latency_ms=args.latency_ms, ms_per_token=args.ms_per_token, jitter_ms=args.jitter_ms,
+        throttle_rate=args.throttle_rate, server_error_rate=args.server_error_rate, max_rps=args.max_rps,
+        malformed_rate=args.malformed_rate, truncate_rate=args.truncate_rate, seed=args.seed
+    )
+    print(f"✓ Fake Bedrock listening on {server.endpoint_url} (stats: {server.endpoint_url}/stats)")
+    print(f"  export AWS_ENDPOINT_URL_BEDROCK_RUNTIME={server.endpoint_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping")
+        print(json.dumps(server.get_stats(), indent=2))
+        server.httpd.server_close()
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,24 +6,28 @@ Fix type casting errors in target mapper files using LLM
 import json
 import sys
 import re
-import boto3
 from pathlib import Path
 from typing import Dict, Optional
 import os
 
+from bedrock_client import BedrockClient
+from dictionary_client import is_dictionary_url
+from dictionary_index import DictionaryIndex
+from dictionary_store import load_dictionary_file
+
 # Environment variables are loaded by skill script via tools/load_oma_env.sh
 
 class TypeErrorFixer:
     def __init__(self, model_id: str, region: str, dict_path: Path):
         self.model_id = model_id
         self.region = region
-        self.bedrock = boto3.client('bedrock-runtime', region_name=region)
+        self.bedrock = BedrockClient(region_name=region, model_id=model_id)
 
         # Load Oracle dictionary for schema info
         self.oracle_dict = None
-        if dict_path and dict_path.exists():
-            with open(dict_path, 'r', encoding='utf-8') as f:
-                self.oracle_dict = json.load(f)
+        if dict_path and (is_dictionary_url(dict_path) or Path(dict_path).exists()):
+            self.oracle_dict = load_dictionary_file(dict_path)
+        self.dict_index = DictionaryIndex(self.oracle_dict)
 
     def extract_schema_info(self, xml_content: str) -> str:
         """Extract relevant schema information from Oracle dictionary"""
@@ -32,15 +36,12 @@ class TypeErrorFixer:
 
         schema_info = "\n=== Oracle Schema Information ===\n"
 
-        # Find relevant tables (simple string matching, no regex)
-        relevant_tables = []
-        for table_name in self.oracle_dict['tables'].keys():
-            if table_name in xml_content.upper():
-                relevant_tables.append(table_name)
+        # Find relevant tables (whole-word matches in a single pass)
+        relevant_tables = self.dict_index.find_tables(xml_content)
 
         # Add schema for relevant tables
         for table_name in relevant_tables[:5]:
-            table_info = self.oracle_dict['tables'][table_name]
+            table_info = self.dict_index.get_object_info(table_name) or {}
             schema_info += f"\nTable: {table_name}\n"
 
             for col in table_info.get('columns', [])[:20]:
@@ -72,12 +73,7 @@ class TypeErrorFixer:
             if not self.model_id.endswith('opus-4-8'):
                 body["temperature"] = 0.0
 
-            response = self.bedrock.invoke_model(
-                modelId=self.model_id,
-                body=json.dumps(body)
-            )
-
-            response_body = json.loads(response['body'].read())
+            response_body = self.bedrock.invoke_model(body)
             return response_body['content'][0]['text']
 
         except Exception as e:
@@ -177,7 +173,8 @@ def main():
 
     error_report_path = Path(sys.argv[1])
     convert_dir = Path(sys.argv[2])
-    dict_path = Path("output/oracle_dictionary.json")
+    # A running dictionary server (ORACLE_DICT_URL) is shared instead of reading the file
+    dict_path = os.getenv('ORACLE_DICT_URL') or Path("output/oracle_dictionary.json")
 
     if not error_report_path.exists():
         print(f"Error: {error_report_path} not found")
@@ -240,6 +237,9 @@ def main():
     print(f"Summary:")
     print(f"  Fixed: {fixed_count}")
     print(f"  Failed: {failed_count}")
+    bedrock_stats = fixer.bedrock.get_stats()
+    print(f"  Bedrock retries: {bedrock_stats['total_retries']} "
+          f"(waited {bedrock_stats['retry_wait_seconds']}s)")
     print(f"{'='*70}\n")
 
 if __name__ == "__main__":
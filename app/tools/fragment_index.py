@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+SQL Fragment Index
+Split <sql> fragment files parsed once per run: (base mapper, refid) -> serialized fragment,
+with nested and cross-namespace <include refid="..."/> resolution
+"""
+
+import re
+import threading
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from xml.sax.saxutils import unescape
+
+
+class FragmentIndex:
+    """Thread-safe index over {base}_fragment_{refid}.xml files of a source directory
+
+    MyBatis refid rules: a plain refid names a fragment of the including mapper, a dotted
+    refid is "<namespace>.<id>" of any mapper. Fragments may include other fragments;
+    resolved include closures are memoized per (base mapper, refid).
+    """
+
+    FRAGMENT_MARKER = '_fragment_'
+    INCLUDE_PATTERN = re.compile(r'<include\b[^>]*?\brefid\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+
+    def __init__(self, source_dir):
+        self.source_dir = Path(source_dir)
+        self.fragments: Dict[Tuple[str, str], str] = {}   # (base mapper, id) -> <sql> XML
+        self.namespaces: Dict[str, str] = {}               # namespace -> base mapper
+        self.base_namespaces: Dict[str, str] = {}          # base mapper -> namespace
+        self.bases: List[str] = []                          # longest first, for file name matching
+        self.errors: Dict[str, str] = {}
+
+        self._closures: Dict[Tuple[str, str], List[Tuple[str, str]]] = {}
+        self._lock = threading.Lock()
+        self._built = False
+        self.stats = {
+            'files': 0,
+            'fragments': 0,
+            'lookups': 0,
+            'closure_cache_hits': 0,
+            'unresolved': 0
+        }
+
+    def build(self) -> 'FragmentIndex':
+        """Parse every fragment file once (no-op after the first call)"""
+        with self._lock:
+            if self._built:
+                return self
+
+            for path in sorted(self.source_dir.glob(f"*{self.FRAGMENT_MARKER}*.xml")):
+                base = path.stem.split(self.FRAGMENT_MARKER, 1)[0]
+                try:
+                    root = ET.parse(path).getroot()
+                except ET.ParseError as e:
+                    self.errors[path.name] = str(e)
+                    print(f"    ⚠ Error loading fragment {path.name}: {e}")
+                    continue
+
+                namespace = root.get('namespace')
+                if namespace:
+                    self.namespaces.setdefault(namespace, base)
+                    self.base_namespaces.setdefault(base, namespace)
+                for child in root:
+                    if child.tag == 'sql' and child.get('id'):
+                        self.fragments[(base, child.get('id'))] = ET.tostring(child, encoding='unicode',
+                                                                              method='xml')
+                self.stats['files'] += 1
+
+            self.bases = sorted({base for base, _ in self.fragments}, key=len, reverse=True)
+            self.stats['fragments'] = len(self.fragments)
+            self._built = True
+        return self
+
+    def base_name(self, xml_path: Path) -> str:
+        """Base mapper name of a split file (e.g. UserMapper from UserMapper_select_list.xml)"""
+        stem = Path(xml_path).stem
+        if self.FRAGMENT_MARKER in stem:
+            return stem.split(self.FRAGMENT_MARKER, 1)[0]
+        # Statement ids may contain '_': prefer a known base mapper over splitting at the last '_'
+        for base in self.bases:
+            if stem.startswith(base + '_'):
+                return base
+        return stem.rsplit('_', 1)[0] if '_' in stem else stem
+
+    @classmethod
+    def refids(cls, sql_xml: str) -> List[str]:
+        """refid values of all <include> elements, in document order"""
+        return [unescape(double or single)
+                for double, single in cls.INCLUDE_PATTERN.findall(sql_xml) if double or single]
+
+    def resolve(self, base: str, refid: str) -> Optional[Tuple[str, str]]:
+        """(base mapper, id) key of the fragment a refid points to from a given mapper"""
+        if (base, refid) in self.fragments:
+            return base, refid
+        if '.' in refid:
+            namespace, fragment_id = refid.rsplit('.', 1)
+            target_base = self.namespaces.get(namespace)
+            if target_base and (target_base, fragment_id) in self.fragments:
+                return target_base, fragment_id
+        return None
+
+    def _closure(self, base: str, refid: str) -> List[Tuple[str, str]]:
+        """Fragment plus everything it includes: [(refid as seen from base, fragment XML)]"""
+        cache_key = (base, refid)
+        with self._lock:
+            cached = self._closures.get(cache_key)
+            if cached is not None:
+                self.stats['closure_cache_hits'] += 1
+                return cached
+
+        result = []
+        seen = set()
+        unresolved = 0
+        queue = [(base, refid)]
+        while queue:
+            current_base, current_refid = queue.pop(0)
+            target = self.resolve(current_base, current_refid)
+            if target is None:
+                unresolved += 1
+                continue
+            if target in seen:   # include cycle or diamond
+                continue
+            seen.add(target)
+
+            # Fragments of other mappers are listed under their qualified name
+            key = current_refid
+            if target[0] != base and target[0] in self.base_namespaces:
+                key = f"{self.base_namespaces[target[0]]}.{target[1]}"
+            content = self.fragments[target]
+            result.append((key, content))
+            queue.extend((target[0], nested) for nested in self.refids(content))
+
+        with self._lock:
+            self._closures[cache_key] = result
+            self.stats['unresolved'] += unresolved
+        return result
+
+    def fragments_for(self, sql_xml: str, base: str) -> Dict[str, str]:
+        """All fragments a statement includes, directly or through other fragments"""
+        with self._lock:
+            self.stats['lookups'] += 1
+        fragments = {}
+        for refid in self.refids(sql_xml):
+            for key, content in self._closure(base, refid):
+                fragments.setdefault(key, content)
+        return fragments
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats, parse_errors=len(self.errors))
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache
+Content-addressed on-disk cache for Bedrock responses, shared by conversion tools
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+
+class LLMCache:
+    """Persistent LLM response cache keyed by prompt content"""
+
+    # Bump when the cached payload layout changes
+    CACHE_FORMAT_VERSION = 1
+
+    def __init__(self, cache_dir: str, max_size_mb: int = 1024, max_age_days: int = 30,
+                 enabled: bool = True):
+        self.cache_dir = Path(cache_dir).resolve()
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.max_age_seconds = max_age_days * 86400
+        self.enabled = enabled
+
+        if self.enabled:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # Thread lock for counters
+        self.lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'writes': 0,
+            'expired': 0,
+            'evicted': 0
+        }
+
+    @staticmethod
+    def make_key(model_id: str, system_prompt: Any, prompt: Any, call_type: str) -> str:
+        """Build a content hash from everything that determines the LLM response"""
+        payload = json.dumps(
+            [LLMCache.CACHE_FORMAT_VERSION, model_id, system_prompt, prompt, call_type],
+            ensure_ascii=False,
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        """Shard entries by key prefix to keep directories small"""
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _count(self, counter: str, amount: int = 1):
+        with self.lock:
+            self.stats[counter] += amount
+
+    def get(self, key: str) -> Optional[str]:
+        """Return cached response or None on miss"""
+        if not self.enabled:
+            return None
+
+        entry_path = self._entry_path(key)
+        try:
+            stat = entry_path.stat()
+        except FileNotFoundError:
+            self._count('misses')
+            return None
+
+        # Age eviction on read
+        if self.max_age_seconds and time.time() - stat.st_mtime > self.max_age_seconds:
+            self._remove(entry_path)
+            self._count('expired')
+            self._count('misses')
+            return None
+
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            # Corrupt or concurrently removed entry - treat as miss
+            self._remove(entry_path)
+            self._count('misses')
+            return None
+
+        # Refresh access time for LRU size eviction (mtime keeps creation age)
+        try:
+            os.utime(entry_path, (time.time(), stat.st_mtime))
+        except OSError:
+            pass
+
+        self._count('hits')
+        return entry.get('response')
+
+    def put(self, key: str, response: str, metadata: Optional[Dict[str, Any]] = None):
+        """Store response atomically (write temp file, then rename)"""
+        if not self.enabled or response is None:
+            return
+
+        entry_path = self._entry_path(key)
+        entry = {
+            'key': key,
+            'created_at': time.time(),
+            'response': response
+        }
+        if metadata:
+            entry.update(metadata)
+
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=entry_path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, entry_path)
+            self._count('writes')
+        except OSError as e:
+            print(f"    ⚠ LLM cache write failed: {e}")
+
+    def _remove(self, path: Path):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    def evict(self) -> Dict[str, int]:
+        """Remove expired entries, then least recently used ones until under size limit"""
+        if not self.enabled or not self.cache_dir.exists():
+            return {'expired': 0, 'evicted': 0}
+
+        now = time.time()
+        expired = 0
+        entries = []  # (last_access, size, path)
+        total_size = 0
+
+        for entry_path in self.cache_dir.glob('*/*.json'):
+            try:
+                stat = entry_path.stat()
+            except FileNotFoundError:
+                continue
+
+            if self.max_age_seconds and now - stat.st_mtime > self.max_age_seconds:
+                self._remove(entry_path)
+                expired += 1
+                continue
+
+            entries.append((stat.st_atime, stat.st_size, entry_path))
+            total_size += stat.st_size
+
+        evicted = 0
+        if self.max_size_bytes and total_size > self.max_size_bytes:
+            entries.sort(key=lambda x: x[0])
+            for _, size, entry_path in entries:
+                if total_size <= self.max_size_bytes:
+                    break
+                self._remove(entry_path)
+                total_size -= size
+                evicted += 1
+
+        self._count('expired', expired)
+        self._count('evicted', evicted)
+        return {'expired': expired, 'evicted': evicted}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return counters for the conversion report"""
+        with self.lock:
+            stats = dict(self.stats)
+
+        lookups = stats['hits'] + stats['misses']
+        stats['enabled'] = self.enabled
+        stats['cache_dir'] = str(self.cache_dir)
+        stats['hit_rate'] = f"{(stats['hits'] / lookups * 100):.2f}%" if lookups > 0 else "0%"
+        return stats
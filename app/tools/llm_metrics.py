@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+LLM Call Metrics
+Per-call token usage, latency histograms and percentiles for the conversion report,
+with an optional Prometheus text format export
+"""
+
+import os
+import math
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class LLMMetrics:
+    """Thread-safe collector of Bedrock call metrics"""
+
+    # Histogram bucket upper bounds (seconds)
+    LATENCY_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300, 600)
+    TOKEN_KINDS = ('input', 'output', 'cache_read', 'cache_write')
+    CACHE_SOURCES = ('response_cache', 'batch')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.call_types: Dict[str, Dict[str, Any]] = {}
+        self.files: Dict[str, Dict[str, int]] = {}
+
+    def _call_type(self, call_type: str) -> Dict[str, Any]:
+        if call_type not in self.call_types:
+            self.call_types[call_type] = {
+                'calls': 0,
+                'continuations': 0,
+                'tokens': {kind: 0 for kind in self.TOKEN_KINDS},
+                'latencies': [],
+                'bucket_counts': [0] * (len(self.LATENCY_BUCKETS) + 1),  # last = +Inf
+                'cache_hits': {source: 0 for source in self.CACHE_SOURCES}
+            }
+        return self.call_types[call_type]
+
+    def record(self, call_type: str, usage: Dict[str, Any], latency: Optional[float] = None,
+               continuations: int = 0, file_name: Optional[str] = None):
+        """Record one logical LLM call (all continuation segments together)
+
+        Args:
+            usage: Anthropic usage block (input/output/cache token counts)
+            latency: End-to-end seconds including retries (None for batch results)
+        """
+        tokens = {
+            'input': usage.get('input_tokens', 0) or 0,
+            'output': usage.get('output_tokens', 0) or 0,
+            'cache_read': usage.get('cache_read_input_tokens', 0) or 0,
+            'cache_write': usage.get('cache_creation_input_tokens', 0) or 0
+        }
+
+        with self.lock:
+            entry = self._call_type(call_type)
+            entry['calls'] += 1
+            entry['continuations'] += continuations
+            for kind, count in tokens.items():
+                entry['tokens'][kind] += count
+
+            if latency is not None:
+                entry['latencies'].append(latency)
+                for i, bound in enumerate(self.LATENCY_BUCKETS):
+                    if latency <= bound:
+                        entry['bucket_counts'][i] += 1
+                        break
+                else:
+                    entry['bucket_counts'][-1] += 1
+
+            if file_name:
+                file_entry = self.files.setdefault(file_name, {'calls': 0, 'input': 0, 'output': 0,
+                                                               'cache_read': 0, 'cache_write': 0})
+                file_entry['calls'] += 1
+                for kind, count in tokens.items():
+                    file_entry[kind] += count
+
+    def record_cache_hit(self, call_type: str, source: str):
+        """Record a call answered without Bedrock ('response_cache' or 'batch' replay)"""
+        with self.lock:
+            self._call_type(call_type)['cache_hits'][source] += 1
+
+    @staticmethod
+    def _latency_summary(latencies: List[float]) -> Dict[str, Optional[float]]:
+        values = sorted(latencies)
+        summary = {f'p{pct}': percentile(values, pct) for pct in (50, 95, 99)}
+        summary['avg'] = sum(values) / len(values) if values else None
+        summary['max'] = values[-1] if values else None
+        return {key: round(value, 3) if value is not None else None for key, value in summary.items()}
+
+    def get_report(self, top_files: int = 20) -> Dict[str, Any]:
+        """Metrics for conversion-report.json"""
+        with self.lock:
+            by_call_type = {}
+            totals = {kind: 0 for kind in self.TOKEN_KINDS}
+            all_latencies = []
+            for call_type, entry in sorted(self.call_types.items()):
+                by_call_type[call_type] = {
+                    'calls': entry['calls'],
+                    'continuations': entry['continuations'],
+                    'cache_hits': dict(entry['cache_hits']),
+                    'tokens': dict(entry['tokens']),
+                    'latency_seconds': self._latency_summary(entry['latencies'])
+                }
+                for kind in self.TOKEN_KINDS:
+                    totals[kind] += entry['tokens'][kind]
+                all_latencies.extend(entry['latencies'])
+
+            file_totals = sorted(
+                ({'file': name, 'llm_calls': entry['calls'],
+                  'input_tokens': entry['input'] + entry['cache_read'] + entry['cache_write'],
+                  'output_tokens': entry['output']}
+                 for name, entry in self.files.items()),
+                key=lambda item: item['input_tokens'] + item['output_tokens'],
+                reverse=True
+            )
+
+        per_file_tokens = sorted(item['input_tokens'] + item['output_tokens'] for item in file_totals)
+        return {
+            'by_call_type': by_call_type,
+            'tokens': totals,
+            'latency_seconds': self._latency_summary(all_latencies),
+            'per_file': {
+                'files': len(file_totals),
+                'avg_input_tokens': round(sum(i['input_tokens'] for i in file_totals) / len(file_totals))
+                                    if file_totals else 0,
+                'avg_output_tokens': round(sum(i['output_tokens'] for i in file_totals) / len(file_totals))
+                                     if file_totals else 0,
+                'p95_total_tokens': percentile(per_file_tokens, 95),
+                'top_files': file_totals[:top_files]
+            }
+        }
+
+    def write_prometheus(self, path: str, extra: Optional[Dict[str, Any]] = None):
+        """Write metrics in Prometheus text exposition format (version 0.0.4)
+
+        Args:
+            extra: {metric name: (type, help, {label tuple or None: value})} for pipeline-level
+                   counters/gauges (files, retries, rate limiter waits)
+        """
+        prefix = 'sql_converter'
+        lines = []
+
+        def header(name, metric_type, help_text):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+
+        with self.lock:
+            items = sorted(self.call_types.items())
+
+            header('llm_calls_total', 'counter', 'Bedrock calls by call type')
+            for call_type, entry in items:
+                lines.append(f'{prefix}_llm_calls_total{{call_type="{call_type}"}} {entry["calls"]}')
+
+            header('llm_continuations_total', 'counter', 'Continuation requests after max_tokens')
+            for call_type, entry in items:
+                lines.append(f'{prefix}_llm_continuations_total{{call_type="{call_type}"}} '
+                             f'{entry["continuations"]}')
+
+            header('llm_cache_hits_total', 'counter', 'Calls answered from the response cache or batch')
+            for call_type, entry in items:
+                for source in self.CACHE_SOURCES:
+                    labels = f'call_type="{call_type}",source="{source}"'
+                    lines.append(f'{prefix}_llm_cache_hits_total{{{labels}}} '
+                                 f'{entry["cache_hits"][source]}')
+
+            header('llm_tokens_total', 'counter', 'Tokens by call type and kind')
+            for call_type, entry in items:
+                for kind in self.TOKEN_KINDS:
+                    lines.append(f'{prefix}_llm_tokens_total{{call_type="{call_type}",kind="{kind}"}} '
+                                 f'{entry["tokens"][kind]}')
+
+            header('llm_latency_seconds', 'histogram', 'End-to-end Bedrock call latency including retries')
+            for call_type, entry in items:
+                cumulative = 0
+                for bound, count in zip(self.LATENCY_BUCKETS, entry['bucket_counts']):
+                    cumulative += count
+                    lines.append(f'{prefix}_llm_latency_seconds_bucket{{call_type="{call_type}",le="{bound}"}} '
+                                 f'{cumulative}')
+                cumulative += entry['bucket_counts'][-1]
+                lines.append(f'{prefix}_llm_latency_seconds_bucket{{call_type="{call_type}",le="+Inf"}} '
+                             f'{cumulative}')
+                lines.append(f'{prefix}_llm_latency_seconds_sum{{call_type="{call_type}"}} '
+                             f'{round(sum(entry["latencies"]), 3)}')
+                lines.append(f'{prefix}_llm_latency_seconds_count{{call_type="{call_type}"}} '
+                             f'{len(entry["latencies"])}')
+
+        for name, (metric_type, help_text, samples) in (extra or {}).items():
+            header(name, metric_type, help_text)
+            for labels, value in samples.items():
+                label_text = ''
+                if labels:
+                    label_text = '{' + ','.join(f'{key}="{val}"' for key, val in labels) + '}'
+                lines.append(f'{prefix}_{name}{label_text} {value}')
+
+        # Atomic replace so a textfile collector never reads a partial file
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        # mkstemp creates the file 0600; the collector usually runs as another user
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
@@ -7,15 +7,35 @@ Extracts metadata and sample data from Oracle database schema
 import os
 import sys
 import json
+import time
 import oracledb
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Any
 from datetime import datetime
 from pathlib import Path
 
+from column_profiler import ColumnProfiler
+from dictionary_index import DictionaryIndex
+from dictionary_journal import DictionaryJournal
+from dictionary_store import (load_dictionary_file, wants_sqlite, write_json_dictionary,
+                              write_sqlite_dictionary)
+from row_count_provider import RowCountProvider
+from schema_objects import SchemaObjectExtractor, apply_column_statistics
+from table_sampler import TableSampler
+
 
 class OracleDictionary:
     """Oracle database dictionary manager"""
 
+    # Catalog queries in bulk mode return one row per column of the whole schema:
+    # fetch in large batches to keep network round trips low
+    BULK_ARRAYSIZE = 5000
+    BULK_PREFETCHROWS = 5000
+    # Upper bound of parallel sessions opened on the source database by --workers
+    MAX_WORKERS = 16
+    # --refresh with fewer changed tables than this queries their catalog per table
+    BULK_REFRESH_MIN_TABLES = 50
+
     def __init__(self, host: str, port: int, sid: str, user: str, password: str,
                  schema: str, conn_type: str = "service"):
         self.host = host
@@ -27,19 +47,35 @@ class OracleDictionary:
         self.conn_type = conn_type
         self.connection = None
         self.dictionary = {}
+        self.index = DictionaryIndex(self.dictionary)
+        # Build journal of a streamed build, removed once the dictionary is saved
+        self.journal: Optional[DictionaryJournal] = None
+
+    def _dsn(self) -> str:
+        if self.conn_type == "service":
+            return f"{self.host}:{self.port}/{self.sid}"
+        else:
+            return f"{self.host}:{self.port}/{self.sid}"
+
+    def create_pool(self, workers: int):
+        """Session pool for parallel builds: at most `workers` sessions on the source DB"""
+        return oracledb.create_pool(
+            user=self.user,
+            password=self.password,
+            dsn=self._dsn(),
+            min=1,
+            max=workers,
+            increment=1,
+            getmode=oracledb.POOL_GETMODE_WAIT
+        )
 
     def connect(self):
         """Connect to Oracle database"""
         try:
-            if self.conn_type == "service":
-                dsn = f"{self.host}:{self.port}/{self.sid}"
-            else:
-                dsn = f"{self.host}:{self.port}/{self.sid}"
-
             self.connection = oracledb.connect(
                 user=self.user,
                 password=self.password,
-                dsn=dsn
+                dsn=self._dsn()
             )
             print(f"✓ Connected to Oracle: {self.user}@{self.host}:{self.port}/{self.sid}")
             return True
@@ -67,7 +103,7 @@ class OracleDictionary:
         cursor.close()
         return tables
 
-    def get_table_metadata(self, table_name: str) -> Dict[str, Any]:
+    def get_table_metadata(self, table_name: str, connection=None) -> Dict[str, Any]:
         """Get metadata for a specific table"""
         query = """
             SELECT
@@ -83,27 +119,27 @@ class OracleDictionary:
             WHERE owner = :1 AND table_name = :2
             ORDER BY column_id
         """
-        cursor = self.connection.cursor()
+        cursor = (connection or self.connection).cursor()
         cursor.execute(query, [self.schema, table_name])
-
-        columns = []
-        for row in cursor.fetchall():
-            column = {
-                "column_name": row[0],
-                "data_type": row[1],
-                "data_length": row[2],
-                "data_precision": row[3],
-                "data_scale": row[4],
-                "nullable": row[5] == 'Y',
-                "column_id": row[6],
-                "default_value": row[7].strip() if row[7] else None
-            }
-            columns.append(column)
-
+        columns = [self._column_from_row(row) for row in cursor.fetchall()]
         cursor.close()
         return columns
 
-    def get_primary_key(self, table_name: str) -> List[str]:
+    @staticmethod
+    def _column_from_row(row) -> Dict[str, Any]:
+        """all_tab_columns row (column_name .. data_default) -> column dict"""
+        return {
+            "column_name": row[0],
+            "data_type": row[1],
+            "data_length": row[2],
+            "data_precision": row[3],
+            "data_scale": row[4],
+            "nullable": row[5] == 'Y',
+            "column_id": row[6],
+            "default_value": row[7].strip() if row[7] else None
+        }
+
+    def get_primary_key(self, table_name: str, connection=None) -> List[str]:
         """Get primary key columns for a table"""
         query = """
             SELECT acc.column_name
@@ -115,7 +151,7 @@ class OracleDictionary:
                 AND ac.constraint_type = 'P'
             ORDER BY acc.position
         """
-        cursor = self.connection.cursor()
+        cursor = (connection or self.connection).cursor()
         cursor.execute(query, [self.schema, table_name])
         pk_columns = [row[0] for row in cursor.fetchall()]
         cursor.close()
@@ -193,129 +229,481 @@ class OracleDictionary:
         cursor.close()
         return list(idx_dict.values())
 
-    def get_sample_data(self, table_name: str, column_name: str, limit: int = 1) -> Any:
-        """Get sample data for a specific column"""
-        try:
-            query = f"""
-                SELECT {column_name}
-                FROM {self.schema}.{table_name}
-                WHERE {column_name} IS NOT NULL
-                AND ROWNUM <= :1
-            """
-            cursor = self.connection.cursor()
-            cursor.execute(query, [limit])
-            result = cursor.fetchone()
-            cursor.close()
+    def _bulk_cursor(self):
+        """Cursor tuned for large schema-wide catalog result sets"""
+        cursor = self.connection.cursor()
+        cursor.arraysize = self.BULK_ARRAYSIZE
+        cursor.prefetchrows = self.BULK_PREFETCHROWS
+        return cursor
 
-            if result:
-                value = result[0]
-                if isinstance(value, (datetime,)):
-                    return value.isoformat()
-                elif isinstance(value, (bytes,)):
-                    return f"<BLOB {len(value)} bytes>"
-                else:
-                    return str(value) if value is not None else None
-            return None
-        except oracledb.Error as e:
-            return f"<Error: {str(e)[:100]}>"
+    def get_all_table_metadata(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Columns of every table in the schema: table_name -> [column]"""
+        query = """
+            SELECT
+                atc.table_name,
+                atc.column_name,
+                atc.data_type,
+                atc.data_length,
+                atc.data_precision,
+                atc.data_scale,
+                atc.nullable,
+                atc.column_id,
+                atc.data_default
+            FROM all_tab_columns atc
+            JOIN all_tables t ON t.owner = atc.owner AND t.table_name = atc.table_name
+            WHERE atc.owner = :1
+            ORDER BY atc.table_name, atc.column_id
+        """
+        cursor = self._bulk_cursor()
+        cursor.execute(query, [self.schema])
+        columns: Dict[str, List[Dict[str, Any]]] = {}
+        for row in cursor:
+            columns.setdefault(row[0], []).append(self._column_from_row(row[1:]))
+        cursor.close()
+        return columns
+
+    def get_all_primary_keys(self) -> Dict[str, List[str]]:
+        """Primary key columns of every table in the schema: table_name -> [column]"""
+        query = """
+            SELECT ac.table_name, acc.column_name
+            FROM all_constraints ac
+            JOIN all_cons_columns acc ON ac.constraint_name = acc.constraint_name
+                AND ac.owner = acc.owner
+                AND ac.table_name = acc.table_name
+            WHERE ac.owner = :1
+                AND ac.constraint_type = 'P'
+            ORDER BY ac.table_name, acc.position
+        """
+        cursor = self._bulk_cursor()
+        cursor.execute(query, [self.schema])
+        pk_columns: Dict[str, List[str]] = {}
+        for table_name, column_name in cursor:
+            pk_columns.setdefault(table_name, []).append(column_name)
+        cursor.close()
+        return pk_columns
+
+    def get_all_table_comments(self) -> Dict[str, str]:
+        """Comments of every table in the schema: table_name -> comment"""
+        query = """
+            SELECT table_name, comments
+            FROM all_tab_comments
+            WHERE owner = :1 AND table_type = 'TABLE' AND comments IS NOT NULL
+        """
+        cursor = self._bulk_cursor()
+        cursor.execute(query, [self.schema])
+        comments = {table_name: comment for table_name, comment in cursor}
+        cursor.close()
+        return comments
+
+    def get_all_column_comments(self) -> Dict[str, Dict[str, str]]:
+        """Column comments of the whole schema: table_name -> {column_name: comment}"""
+        query = """
+            SELECT table_name, column_name, comments
+            FROM all_col_comments
+            WHERE owner = :1 AND comments IS NOT NULL
+        """
+        cursor = self._bulk_cursor()
+        cursor.execute(query, [self.schema])
+        comments: Dict[str, Dict[str, str]] = {}
+        for table_name, column_name, comment in cursor:
+            comments.setdefault(table_name, {})[column_name] = comment
+        cursor.close()
+        return comments
+
+    def load_catalog(self) -> Dict[str, Dict[str, Any]]:
+        """Columns, primary keys and comments of the whole schema in four catalog queries"""
+        started = time.time()
+        catalog = {
+            "columns": self.get_all_table_metadata(),
+            "primary_keys": self.get_all_primary_keys(),
+            "table_comments": self.get_all_table_comments(),
+            "column_comments": self.get_all_column_comments()
+        }
+        column_count = sum(len(columns) for columns in catalog["columns"].values())
+        print(f"✓ Catalog loaded: {len(catalog['columns'])} tables, {column_count} columns "
+              f"in {time.time() - started:.1f}s (bulk)\n")
+        return catalog
 
-    def get_table_row_count(self, table_name: str) -> int:
-        """Get approximate row count for a table"""
+    def get_table_row_count(self, table_name: str, connection=None) -> int:
+        """Get exact row count for a table (full scan, see RowCountProvider for estimates)"""
         try:
             query = f"SELECT COUNT(*) FROM {self.schema}.{table_name}"
-            cursor = self.connection.cursor()
+            cursor = (connection or self.connection).cursor()
             cursor.execute(query)
             count = cursor.fetchone()[0]
             cursor.close()
             return count
-        except cx_Oracle.Error:
+        except oracledb.Error:
             return -1
 
-    def get_table_comments(self, table_name: str) -> str:
+    def get_table_comments(self, table_name: str, connection=None) -> str:
         """Get table comments"""
         query = """
             SELECT comments
             FROM all_tab_comments
             WHERE owner = :1 AND table_name = :2
         """
-        cursor = self.connection.cursor()
+        cursor = (connection or self.connection).cursor()
         cursor.execute(query, [self.schema, table_name])
         result = cursor.fetchone()
         cursor.close()
         return result[0] if result and result[0] else None
 
-    def get_column_comments(self, table_name: str) -> Dict[str, str]:
+    def get_column_comments(self, table_name: str, connection=None) -> Dict[str, str]:
         """Get column comments for a table"""
         query = """
             SELECT column_name, comments
             FROM all_col_comments
             WHERE owner = :1 AND table_name = :2
         """
-        cursor = self.connection.cursor()
+        cursor = (connection or self.connection).cursor()
         cursor.execute(query, [self.schema, table_name])
         comments = {row[0]: row[1] for row in cursor.fetchall() if row[1]}
         cursor.close()
         return comments
 
-    def build_dictionary(self, sample_size: int = 1):
-        """Build complete dictionary for all tables in schema"""
+    def build_table(self, connection, table_name: str, catalog: Optional[Dict[str, Any]],
+                    sampler: TableSampler, row_counts: RowCountProvider,
+                    profiler: Optional[ColumnProfiler] = None) -> Dict[str, Any]:
+        """Dictionary entry of one table (catalog=None queries the catalog for this table)"""
+        if catalog is not None:
+            # Popped so the catalog does not keep every built table alive until the end
+            columns_meta = catalog["columns"].pop(table_name, [])
+            pk_columns = catalog["primary_keys"].pop(table_name, [])
+            table_comment = catalog["table_comments"].pop(table_name, None)
+            column_comments = catalog["column_comments"].pop(table_name, {})
+        else:
+            columns_meta = self.get_table_metadata(table_name, connection)
+            pk_columns = self.get_primary_key(table_name, connection)
+            table_comment = self.get_table_comments(table_name, connection)
+            column_comments = self.get_column_comments(table_name, connection)
+        row_count = row_counts.count(connection, table_name)
+
+        # Add sample data to each column
+        samples = sampler.sample_table(connection, table_name, columns_meta)
+        for col in columns_meta:
+            col["sample_value"] = samples.get(col["column_name"])
+            col["comment"] = column_comments.get(col["column_name"])
+
+        entry = {
+            "table_name": table_name,
+            "row_count": row_count["row_count"],
+            "row_count_source": row_count["source"],
+            "stats_last_analyzed": row_count["last_analyzed"],
+            "comment": table_comment,
+            "columns": columns_meta,
+            "primary_key": pk_columns
+        }
+
+        # Verified empty tables have nothing to profile
+        if profiler is not None and row_count["row_count"] != 0:
+            profiled_rows, profiles = profiler.profile_table(connection, table_name, columns_meta)
+            for col in columns_meta:
+                if col["column_name"] in profiles:
+                    col["profile"] = profiles[col["column_name"]]
+            entry["profile"] = {"rows": profiled_rows, "sample_percent": profiler.sample_percent}
+        return entry
+
+    @staticmethod
+    def _table_status(table_name: str, entry: Dict[str, Any]) -> str:
+        if "error" in entry:
+            return f"  ✗ Error processing {table_name}: {entry['error']}"
+        rows = entry['row_count'] if entry['row_count'] is not None else '?'
+        return f"  ✓ {len(entry['columns'])} columns, {rows} rows ({entry['row_count_source']})"
+
+    def get_last_ddl_times(self) -> Dict[str, str]:
+        """last_ddl_time of every table in the schema: table_name -> ISO timestamp"""
+        query = """
+            SELECT object_name, last_ddl_time
+            FROM all_objects
+            WHERE owner = :1 AND object_type = 'TABLE'
+        """
+        cursor = self._bulk_cursor()
+        cursor.execute(query, [self.schema])
+        ddl_times = {name: ddl_time.isoformat() for name, ddl_time in cursor if ddl_time}
+        cursor.close()
+        return ddl_times
+
+    def _build_tables_parallel(self, tables: List[str], catalog: Optional[Dict[str, Any]],
+                               sampler: TableSampler, row_counts: RowCountProvider,
+                               workers: int, record: Callable[[str, Dict[str, Any]], None],
+                               profiler: Optional[ColumnProfiler] = None) -> bool:
+        """Per-table work on a session pool; progress and output stay in table order"""
+        try:
+            pool = self.create_pool(workers)
+        except oracledb.Error as e:
+            print(f"⚠ Connection pool creation failed, building sequentially: {e}\n")
+            return False
+        print(f"Workers: {workers} (connection pool max {workers} sessions)\n")
+
+        def work(table_name):
+            try:
+                with pool.acquire() as connection:
+                    return self.build_table(connection, table_name, catalog, sampler, row_counts,
+                                            profiler)
+            except Exception as e:
+                return {"error": str(e)}
+
+        results = {}
+        next_idx = 0
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                future_to_idx = {executor.submit(work, table_name): idx
+                                 for idx, table_name in enumerate(tables)}
+                for future in as_completed(future_to_idx):
+                    results[future_to_idx[future]] = future.result()
+                    # Flush the completed prefix so progress is printed in table order
+                    while next_idx in results:
+                        entry = results.pop(next_idx)
+                        table_name = tables[next_idx]
+                        next_idx += 1
+                        print(f"[{next_idx}/{len(tables)}] Processing {table_name}...")
+                        print(self._table_status(table_name, entry))
+                        record(table_name, entry)
+        finally:
+            pool.close(force=True)
+        return True
+
+    def _extract_tables(self, tables: List[str], catalog_mode: str, sampler: TableSampler,
+                        row_counts: RowCountProvider, workers: int,
+                        profiler: Optional[ColumnProfiler] = None,
+                        sink: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Dictionary entries of the given tables, in table order
+
+        With a sink, each entry is handed to it as soon as it is complete and nothing is kept.
+        """
+        if workers > self.MAX_WORKERS:
+            print(f"⚠ --workers {workers} capped at {self.MAX_WORKERS} to protect the source database")
+            workers = self.MAX_WORKERS
+
+        catalog = None
+        if catalog_mode == "bulk":
+            try:
+                catalog = self.load_catalog()
+            except oracledb.Error as e:
+                print(f"⚠ Bulk catalog query failed, falling back to per-table queries: {e}\n")
+
+        try:
+            row_counts.prefetch(self.connection)
+        except oracledb.Error as e:
+            print(f"⚠ Table statistics query failed, reading them per table: {e}\n")
+
+        entries: Dict[str, Any] = {}
+        record = sink or entries.__setitem__
+        if workers <= 1 or not self._build_tables_parallel(tables, catalog, sampler, row_counts,
+                                                           workers, record, profiler):
+            for idx, table_name in enumerate(tables, 1):
+                print(f"[{idx}/{len(tables)}] Processing {table_name}...")
+
+                try:
+                    entry = self.build_table(self.connection, table_name, catalog, sampler,
+                                             row_counts, profiler)
+                    print(self._table_status(table_name, entry))
+
+                except Exception as e:
+                    print(f"  ✗ Error processing {table_name}: {e}")
+                    entry = {"error": str(e)}
+                record(table_name, entry)
+        return entries
+
+    @staticmethod
+    def _stamp_ddl_times(entries: Dict[str, Any], ddl_times: Dict[str, str]):
+        """Record last_ddl_time on extracted tables (failed tables stay unstamped and are retried)"""
+        for table_name, entry in entries.items():
+            if "error" not in entry:
+                entry["last_ddl_time"] = ddl_times.get(table_name)
+
+    def _load_schema_objects(self):
+        """(views/synonyms/sequences top-level sections, column statistics by table)"""
+        started = time.time()
+        objects = SchemaObjectExtractor(self.schema).load(self.connection, self._column_from_row)
+        statistics = objects.pop("column_statistics", {})
+        print(f"✓ Schema objects: {len(objects.get('views', {}))} views, "
+              f"{len(objects.get('synonyms', {}))} synonyms, "
+              f"{len(objects.get('sequences', {}))} sequences, column statistics of "
+              f"{len(statistics)} tables in {time.time() - started:.1f}s\n")
+        return objects, statistics
+
+    @staticmethod
+    def _print_build_stats(sampler: TableSampler, row_counts: RowCountProvider,
+                           profiler: Optional[ColumnProfiler] = None):
+        sample_stats = sampler.get_stats()
+        print(f"  Samples ({sample_stats['strategy']}): {sample_stats['columns_sampled']} columns "
+              f"with values, {sample_stats['columns_empty']} empty, "
+              f"{sample_stats['queries']} queries")
+        count_stats = row_counts.get_stats()
+        print(f"  Row counts ({count_stats['mode']}): " +
+              ', '.join(f"{source} {count}" for source, count in sorted(count_stats['sources'].items())))
+        if profiler is not None:
+            profile_stats = profiler.get_stats()
+            scope = (f"SAMPLE {profile_stats['sample_percent']}%" if profile_stats['sample_percent']
+                     else "full scan")
+            print(f"  Profiles ({scope}): {profile_stats['columns_profiled']} columns of "
+                  f"{profile_stats['tables']} tables, {profile_stats['queries']} queries, "
+                  f"{profile_stats['errors']} column errors")
+
+    def build_dictionary(self, catalog_mode: str = "bulk",
+                         sampler: Optional[TableSampler] = None, workers: int = 1,
+                         row_counts: Optional[RowCountProvider] = None,
+                         schema_objects: bool = True, profiler: Optional[ColumnProfiler] = None,
+                         journal_path: Optional[str] = None, resume: bool = False):
+        """Build complete dictionary for all tables in schema
+
+        Args:
+            catalog_mode: "bulk" loads columns, primary keys and comments of the whole schema
+                          up front; "per-table" queries the catalog once per table and item
+            sampler: Sample value extraction (default: bounded row scan, one query per table)
+            workers: Parallel sessions for per-table work (capped at MAX_WORKERS)
+            row_counts: Row count source (default: optimizer statistics, no table scans)
+            schema_objects: Also extract views, synonyms, sequences and column statistics
+            profiler: Per-column data profile in one aggregate scan per table (default: none)
+            journal_path: Stream each completed table to this NDJSON journal instead of keeping
+                          it in memory; save_dictionary() then writes the output from it
+            resume: Keep the tables of an existing journal of the same schema and extract only
+                    the remaining (and previously failed) ones
+        """
+        sampler = sampler or TableSampler(self.schema)
+        row_counts = row_counts or RowCountProvider(self.schema)
         print(f"\n=== Building Oracle Dictionary for schema: {self.schema} ===\n")
 
         tables = self.get_tables()
         print(f"Found {len(tables)} tables\n")
+        ddl_times = self.get_last_ddl_times()
+        objects, statistics = self._load_schema_objects() if schema_objects else ({}, {})
+
+        generated_at = datetime.now().isoformat()
+        to_extract = tables
+        journal = DictionaryJournal(journal_path) if journal_path else None
+        if journal is not None:
+            if journal.open(self.schema, generated_at, resume=resume):
+                done = journal.completed_tables()
+                to_extract = [t for t in tables if t not in done]
+                print(f"→ Resuming {journal_path}: {len(tables) - len(to_extract)} tables "
+                      f"already extracted, {len(to_extract)} remaining\n")
+            elif resume:
+                print(f"⚠ No resumable journal at {journal_path}, building all tables\n")
+            generated_at = journal.generated_at
+
+        extracted: Dict[str, Any] = {}
+
+        def finish(table_name: str, entry: Dict[str, Any]):
+            self._stamp_ddl_times({table_name: entry}, ddl_times)
+            apply_column_statistics({table_name: entry}, statistics)
+            if journal is not None:
+                journal.append(table_name, entry)
+            else:
+                extracted[table_name] = entry
+
+        self._extract_tables(to_extract, catalog_mode, sampler, row_counts, workers, profiler,
+                             sink=finish)
 
+        self.journal = journal
         self.dictionary = {
             "schema": self.schema,
-            "generated_at": datetime.now().isoformat(),
+            "generated_at": generated_at,
             "table_count": len(tables),
-            "tables": {}
+            "tables": journal.tables(tables) if journal is not None else extracted
         }
+        self.dictionary.update(objects)
 
-        for idx, table_name in enumerate(tables, 1):
-            print(f"[{idx}/{len(tables)}] Processing {table_name}...")
-
-            try:
-                columns_meta = self.get_table_metadata(table_name)
-                pk_columns = self.get_primary_key(table_name)
-                row_count = self.get_table_row_count(table_name)
-                table_comment = self.get_table_comments(table_name)
-                column_comments = self.get_column_comments(table_name)
-
-                # Add sample data to each column
-                for col in columns_meta:
-                    col["sample_value"] = self.get_sample_data(table_name, col["column_name"], sample_size)
-                    col["comment"] = column_comments.get(col["column_name"])
-
-                self.dictionary["tables"][table_name] = {
-                    "table_name": table_name,
-                    "row_count": row_count,
-                    "comment": table_comment,
-                    "columns": columns_meta,
-                    "primary_key": pk_columns
-                }
+        self.index = DictionaryIndex(self.dictionary)
+        print(f"\n✓ Dictionary build complete: {len(self.dictionary['tables'])} tables processed")
+        self._print_build_stats(sampler, row_counts, profiler)
+
+    def refresh_dictionary(self, input_path: str, catalog_mode: str = "bulk",
+                           sampler: Optional[TableSampler] = None, workers: int = 1,
+                           row_counts: Optional[RowCountProvider] = None,
+                           schema_objects: bool = True,
+                           profiler: Optional[ColumnProfiler] = None):
+        """Re-extract only tables whose DDL changed since an existing dictionary was built
+
+        New tables, tables whose all_objects.last_ddl_time differs from the stored one and
+        tables without a stored timestamp (failed or built before timestamps were recorded) are
+        extracted again; dropped tables are removed; all other entries are kept as they are.
+        Views, synonyms, sequences and column statistics are cheap bulk reads and are always
+        reloaded in full (or kept from the existing dictionary when schema_objects is False).
+        """
+        sampler = sampler or TableSampler(self.schema)
+        row_counts = row_counts or RowCountProvider(self.schema)
+        print(f"\n=== Refreshing Oracle Dictionary for schema: {self.schema} ===\n")
 
-                print(f"  ✓ {len(columns_meta)} columns, {row_count} rows")
+        existing = load_dictionary_file(input_path)
+        if existing.get("schema", self.schema) != self.schema:
+            raise ValueError(f"{input_path} belongs to schema {existing.get('schema')}, "
+                             f"not {self.schema}")
+        previous = existing.get("tables", {})
 
-            except Exception as e:
-                print(f"  ✗ Error processing {table_name}: {e}")
-                self.dictionary["tables"][table_name] = {"error": str(e)}
+        tables = self.get_tables()
+        ddl_times = self.get_last_ddl_times()
+        new_tables = [t for t in tables if t not in previous]
+        changed_tables = [t for t in tables if t in previous and
+                          (previous[t].get("last_ddl_time") is None or
+                           previous[t]["last_ddl_time"] != ddl_times.get(t))]
+        dropped_tables = sorted(set(previous) - set(tables))
+        to_extract = sorted(new_tables + changed_tables)
+
+        print(f"Found {len(tables)} tables: {len(new_tables)} new, {len(changed_tables)} changed, "
+              f"{len(dropped_tables)} dropped, {len(tables) - len(to_extract)} unchanged\n")
+
+        # The bulk catalog reads the whole schema: only worth it when many tables changed
+        if catalog_mode == "bulk" and len(to_extract) < self.BULK_REFRESH_MIN_TABLES:
+            catalog_mode = "per-table"
+        entries = self._extract_tables(to_extract, catalog_mode, sampler, row_counts, workers,
+                                       profiler)
+        self._stamp_ddl_times(entries, ddl_times)
 
-        print(f"\n✓ Dictionary build complete: {len(self.dictionary['tables'])} tables processed")
+        self.dictionary = {
+            "schema": self.schema,
+            "generated_at": existing.get("generated_at"),
+            "refreshed_at": datetime.now().isoformat(),
+            "table_count": len(tables),
+            "tables": {t: entries[t] if t in entries else previous[t] for t in tables}
+        }
+        for section in ("views", "synonyms", "sequences"):
+            if section in existing:
+                self.dictionary[section] = existing[section]
+        if schema_objects:
+            objects, statistics = self._load_schema_objects()
+            apply_column_statistics(self.dictionary["tables"], statistics)
+            self.dictionary.update(objects)
+
+        self.index = DictionaryIndex(self.dictionary)
+        print(f"\n✓ Dictionary refresh complete: {len(to_extract)} tables re-extracted, "
+              f"{len(dropped_tables)} removed")
+        for table_name in dropped_tables:
+            print(f"  - {table_name}")
+        if to_extract:
+            self._print_build_stats(sampler, row_counts, profiler)
 
     def save_dictionary(self, output_path: str):
-        """Save dictionary to JSON file"""
+        """Save dictionary to JSON file (or a SQLite dictionary for .db/.sqlite paths)
+
+        Both writers stream table by table and atomically replace the output file; the build
+        journal is closed and removed afterwards, so a streamed dictionary is no longer readable.
+        """
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(self.dictionary, f, indent=2, ensure_ascii=False)
-
+        if self.journal is None:
+            self._write_dictionary(output_file)
+        else:
+            # The streamed tables read from the journal file: close it before it is removed
+            with self.dictionary["tables"]:
+                self._write_dictionary(output_file)
+            self.journal.remove()
+            self.journal = None
         print(f"✓ Dictionary saved to: {output_file}")
 
+    def _write_dictionary(self, output_file: Path):
+        if wants_sqlite(output_file):
+            write_sqlite_dictionary(self.dictionary, output_file)
+        else:
+            write_json_dictionary(self.dictionary, output_file)
+
     def load_dictionary(self, input_path: str):
-        """Load dictionary from JSON file"""
-        with open(input_path, 'r', encoding='utf-8') as f:
-            self.dictionary = json.load(f)
+        """Load dictionary from a JSON or SQLite dictionary file"""
+        self.dictionary = load_dictionary_file(input_path)
+        self.index = DictionaryIndex(self.dictionary)
         print(f"✓ Dictionary loaded from: {input_path}")
 
     def lookup(self, table_column: str) -> Optional[Dict[str, Any]]:
@@ -337,32 +725,20 @@ class OracleDictionary:
 
             table_name, column_name = parts[0].upper(), parts[1].upper()
 
-            if table_name not in self.dictionary.get("tables", {}):
+            if not self.index.has_table(table_name):
                 return {
                     "error": f"Table '{table_name}' not found in dictionary"
                 }
 
-            table_info = self.dictionary["tables"][table_name]
-
-            if "error" in table_info:
+            table_error = self.index.get_table_error(table_name)
+            if table_error:
                 return {
-                    "error": f"Table '{table_name}' has error: {table_info['error']}"
+                    "error": f"Table '{table_name}' has error: {table_error}"
                 }
 
-            for column in table_info.get("columns", []):
-                if column["column_name"] == column_name:
-                    return {
-                        "table_name": table_name,
-                        "column_name": column_name,
-                        "data_type": column["data_type"],
-                        "data_length": column["data_length"],
-                        "data_precision": column["data_precision"],
-                        "data_scale": column["data_scale"],
-                        "nullable": column["nullable"],
-                        "sample_value": column["sample_value"],
-                        "comment": column.get("comment"),
-                        "is_primary_key": column_name in table_info.get("primary_key", [])
-                    }
+            record = self.index.lookup(table_name, column_name)
+            if record:
+                return record.to_dict()
 
             return {
                 "error": f"Column '{column_name}' not found in table '{table_name}'"
@@ -374,11 +750,12 @@ class OracleDictionary:
             }
 
     def get_table_info(self, table_name: str) -> Optional[Dict[str, Any]]:
-        """Get full table information"""
-        table_name = table_name.upper()
-        if table_name in self.dictionary.get("tables", {}):
-            return self.dictionary["tables"][table_name]
-        return None
+        """Get full table information (views and synonyms resolve to their object)"""
+        return self.index.get_object_info(table_name)
+
+    def get_sequence_info(self, sequence_name: str) -> Optional[Dict[str, Any]]:
+        """Get sequence information"""
+        return self.index.get_sequence(sequence_name)
 
 
 def main():
@@ -387,14 +764,48 @@ def main():
 
     parser = argparse.ArgumentParser(description='Oracle Dictionary Generator')
     parser.add_argument('--build', action='store_true', help='Build dictionary from Oracle')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Update the dictionary at --output: re-extract only new tables and '
+                             'tables whose DDL changed, remove dropped tables')
     parser.add_argument('--lookup', type=str, help='Lookup column info (TABLE.COLUMN)')
-    parser.add_argument('--table', type=str, help='Get table info')
+    parser.add_argument('--table', type=str, help='Get table info (views and synonyms resolved)')
+    parser.add_argument('--sequence', type=str, help='Get sequence info')
     parser.add_argument('--output', type=str, default='./output/oracle_dictionary.json',
                         help='Output JSON file path')
     parser.add_argument('--input', type=str, default='./output/oracle_dictionary.json',
                         help='Input JSON file path for lookup')
-    parser.add_argument('--sample-size', type=int, default=1,
-                        help='Number of sample rows per column')
+    parser.add_argument('--sample-strategy', choices=TableSampler.STRATEGIES, default='scan',
+                        help='scan: one bounded row scan per table (default); sample: scan a '
+                             'SAMPLE (p) of the table first; column: one query per column; '
+                             'none: skip sample values')
+    parser.add_argument('--sample-rows', type=int, default=1000,
+                        help='Row limit of each sampling scan (scan/sample strategies)')
+    parser.add_argument('--sample-percent', type=float, default=1.0,
+                        help='SAMPLE clause percentage for the sample strategy and sampled '
+                             'row counts')
+    parser.add_argument('--sample-max-chars', type=int, default=200,
+                        help='Characters fetched per CLOB sample (max 1000); BLOB/RAW samples '
+                             'only record their length')
+    parser.add_argument('--workers', type=int, default=int(os.getenv('ORACLE_DICT_WORKERS', '1')),
+                        help='Parallel database sessions for per-table work, '
+                             f'max {OracleDictionary.MAX_WORKERS} (default: ORACLE_DICT_WORKERS or 1)')
+    parser.add_argument('--row-count', choices=RowCountProvider.MODES, default='stats',
+                        help='stats: all_tables.num_rows, no table scans (default); '
+                             'exact: SELECT COUNT(*); sampled: COUNT(*) over SAMPLE (--sample-percent)')
+    parser.add_argument('--catalog-mode', choices=['bulk', 'per-table'], default='bulk',
+                        help='bulk: load columns, keys and comments of the whole schema in a few '
+                             'queries (default); per-table: query the catalog once per table')
+    parser.add_argument('--profile', action='store_true',
+                        help='Profile every column (min/max, null fraction, max length, '
+                             'fractional values) in one aggregate scan per table')
+    parser.add_argument('--profile-percent', type=float,
+                        help='Profile a SAMPLE (p) of each table instead of scanning it fully')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue an interrupted --build from its journal (<output>.partial): '
+                             'only tables not extracted yet, or failed, are queried')
+    parser.add_argument('--skip-objects', action='store_true',
+                        help='Extract tables only: no views, synonyms, sequences or column '
+                             'statistics')
 
     args = parser.parse_args()
 
@@ -409,15 +820,37 @@ def main():
         conn_type=os.getenv('ORACLE_CONN_TYPE', 'service')
     )
 
-    if args.build:
+    if args.build or args.refresh:
         if oracle_dict.connect():
             try:
-                oracle_dict.build_dictionary(sample_size=args.sample_size)
+                sampler = TableSampler(oracle_dict.schema, strategy=args.sample_strategy,
+                                       sample_rows=args.sample_rows,
+                                       sample_percent=args.sample_percent,
+                                       max_lob_chars=args.sample_max_chars)
+                row_counts = RowCountProvider(oracle_dict.schema, mode=args.row_count,
+                                              sample_percent=args.sample_percent)
+                profiler = (ColumnProfiler(oracle_dict.schema, sample_percent=args.profile_percent)
+                            if args.profile or args.profile_percent else None)
+                if args.refresh and Path(args.output).exists():
+                    oracle_dict.refresh_dictionary(args.output, catalog_mode=args.catalog_mode,
+                                                   sampler=sampler, workers=args.workers,
+                                                   row_counts=row_counts,
+                                                   schema_objects=not args.skip_objects,
+                                                   profiler=profiler)
+                else:
+                    if args.refresh:
+                        print(f"⚠ {args.output} not found, building the full dictionary")
+                    oracle_dict.build_dictionary(catalog_mode=args.catalog_mode, sampler=sampler,
+                                                 workers=args.workers, row_counts=row_counts,
+                                                 schema_objects=not args.skip_objects,
+                                                 profiler=profiler,
+                                                 journal_path=f"{args.output}.partial",
+                                                 resume=args.resume)
                 oracle_dict.save_dictionary(args.output)
             finally:
                 oracle_dict.disconnect()
 
-    elif args.lookup or args.table:
+    elif args.lookup or args.table or args.sequence:
         oracle_dict.load_dictionary(args.input)
 
         if args.lookup:
@@ -431,6 +864,13 @@ def main():
             else:
                 print(f"Table '{args.table}' not found")
 
+        if args.sequence:
+            result = oracle_dict.get_sequence_info(args.sequence)
+            if result:
+                print(json.dumps(result, indent=2, ensure_ascii=False))
+            else:
+                print(f"Sequence '{args.sequence}' not found")
+
     else:
         parser.print_help()
 
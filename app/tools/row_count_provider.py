@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Row Count Provider
+Table row counts from optimizer statistics, an exact COUNT(*) or a SAMPLE estimate
+"""
+
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import oracledb
+
+
+class RowCountProvider:
+    """Row counts for Oracle tables, tagged with the source they came from
+
+    Modes:
+        stats   - all_tables.num_rows of the last statistics gathering (default, no table access)
+        exact   - SELECT COUNT(*) (full scan)
+        sampled - COUNT(*) over SAMPLE (sample_percent), scaled up
+
+    Estimates of 0 or missing statistics are verified with a one-row probe, so a table is only
+    reported empty when it really is. Sources: stats, exact, sampled, probe (empty per probe),
+    nonempty (rows exist but no usable estimate: count is None), error (count is -1).
+    """
+
+    MODES = ('stats', 'exact', 'sampled')
+
+    def __init__(self, schema: str, mode: str = 'stats', sample_percent: float = 1.0):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown row count mode: {mode}")
+        self.schema = schema.upper()
+        self.mode = mode
+        self.sample_percent = sample_percent
+        # table -> (num_rows, last_analyzed)
+        self.table_stats: Dict[str, Tuple[Optional[int], Any]] = {}
+
+        self._lock = threading.Lock()
+        self.sources: Dict[str, int] = {}
+
+    @staticmethod
+    def _quote(identifier: str) -> str:
+        return '"' + identifier.replace('"', '""') + '"'
+
+    def _table(self, table_name: str) -> str:
+        return f"{self._quote(self.schema)}.{self._quote(table_name)}"
+
+    def prefetch(self, connection) -> int:
+        """Load optimizer statistics of every table of the schema in one query"""
+        if self.mode != 'stats':
+            return 0
+        cursor = connection.cursor()
+        cursor.arraysize = 5000
+        cursor.execute("""
+            SELECT table_name, num_rows, last_analyzed
+            FROM all_tables
+            WHERE owner = :1
+        """, [self.schema])
+        with self._lock:
+            for table_name, num_rows, last_analyzed in cursor:
+                self.table_stats[table_name] = (num_rows, last_analyzed)
+        cursor.close()
+        return len(self.table_stats)
+
+    def _statistics(self, connection, table_name: str) -> Tuple[Optional[int], Any]:
+        with self._lock:
+            if table_name in self.table_stats:
+                return self.table_stats[table_name]
+        cursor = connection.cursor()
+        cursor.execute("""
+            SELECT num_rows, last_analyzed
+            FROM all_tables
+            WHERE owner = :1 AND table_name = :2
+        """, [self.schema, table_name])
+        row = cursor.fetchone()
+        cursor.close()
+        return (row[0], row[1]) if row else (None, None)
+
+    def _scalar(self, connection, query: str) -> Any:
+        cursor = connection.cursor()
+        cursor.execute(query)
+        value = cursor.fetchone()[0]
+        cursor.close()
+        return value
+
+    def _is_empty(self, connection, table_name: str) -> bool:
+        return self._scalar(connection, f"SELECT COUNT(*) FROM {self._table(table_name)} "
+                                        f"WHERE ROWNUM <= 1") == 0
+
+    def _record(self, source: str):
+        with self._lock:
+            self.sources[source] = self.sources.get(source, 0) + 1
+
+    def count(self, connection, table_name: str) -> Dict[str, Any]:
+        """{"row_count", "source", "last_analyzed"} for one table"""
+        last_analyzed = None
+        try:
+            if self.mode == 'exact':
+                result = {"row_count": self._scalar(connection, f"SELECT COUNT(*) FROM "
+                                                                f"{self._table(table_name)}"),
+                          "source": "exact"}
+            else:
+                if self.mode == 'stats':
+                    estimate, last_analyzed = self._statistics(connection, table_name)
+                else:
+                    sampled = self._scalar(connection, f"SELECT COUNT(*) FROM {self._table(table_name)} "
+                                                       f"SAMPLE ({self.sample_percent})")
+                    estimate = round(sampled * 100 / self.sample_percent)
+                result = {"row_count": estimate, "source": self.mode}
+                if not estimate:
+                    # Stale/missing statistics or an unlucky sample: only trust "empty" when verified
+                    if self._is_empty(connection, table_name):
+                        result = {"row_count": 0, "source": "probe"}
+                    else:
+                        result = {"row_count": None, "source": "nonempty"}
+        except oracledb.Error:
+            result = {"row_count": -1, "source": "error"}
+
+        result["last_analyzed"] = last_analyzed.isoformat() if last_analyzed else None
+        self._record(result["source"])
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"mode": self.mode, "sources": dict(self.sources)}
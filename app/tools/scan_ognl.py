@@ -8,11 +8,12 @@ import os
 import sys
 import re
 import json
-import boto3
 from pathlib import Path
 from typing import Dict, List, Set, Any
 from collections import defaultdict
 
+from bedrock_client import BedrockClient
+
 
 class OGNLScanner:
     """OGNL expression scanner and handler generator"""
@@ -26,10 +27,10 @@ class OGNLScanner:
         self.bedrock_region = bedrock_region
         self.model_id = model_id
 
-        # Initialize Bedrock client
-        self.bedrock = boto3.client(
-            service_name='bedrock-runtime',
-            region_name=bedrock_region
+        # Initialize Bedrock client (shared retry/backoff policy)
+        self.bedrock = BedrockClient(
+            region_name=bedrock_region,
+            model_id=model_id
         )
 
         self.ognl_expressions = defaultdict(set)  # {class: set of methods}
@@ -161,12 +162,7 @@ class OGNLScanner:
                 ]
             }
 
-            response = self.bedrock.invoke_model(
-                modelId=self.model_id,
-                body=json.dumps(body)
-            )
-
-            response_body = json.loads(response['body'].read())
+            response_body = self.bedrock.invoke_model(body)
             return response_body['content'][0]['text']
 
         except Exception as e:
@@ -613,11 +609,11 @@ def main():
     args = parser.parse_args()
 
     config = load_env_config()
-    bedrock_region = config.get('BEDROCK_REGION', 'ap-northeast-2')
-    model_id = config.get('BEDROCK_MODEL_ID')
+    bedrock_region = config.get('BEDROCK_REGION') or os.getenv('BEDROCK_REGION', 'ap-northeast-2')
+    model_id = config.get('BEDROCK_MODEL_ID') or os.getenv('BEDROCK_MODEL_ID')
 
     if not model_id:
-        print("Error: BEDROCK_MODEL_ID not found in .env")
+        print("Error: BEDROCK_MODEL_ID not found in .env or environment variables")
         sys.exit(1)
 
     scanner = OGNLScanner(
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Schema Context Builder
+Compact per-statement schema information for conversion prompts: only the columns the SQL
+references, one type signature per column, within a token budget
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from dictionary_index import ColumnRecord, DictionaryIndex
+
+
+class SchemaContextBuilder:
+    """Builds the "Oracle Schema Information" prompt block from parser column references
+
+    Columns are resolved through the statement's alias map (unqualified names match every
+    table of the statement that has the column). Under the token budget, columns compared
+    with / assigned bind variables come first, then join keys, then other references.
+    """
+
+    HEADER = "=== Oracle Schema Information ==="
+    LEGEND = ("Columns referenced by this SQL. NN = NOT NULL, PK = primary key, e.g. = sample value, "
+              "range = profiled min..max")
+    PRIORITY = {'bound': 0, 'join': 1, 'other': 2}
+    CHARS_PER_TOKEN = 4
+    SAMPLE_MAX_CHARS = 20
+
+    def __init__(self, dict_index: DictionaryIndex, token_budget: Optional[int] = 2000):
+        """
+        Args:
+            token_budget: Approximate token limit of the block (None or 0 = unlimited)
+        """
+        self.dict_index = dict_index
+        self.token_budget = token_budget or None
+
+    @classmethod
+    def estimate_tokens(cls, text: str) -> int:
+        return len(text) // cls.CHARS_PER_TOKEN
+
+    @classmethod
+    def profile_range(cls, profile: Optional[Dict[str, Any]]) -> Optional[str]:
+        """'min'..'max' of a column profile (oracle_dictionary.py --profile), None without one"""
+        if not profile or 'min' not in profile or 'max' not in profile:
+            return None
+        return (f"{str(profile['min'])[:cls.SAMPLE_MAX_CHARS]!r}.."
+                f"{str(profile['max'])[:cls.SAMPLE_MAX_CHARS]!r}")
+
+    @classmethod
+    def signature(cls, column: ColumnRecord, with_sample: bool = False) -> str:
+        """COL VARCHAR2(20) NN PK e.g.='A' range='A'..'Z'"""
+        data_type = column.data_type or '?'
+        if data_type in ('VARCHAR2', 'VARCHAR', 'CHAR', 'NVARCHAR2', 'NCHAR', 'RAW'):
+            data_type += f"({column.data_length if column.data_length is not None else '?'})"
+        elif data_type == 'NUMBER' and column.data_precision is not None:
+            if column.data_scale:
+                data_type += f"({column.data_precision},{column.data_scale})"
+            else:
+                data_type += f"({column.data_precision})"
+
+        text = f"{column.column_name} {data_type}"
+        if column.nullable is False or column.nullable == 'N':
+            text += " NN"
+        if column.is_primary_key:
+            text += " PK"
+        if with_sample and column.sample_value not in (None, ''):
+            sample = str(column.sample_value)[:cls.SAMPLE_MAX_CHARS]
+            text += f" e.g.={sample!r}"
+        value_range = cls.profile_range(column.profile) if with_sample else None
+        if value_range:
+            text += f" range={value_range}"
+        return text
+
+    def resolve(self, parsed: Dict[str, Any], tables: List[str]) -> Dict[Tuple[str, str], str]:
+        """(TABLE, COLUMN) -> best role for every referenced dictionary column"""
+        tables = [table.upper() for table in tables]
+        aliases = parsed.get('aliases', {})
+        resolved: Dict[Tuple[str, str], str] = {}
+
+        def add(table, column, role):
+            key = (table, column)
+            if key not in resolved or self.PRIORITY[role] < self.PRIORITY[resolved[key]]:
+                resolved[key] = role
+
+        for ref in parsed.get('columns', []):
+            column = ref['column']
+            qualifier = ref['qualifier']
+            if qualifier:
+                table = aliases.get(qualifier, qualifier if qualifier in tables else None)
+                candidates = [table] if table else []
+            else:
+                candidates = tables
+            for table in candidates:
+                if column in self.dict_index.get_table_columns(table):
+                    add(table, column, ref['role'])
+
+        # INSERT without a column list binds every column
+        for table in parsed.get('insert_all_columns', []):
+            for column in self.dict_index.get_table_columns(table):
+                add(table, column, 'bound')
+
+        return resolved
+
+    def build(self, parsed: Dict[str, Any], tables: List[str]) -> Tuple[str, Dict[str, int]]:
+        """Return (prompt block, stats) for a parsed statement and its tables
+
+        Stats: columns_available (all columns of the statement's tables), columns_referenced,
+        columns_included, columns_omitted (dropped by the budget), tokens.
+        """
+        table_order = sorted(set(table.upper() for table in tables
+                                 if self.dict_index.has_table(table)))
+        stats = {'columns_available': sum(len(self.dict_index.get_table_columns(table))
+                                          for table in table_order),
+                 'columns_referenced': 0, 'columns_included': 0, 'columns_omitted': 0, 'tokens': 0}
+        if not table_order:
+            return '', stats
+
+        resolved = self.resolve(parsed, table_order)
+        stats['columns_referenced'] = len(resolved)
+
+        # Column position within its table keeps the rendered order stable
+        positions = {}
+        for table in table_order:
+            for position, column in enumerate(self.dict_index.get_table_columns(table)):
+                positions[(table, column)] = position
+
+        candidates = sorted(resolved.items(), key=lambda item: (
+            self.PRIORITY[item[1]], table_order.index(item[0][0]), positions[item[0]]))
+
+        used = self.estimate_tokens(f"{self.HEADER}\n{self.LEGEND}\n")
+        used += sum(self.estimate_tokens(f"{table}: \n") for table in table_order)
+        if self.token_budget:
+            used += self.estimate_tokens("(999 more referenced columns omitted: token budget)\n")
+        included: Dict[str, List[Tuple[int, str]]] = {table: [] for table in table_order}
+        for (table, column), role in candidates:
+            record = self.dict_index.get_table_columns(table)[column]
+            text = self.signature(record, with_sample=(role == 'bound'))
+            cost = self.estimate_tokens(text + ', ') + 1
+            if self.token_budget and used + cost > self.token_budget:
+                stats['columns_omitted'] += 1
+                continue
+            used += cost
+            included[table].append((positions[(table, column)], text))
+            stats['columns_included'] += 1
+
+        lines = [self.HEADER, self.LEGEND]
+        for table in table_order:
+            columns = ', '.join(text for _, text in sorted(included[table])) or '(no columns referenced)'
+            lines.append(f"{table}: {columns}")
+        if stats['columns_omitted']:
+            lines.append(f"({stats['columns_omitted']} more referenced columns omitted: token budget)")
+
+        block = '\n'.join(lines) + '\n'
+        stats['tokens'] = self.estimate_tokens(block)
+        return block, stats
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Schema Objects
+Views, synonyms, sequences and column statistics of a schema in bulk catalog queries
+"""
+
+from typing import Any, Dict, List, Optional
+
+import oracledb
+
+
+class SchemaObjectExtractor:
+    """Non-table objects for the Oracle dictionary, one catalog query per object kind
+
+    views       - view_name -> {"view_name", "comment", "columns": [column]}
+    synonyms    - synonym_name -> {"owner", "table_owner", "table_name", "db_link"}; private
+                  synonyms of the schema plus PUBLIC synonyms pointing into it (private wins)
+    sequences   - sequence_name -> {"min_value", "max_value", "increment_by", "cycle",
+                  "cache_size", "last_number"}
+    column statistics - table_name -> {column_name: {"num_distinct", "num_nulls",
+                  "low_value", "high_value"}} from all_tab_col_statistics
+
+    Low/high values are decoded server-side for NUMBER and character columns and from the
+    7-byte internal format for DATE/TIMESTAMP; other types keep only the distinct/null counts.
+    """
+
+    KINDS = ('views', 'synonyms', 'sequences', 'column_statistics')
+    ARRAYSIZE = 5000
+
+    def __init__(self, schema: str):
+        self.schema = schema.upper()
+
+    def _cursor(self, connection):
+        cursor = connection.cursor()
+        cursor.arraysize = self.ARRAYSIZE
+        cursor.prefetchrows = self.ARRAYSIZE
+        return cursor
+
+    def get_views(self, connection, column_from_row) -> Dict[str, Dict[str, Any]]:
+        """Views with their column lists (column_from_row builds the column dicts)"""
+        query = """
+            SELECT
+                v.view_name,
+                atc.column_name,
+                atc.data_type,
+                atc.data_length,
+                atc.data_precision,
+                atc.data_scale,
+                atc.nullable,
+                atc.column_id,
+                atc.data_default
+            FROM all_views v
+            LEFT JOIN all_tab_columns atc ON atc.owner = v.owner AND atc.table_name = v.view_name
+            WHERE v.owner = :1
+            ORDER BY v.view_name, atc.column_id
+        """
+        cursor = self._cursor(connection)
+        cursor.execute(query, [self.schema])
+        views: Dict[str, Dict[str, Any]] = {}
+        for row in cursor:
+            view = views.setdefault(row[0], {"view_name": row[0], "comment": None, "columns": []})
+            # Views that no longer compile have no column rows
+            if row[1] is not None:
+                column = column_from_row(row[1:])
+                column["sample_value"] = None
+                column["comment"] = None
+                view["columns"].append(column)
+        cursor.close()
+
+        cursor = self._cursor(connection)
+        cursor.execute("""
+            SELECT table_name, comments
+            FROM all_tab_comments
+            WHERE owner = :1 AND table_type = 'VIEW' AND comments IS NOT NULL
+        """, [self.schema])
+        for view_name, comment in cursor:
+            if view_name in views:
+                views[view_name]["comment"] = comment
+        cursor.close()
+        return views
+
+    def get_synonyms(self, connection) -> Dict[str, Dict[str, Any]]:
+        """Private synonyms of the schema and PUBLIC synonyms of its objects"""
+        query = """
+            SELECT owner, synonym_name, table_owner, table_name, db_link
+            FROM all_synonyms
+            WHERE owner = :1 OR (owner = 'PUBLIC' AND table_owner = :1)
+            ORDER BY CASE WHEN owner = 'PUBLIC' THEN 1 ELSE 0 END, synonym_name
+        """
+        cursor = self._cursor(connection)
+        cursor.execute(query, [self.schema])
+        synonyms: Dict[str, Dict[str, Any]] = {}
+        for owner, synonym_name, table_owner, table_name, db_link in cursor:
+            # Oracle resolves a schema's own synonym before a PUBLIC one of the same name
+            synonyms.setdefault(synonym_name, {
+                "owner": owner,
+                "table_owner": table_owner,
+                "table_name": table_name,
+                "db_link": db_link
+            })
+        cursor.close()
+        return synonyms
+
+    def get_sequences(self, connection) -> Dict[str, Dict[str, Any]]:
+        query = """
+            SELECT sequence_name, min_value, max_value, increment_by, cycle_flag, cache_size,
+                   last_number
+            FROM all_sequences
+            WHERE sequence_owner = :1
+            ORDER BY sequence_name
+        """
+        cursor = self._cursor(connection)
+        cursor.execute(query, [self.schema])
+        sequences = {
+            row[0]: {
+                "min_value": row[1],
+                "max_value": row[2],
+                "increment_by": row[3],
+                "cycle": row[4] == 'Y',
+                "cache_size": row[5],
+                "last_number": row[6]
+            }
+            for row in cursor
+        }
+        cursor.close()
+        return sequences
+
+    @staticmethod
+    def decode_date(raw: Optional[bytes]) -> Optional[str]:
+        """ISO string of an Oracle DATE/TIMESTAMP statistics value (first 7 internal bytes)"""
+        if not raw or len(raw) < 7:
+            return None
+        century, year, month, day, hour, minute, second = raw[:7]
+        return (f"{(century - 100) * 100 + year - 100:04d}-{month:02d}-{day:02d}T"
+                f"{hour - 1:02d}:{minute - 1:02d}:{second - 1:02d}")
+
+    def get_column_statistics(self, connection) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Optimizer column statistics of every table of the schema"""
+        query = """
+            SELECT
+                s.table_name,
+                s.column_name,
+                s.num_distinct,
+                s.num_nulls,
+                atc.data_type,
+                CASE
+                    WHEN atc.data_type IN ('NUMBER', 'FLOAT')
+                        THEN TO_CHAR(UTL_RAW.CAST_TO_NUMBER(s.low_value))
+                    WHEN atc.data_type IN ('VARCHAR2', 'CHAR')
+                        THEN UTL_RAW.CAST_TO_VARCHAR2(s.low_value)
+                    WHEN atc.data_type IN ('NVARCHAR2', 'NCHAR')
+                        THEN TO_CHAR(UTL_RAW.CAST_TO_NVARCHAR2(s.low_value))
+                END AS low_text,
+                CASE
+                    WHEN atc.data_type IN ('NUMBER', 'FLOAT')
+                        THEN TO_CHAR(UTL_RAW.CAST_TO_NUMBER(s.high_value))
+                    WHEN atc.data_type IN ('VARCHAR2', 'CHAR')
+                        THEN UTL_RAW.CAST_TO_VARCHAR2(s.high_value)
+                    WHEN atc.data_type IN ('NVARCHAR2', 'NCHAR')
+                        THEN TO_CHAR(UTL_RAW.CAST_TO_NVARCHAR2(s.high_value))
+                END AS high_text,
+                CASE WHEN atc.data_type = 'DATE' OR atc.data_type LIKE 'TIMESTAMP%'
+                    THEN s.low_value END AS low_raw,
+                CASE WHEN atc.data_type = 'DATE' OR atc.data_type LIKE 'TIMESTAMP%'
+                    THEN s.high_value END AS high_raw
+            FROM all_tab_col_statistics s
+            JOIN all_tab_columns atc ON atc.owner = s.owner
+                AND atc.table_name = s.table_name
+                AND atc.column_name = s.column_name
+            WHERE s.owner = :1
+        """
+        cursor = self._cursor(connection)
+        cursor.execute(query, [self.schema])
+        statistics: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (table_name, column_name, num_distinct, num_nulls, data_type,
+             low_text, high_text, low_raw, high_raw) in cursor:
+            if low_raw is not None or high_raw is not None:
+                low_text, high_text = self.decode_date(low_raw), self.decode_date(high_raw)
+            statistics.setdefault(table_name, {})[column_name] = {
+                "num_distinct": num_distinct,
+                "num_nulls": num_nulls,
+                "low_value": low_text,
+                "high_value": high_text
+            }
+        cursor.close()
+        return statistics
+
+    def load(self, connection, column_from_row,
+             kinds: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Requested object kinds (default: all); a kind whose query fails is left out"""
+        loaders = {
+            'views': lambda: self.get_views(connection, column_from_row),
+            'synonyms': lambda: self.get_synonyms(connection),
+            'sequences': lambda: self.get_sequences(connection),
+            'column_statistics': lambda: self.get_column_statistics(connection)
+        }
+        objects = {}
+        for kind in kinds if kinds is not None else self.KINDS:
+            try:
+                objects[kind] = loaders[kind]()
+            except oracledb.Error as e:
+                print(f"⚠ Could not read {kind.replace('_', ' ')}: {e}")
+        return objects
+
+
+def apply_column_statistics(tables: Dict[str, Any],
+                            statistics: Dict[str, Dict[str, Dict[str, Any]]]):
+    """Merge column statistics into the column dicts of extracted tables"""
+    for table_name, table_stats in statistics.items():
+        entry = tables.get(table_name)
+        if not entry or "error" in entry:
+            continue
+        for column in entry.get("columns", []):
+            if column["column_name"] in table_stats:
+                column.update(table_stats[column["column_name"]])
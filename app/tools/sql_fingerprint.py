@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+SQL Fingerprint
+Canonical form and hash of a split MyBatis statement, used to convert copy-pasted
+statements (differing only in id, whitespace or comments) once
+"""
+
+import re
+import hashlib
+from typing import Dict, Optional
+
+
+class SQLFingerprinter:
+    """Normalizes statement XML and computes a fingerprint for deduplication"""
+
+    # First element start tag, after an optional XML declaration / comments
+    ROOT_TAG_PATTERN = re.compile(r'^\s*(?:<\?.*?\?>\s*)?(?:<!--.*?-->\s*)*<(\w+)\b[^>]*>', re.DOTALL)
+    ID_ATTR_PATTERN = re.compile(r'(\s)id\s*=\s*("[^"]*"|\'[^\']*\')')
+    XML_COMMENT_PATTERN = re.compile(r'<!--.*?-->', re.DOTALL)
+    ATTR_PATTERN = re.compile(r'([\w:.-]+)\s*=\s*("[^"]*"|\'[^\']*\')')
+
+    def normalize(self, sql_xml: str) -> str:
+        """Canonical text: root attributes sorted without id, no comments,
+        whitespace collapsed outside literals and dropped next to tags"""
+        sql_xml = self.XML_COMMENT_PATTERN.sub(' ', sql_xml)
+
+        root_tag = self.ROOT_TAG_PATTERN.match(sql_xml)
+        if root_tag:
+            attrs = sorted((name, value[1:-1]) for name, value
+                           in self.ATTR_PATTERN.findall(root_tag.group(0)) if name != 'id')
+            start_tag = '<' + ' '.join([root_tag.group(1)] + [f'{n}="{v}"' for n, v in attrs]) + '>'
+            sql_xml = start_tag + sql_xml[root_tag.end():]
+
+        out = []
+        i = 0
+        length = len(sql_xml)
+        pending_space = False
+
+        while i < length:
+            char = sql_xml[i]
+
+            # String literal: copied verbatim ('' is an escaped quote)
+            if char == "'":
+                end = i + 1
+                while end < length:
+                    if sql_xml[end] == "'":
+                        if end + 1 < length and sql_xml[end + 1] == "'":
+                            end += 2
+                            continue
+                        break
+                    end += 1
+                if pending_space and out:
+                    out.append(' ')
+                pending_space = False
+                out.append(sql_xml[i:end + 1])
+                i = end + 1
+                continue
+
+            # Block comment (optimizer hints /*+ ... */ change the plan - keep them)
+            if sql_xml.startswith('/*', i) and not sql_xml.startswith('/*+', i):
+                end = sql_xml.find('*/', i + 2)
+                i = length if end < 0 else end + 2
+                pending_space = True
+                continue
+
+            # Line comment
+            if sql_xml.startswith('--', i):
+                end = sql_xml.find('\n', i)
+                i = length if end < 0 else end + 1
+                pending_space = True
+                continue
+
+            if char.isspace():
+                pending_space = True
+                i += 1
+                continue
+
+            if pending_space and out and char != '<' and out[-1][-1] != '>':
+                out.append(' ')
+            pending_space = False
+            out.append(char)
+            i += 1
+
+        return ''.join(out)
+
+    def fingerprint(self, sql_xml: str, fragments: Optional[Dict[str, str]] = None) -> str:
+        """SHA-256 of the normalized statement plus the fragments it includes"""
+        digest = hashlib.sha256(self.normalize(sql_xml).encode('utf-8'))
+        for refid in sorted(fragments or {}):
+            digest.update(f"\0{refid}\0{self.normalize(fragments[refid])}".encode('utf-8'))
+        return digest.hexdigest()
+
+    def statement_id(self, sql_xml: str) -> Optional[str]:
+        """id attribute of the statement's root element"""
+        root_tag = self.ROOT_TAG_PATTERN.match(sql_xml)
+        if not root_tag:
+            return None
+        match = self.ID_ATTR_PATTERN.search(root_tag.group(0))
+        return match.group(2)[1:-1] if match else None
+
+    def rewrite_id(self, sql_xml: str, statement_id: str) -> str:
+        """Replace the id attribute of the root element"""
+        root_tag = self.ROOT_TAG_PATTERN.match(sql_xml)
+        if not root_tag:
+            return sql_xml
+        start_tag = self.ID_ATTR_PATTERN.sub(
+            lambda m: f'{m.group(1)}id="{statement_id}"', root_tag.group(0), count=1)
+        return start_tag + sql_xml[root_tag.end():]
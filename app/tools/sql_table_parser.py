@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""
+MyBatis SQL Table Parser
+Deterministic local table extraction for MyBatis mapper SQL (no LLM round trip)
+"""
+
+import re
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+
+class SQLTableParser:
+    """Tokenizer/parser that extracts table names from MyBatis XML SQL"""
+
+    # Token pattern (order matters: comments and literals before identifiers)
+    TOKEN_PATTERN = re.compile(r"""
+          (?P<ws>\s+)
+        | (?P<comment>--[^\n]*|/\*.*?\*/)
+        | (?P<string>'(?:[^']|'')*')
+        | (?P<bind>\#\{[^}]*\})
+        | (?P<dynamic>\$\{[^}]*\})
+        | (?P<ident>(?:"[^"]+"|[^\W\d][\w$\#@]*)(?:\s*\.\s*(?:"[^"]+"|[^\W\d][\w$\#@]*))*)
+        | (?P<number>\d+(?:\.\d+)?|\.\d+)
+        | (?P<punct>[(),;])
+        | (?P<other>.)
+    """, re.S | re.X)
+
+    # ${schema}.TABLE prefixes are resolved to TABLE
+    DYNAMIC_SCHEMA_PREFIX = re.compile(r'\$\{[^}]*\}\s*\.\s*(?=["\w])')
+
+    # Words that can never be a table name or table alias
+    RESERVED = {
+        'SELECT', 'FROM', 'WHERE', 'GROUP', 'ORDER', 'BY', 'HAVING', 'CONNECT', 'START',
+        'PRIOR', 'UNION', 'INTERSECT', 'MINUS', 'EXCEPT', 'ALL', 'DISTINCT', 'ON', 'USING',
+        'JOIN', 'INNER', 'LEFT', 'RIGHT', 'FULL', 'CROSS', 'NATURAL', 'OUTER', 'APPLY',
+        'SET', 'VALUES', 'INTO', 'INSERT', 'UPDATE', 'DELETE', 'MERGE', 'WHEN', 'THEN',
+        'ELSE', 'END', 'CASE', 'FOR', 'RETURNING', 'RETURN', 'LOG', 'ERRORS', 'MODEL',
+        'PIVOT', 'UNPIVOT', 'FETCH', 'OFFSET', 'LIMIT', 'WITH', 'AS', 'PARTITION',
+        'SAMPLE', 'AND', 'OR', 'NOT', 'IN', 'EXISTS', 'IS', 'NULL', 'LIKE', 'BETWEEN',
+        'LATERAL', 'ONLY', 'MATCHED', 'NOWAIT', 'WAIT', 'SKIP', 'LOCKED', 'OF',
+        'WINDOW', 'ROWS', 'ROW', 'FIRST', 'NEXT', 'SIBLINGS', 'NOCYCLE', 'TABLE'
+    }
+
+    # Comparison operator characters (tokenized one by one: >= is '>' '=')
+    OPERATORS = {'=', '<', '>', '!', '^'}
+    PREDICATE_WORDS = {'LIKE', 'IN', 'BETWEEN'}
+
+    # Clause keywords that end an ON condition or a compared expression
+    CLAUSE_WORDS = {'SELECT', 'FROM', 'WHERE', 'JOIN', 'GROUP', 'ORDER', 'HAVING', 'UNION',
+                    'INTERSECT', 'MINUS', 'EXCEPT', 'SET', 'VALUES', 'RETURNING', 'CONNECT', 'START',
+                    'LEFT', 'RIGHT', 'INNER', 'FULL', 'CROSS', 'NATURAL'}
+
+    # Column role precedence when a column occurs several times
+    ROLE_RANK = {'bound': 0, 'join': 1, 'other': 2}
+
+    # Functions that take FROM inside their arguments: EXTRACT(YEAR FROM dt), TRIM(LEADING '0' FROM x)
+    FROM_ARGUMENT_FUNCTIONS = {'EXTRACT', 'TRIM', 'SUBSTRING'}
+
+    # Oracle pseudo table, never reported
+    IGNORED_TABLES = {'DUAL', 'SYS.DUAL'}
+
+    # Statement tags that must reference at least one table
+    STATEMENT_TAGS = {'select', 'insert', 'update', 'delete'}
+
+    def __init__(self, known_tables: Optional[Set[str]] = None):
+        """
+        Args:
+            known_tables: Dictionary table names. Tables outside this set lower
+                          the confidence so the caller can fall back to the LLM.
+        """
+        self.known_tables = known_tables
+
+    def flatten_xml(self, sql_xml: str) -> Tuple[List[str], Dict[str, Any]]:
+        """Flatten MyBatis dynamic SQL into plain SQL texts, one per <choose> alternative
+
+        Bodies of every <if> and <foreach> are kept so that tables referenced by any
+        branch are found. <when>/<otherwise> branches exclude each other (FROM <choose>
+        over two tables is one table, not "TB_A TB_B"), so variant k takes the k-th
+        branch of every <choose> (its last branch if it has fewer). Tags that imply SQL
+        keywords (<where>, <set>, <trim prefix>, <foreach open/close>) emit them.
+        """
+        info = {'root_tag': None, 'has_include': False, 'xml_parsed': True}
+
+        try:
+            root = ET.fromstring(f'<root>{sql_xml}</root>')
+        except ET.ParseError:
+            # Malformed XML - strip tags and continue with lower confidence
+            info['xml_parsed'] = False
+            info['has_include'] = '<include' in sql_xml
+            text = re.sub(r'<!\[CDATA\[(.*?)\]\]>', r'\1', sql_xml, flags=re.S)
+            text = re.sub(r'<[^>]+>', ' ', text)
+            text = text.replace('&lt;', '<').replace('&gt;', '>').replace('&amp;', '&')
+            return [text], info
+
+        children = list(root)
+        if children:
+            info['root_tag'] = children[0].tag
+
+        branch_counts = [sum(1 for branch in choose if branch.tag in ('when', 'otherwise'))
+                         for choose in root.iter('choose')]
+        parts = []
+
+        def walk(elem, variant):
+            tag = elem.tag
+            if tag == 'include':
+                info['has_include'] = True
+            elif tag == 'where':
+                parts.append(' WHERE ')
+            elif tag == 'set':
+                parts.append(' SET ')
+            elif tag == 'trim':
+                parts.append(f" {elem.get('prefix', '')} ")
+            elif tag == 'foreach':
+                parts.append(f" {elem.get('open', '')} ")
+
+            if elem.text:
+                parts.append(elem.text)
+            branches = []
+            if tag == 'choose':
+                branches = [child for child in elem if child.tag in ('when', 'otherwise')]
+            for child in elem:
+                if not branches or child is branches[min(variant, len(branches) - 1)]:
+                    walk(child, variant)
+                if child.tail:
+                    parts.append(child.tail)
+            parts.append(' ')
+
+            if tag == 'trim':
+                parts.append(f" {elem.get('suffix', '')} ")
+            elif tag == 'foreach':
+                parts.append(f" {elem.get('close', '')} ")
+
+        variants = []
+        for variant in range(max(branch_counts, default=1)):
+            parts.clear()
+            for child in children:
+                walk(child, variant)
+                if child.tail:
+                    parts.append(child.tail)
+            variants.append(''.join(parts))
+        return variants, info
+
+    def tokenize(self, sql: str) -> List[Tuple[str, str]]:
+        """Split SQL text into (kind, value) tokens, dropping whitespace and comments"""
+        sql = self.DYNAMIC_SCHEMA_PREFIX.sub('', sql)
+        tokens = []
+        for match in self.TOKEN_PATTERN.finditer(sql):
+            kind = match.lastgroup
+            if kind in ('ws', 'comment'):
+                continue
+            tokens.append((kind, match.group()))
+        return tokens
+
+    @staticmethod
+    def _word(token: Tuple[str, str]) -> str:
+        """Upper-cased keyword value of an identifier token"""
+        return token[1].upper() if token[0] == 'ident' else ''
+
+    def _is_name(self, token: Tuple[str, str]) -> bool:
+        """True for identifiers that can be a table name or alias"""
+        if token[0] != 'ident':
+            return False
+        return token[1].startswith('"') or token[1].upper() not in self.RESERVED
+
+    @staticmethod
+    def normalize_name(raw: str) -> str:
+        """SCHEMA.TABLE@LINK / "Quoted" → TABLE name as stored in the dictionary"""
+        name = re.split(r'\s*\.\s*(?=(?:"|[^\W\d]))', raw)[-1]
+        if name.startswith('"') and name.endswith('"'):
+            return name[1:-1]
+        return name.split('@', 1)[0].upper()
+
+    @staticmethod
+    def _skip_balanced(tokens: List[Tuple[str, str]], j: int) -> int:
+        """Return the index after the parenthesis group starting at tokens[j]"""
+        depth = 0
+        while j < len(tokens):
+            value = tokens[j][1]
+            if value == '(':
+                depth += 1
+            elif value == ')':
+                depth -= 1
+                if depth == 0:
+                    return j + 1
+            j += 1
+        return j
+
+    def _read_table_ref(self, tokens, j, result, insert_target: bool = False) -> int:
+        """Read one table reference starting at j, return index after it (and its alias)
+
+        For INSERT/MERGE targets a following "(" is a column list, not a table function.
+        """
+        n = len(tokens)
+        if j >= n:
+            return j
+
+        token = tokens[j]
+        table_name = None   # None: the alias names an inline view / table function
+        if token[1] == '(':
+            # Inline view / subquery - its own FROM clauses are scanned by the main loop
+            j = self._skip_balanced(tokens, j)
+        elif token[0] == 'dynamic':
+            result['reasons'].add('dynamic_table_name')
+            j += 1
+        elif self._word(token) in ('LATERAL', 'ONLY', 'TABLE') and j + 1 < n and tokens[j + 1][1] == '(':
+            # LATERAL (...) / TABLE(collection) - not a stored table
+            j = self._skip_balanced(tokens, j + 1)
+        elif self._is_name(token):
+            if j + 1 < n and tokens[j + 1][1] == '(' and not insert_target:
+                # Table function such as XMLTABLE(...)
+                j = self._skip_balanced(tokens, j + 1)
+            else:
+                result['raw_tables'].append(token[1])
+                result['table_positions'].add(j)
+                table_name = self.normalize_name(token[1])
+                result['aliases'][table_name] = table_name
+                j += 1
+        else:
+            return j
+
+        # Optional PARTITION (...) / SAMPLE (...) clauses
+        while j + 1 < n and self._word(tokens[j]) in ('PARTITION', 'SAMPLE') and tokens[j + 1][1] == '(':
+            j = self._skip_balanced(tokens, j + 1)
+
+        # Optional alias
+        if j < n and self._word(tokens[j]) == 'AS':
+            j += 1
+        if j < n and self._is_name(tokens[j]):
+            result['table_positions'].add(j)
+            result['aliases'][self.normalize_name(tokens[j][1])] = table_name
+            j += 1
+        return j
+
+    def _read_from_list(self, tokens, j, result):
+        """Read a comma-separated FROM list: FROM A a, B b, (SELECT ...) c"""
+        n = len(tokens)
+        while j < n:
+            next_j = self._read_table_ref(tokens, j, result)
+            if next_j == j:
+                break
+            j = next_j
+            if j < n and tokens[j][1] == ',':
+                j += 1
+                continue
+            break
+
+    def parse(self, sql_xml: str) -> Dict[str, Any]:
+        """Extract table names from a MyBatis SQL element
+
+        Returns:
+            {
+                'tables': ["TB_USER", ...],  # upper-case, de-duplicated, in order of appearance
+                'confidence': 'high' | 'low',
+                'reasons': [...],            # why confidence is low
+                'aliases': {"U": "TB_USER", "TB_USER": "TB_USER", "V": None},  # None = inline view
+                'columns': [{'qualifier': "U" | None, 'column': "USER_ID",
+                             'role': 'bound' | 'join' | 'other'}, ...],
+                'insert_all_columns': ["TB_LOG", ...]  # INSERT without a column list
+            }
+        """
+        variants, info = self.flatten_xml(sql_xml)
+        tables, reasons, aliases, insert_all_columns = [], set(), {}, []
+        columns: Dict[Tuple[Optional[str], str], str] = {}
+        mentions_dual = False
+
+        # <choose> alternatives are parsed one by one and their results united
+        for sql in variants:
+            variant = self._parse_variant(sql)
+            for table in variant['tables']:
+                if table not in tables:
+                    tables.append(table)
+            reasons.update(variant['reasons'])
+            for alias, table in variant['aliases'].items():
+                aliases.setdefault(alias, table)
+            for (qualifier, column), role in variant['columns'].items():
+                table = variant['aliases'].get(qualifier)
+                if table and aliases.get(qualifier) != table:
+                    # Alias of another table in an earlier alternative: qualify with the table itself
+                    qualifier = table
+                key = (qualifier, column)
+                if key not in columns or self.ROLE_RANK[role] < self.ROLE_RANK[columns[key]]:
+                    columns[key] = role
+            for table in variant['insert_all_columns']:
+                if table not in insert_all_columns:
+                    insert_all_columns.append(table)
+            mentions_dual = mentions_dual or variant['mentions_dual']
+
+        if not info['xml_parsed']:
+            reasons.add('xml_parse_error')
+
+        if not tables and info['root_tag'] in self.STATEMENT_TAGS and not info['has_include']:
+            if not mentions_dual:
+                reasons.add('no_tables_found')
+
+        if self.known_tables is not None:
+            unknown = [t for t in tables if t not in self.known_tables]
+            if unknown:
+                reasons.add('unknown_tables')
+
+        reasons = sorted(reasons)
+        return {
+            'tables': tables,
+            'confidence': 'low' if reasons else 'high',
+            'reasons': reasons,
+            'aliases': aliases,
+            'columns': [{'qualifier': qualifier, 'column': column, 'role': role}
+                        for (qualifier, column), role in columns.items()],
+            'insert_all_columns': insert_all_columns
+        }
+
+    def _parse_variant(self, sql: str) -> Dict[str, Any]:
+        """Tables, aliases and column references of one flattened SQL text"""
+        tokens = self.tokenize(sql)
+        result = {'raw_tables': [], 'reasons': set(), 'aliases': {}, 'table_positions': set(),
+                  'insert_columns': set(), 'insert_all_columns': []}
+
+        cte_names = set()
+        dml_seen = False  # INSERT or MERGE seen (INTO then names a target table)
+        depth = 0
+        paren_functions = []  # per open parenthesis: True inside EXTRACT/TRIM/SUBSTRING arguments
+        n = len(tokens)
+
+        for i, token in enumerate(tokens):
+            value = token[1]
+            if value == '(':
+                depth += 1
+                prev_word = self._word(tokens[i - 1]) if i > 0 else ''
+                paren_functions.append(prev_word in self.FROM_ARGUMENT_FUNCTIONS)
+                continue
+            if value == ')':
+                depth -= 1
+                if depth < 0:
+                    result['reasons'].add('unbalanced_parentheses')
+                    depth = 0
+                if paren_functions:
+                    paren_functions.pop()
+                continue
+
+            word = self._word(token)
+            if not word:
+                continue
+
+            prev_word = self._word(tokens[i - 1]) if i > 0 else ''
+            prev_value = tokens[i - 1][1] if i > 0 else ''
+            next_token = tokens[i + 1] if i + 1 < n else ('', '')
+
+            # CTE names: WITH name [(cols)] AS ( ... ), name2 AS ( ... )
+            if (prev_word == 'WITH' or prev_value == ',') and self._is_name(token):
+                j = i + 1
+                if j < n and tokens[j][1] == '(':
+                    j = self._skip_balanced(tokens, j)
+                if j + 1 < n and self._word(tokens[j]) == 'AS' and tokens[j + 1][1] == '(':
+                    cte_names.add(self.normalize_name(value))
+                    continue
+
+            if word in ('INSERT', 'MERGE'):
+                dml_seen = True
+            elif word == 'FROM' and not (paren_functions and paren_functions[-1]):
+                self._read_from_list(tokens, i + 1, result)
+            elif word == 'JOIN':
+                self._read_table_ref(tokens, i + 1, result)
+            elif word == 'INTO' and dml_seen:
+                j = self._read_table_ref(tokens, i + 1, result, insert_target=True)
+                if result['raw_tables'] and j < n and tokens[j][1] == '(':
+                    # INSERT INTO t (c1, c2, ...): every listed column receives a value
+                    result['insert_columns'].update(range(j + 1, self._skip_balanced(tokens, j)))
+                elif result['raw_tables'] and j < n and self._word(tokens[j]) in ('VALUES', 'SELECT'):
+                    # INSERT INTO t VALUES (...): all columns, in table order
+                    result['insert_all_columns'].append(self.normalize_name(result['raw_tables'][-1]))
+            elif word == 'UPDATE' and prev_word not in ('FOR', 'THEN', 'KEY'):
+                self._read_table_ref(tokens, i + 1, result)
+            elif word == 'DELETE' and prev_word != 'THEN' and self._word(next_token) != 'FROM':
+                # Oracle allows DELETE table WHERE ... (FROM omitted)
+                self._read_table_ref(tokens, i + 1, result)
+            elif word == 'USING' and dml_seen and next_token[1] != '(':
+                # MERGE INTO t USING source_table s
+                self._read_table_ref(tokens, i + 1, result)
+
+        if depth != 0:
+            result['reasons'].add('unbalanced_parentheses')
+
+        tables = []
+        for raw in result['raw_tables']:
+            name = self.normalize_name(raw)
+            if name in cte_names or name in self.IGNORED_TABLES or name in tables:
+                continue
+            tables.append(name)
+
+        return {
+            'tables': tables,
+            'reasons': result['reasons'],
+            'aliases': {alias: table for alias, table in result['aliases'].items()
+                        if table not in cte_names},
+            'columns': self._column_references(tokens, result, cte_names),
+            'insert_all_columns': result['insert_all_columns'],
+            'mentions_dual': any(self._word(t) == 'DUAL' or t[1].upper().endswith('.DUAL')
+                                 for t in tokens)
+        }
+
+    def _column_role(self, tokens: List[Tuple[str, str]], i: int, in_on_clause: bool) -> str:
+        """bound: compared with / assigned a bind variable; join: compared with another column"""
+        n = len(tokens)
+
+        # Forward: COL op <expression>
+        j = i + 1
+        while j < n and tokens[j][0] == 'other' and tokens[j][1] in self.OPERATORS:
+            j += 1
+        if j == i + 1:
+            if j < n and self._word(tokens[j]) == 'NOT':
+                j += 1
+            if j < n and self._word(tokens[j]) in self.PREDICATE_WORDS:
+                j += 1
+            else:
+                j = i + 1
+        if j > i + 1:
+            depth = 0
+            first = True
+            for k in range(j, min(n, j + 12)):
+                kind, value = tokens[k]
+                word = self._word(tokens[k])
+                if value == '(':
+                    depth += 1
+                elif value == ')':
+                    depth -= 1
+                    if depth < 0:
+                        break
+                elif depth == 0 and (value in (',', ';') or word in ('AND', 'OR') or word in self.CLAUSE_WORDS):
+                    break
+                if kind in ('bind', 'dynamic'):
+                    return 'bound'
+                if first and kind == 'ident' and self._is_name(tokens[k]) and \
+                        not (k + 1 < n and tokens[k + 1][1] == '('):
+                    return 'join'
+                first = False
+
+        # Backward: <value> op COL
+        j = i - 1
+        while j >= 0 and tokens[j][0] == 'other' and tokens[j][1] in self.OPERATORS:
+            j -= 1
+        if j < i - 1 and j >= 0:
+            if tokens[j][0] in ('bind', 'dynamic'):
+                return 'bound'
+            if tokens[j][0] == 'ident' and self._is_name(tokens[j]):
+                return 'join'
+
+        return 'join' if in_on_clause else 'other'
+
+    def _column_references(self, tokens: List[Tuple[str, str]], result: Dict[str, Any],
+                           cte_names: Set[str]) -> Dict[Tuple[Optional[str], str], str]:
+        """(qualifier, column) -> role of column identifiers (qualifier = alias/table, upper-case)"""
+        columns: Dict[Tuple[Optional[str], str], str] = {}
+        in_on_clause = False
+        n = len(tokens)
+
+        for i, token in enumerate(tokens):
+            word = self._word(token)
+            if word == 'ON':
+                in_on_clause = True
+                continue
+            if word in self.CLAUSE_WORDS:
+                in_on_clause = False
+
+            if token[0] != 'ident' or i in result['table_positions']:
+                continue
+            if i + 1 < n and tokens[i + 1][1] in ('(', '.'):
+                continue   # function call or alias.*
+            if i > 0 and self._word(tokens[i - 1]) == 'AS':
+                continue   # column alias
+
+            parts = re.split(r'\s*\.\s*(?=(?:"|[^\W\d]))', token[1])
+            column = self.normalize_name(parts[-1])
+            if not parts[-1].startswith('"') and column in self.RESERVED:
+                continue
+            qualifier = self.normalize_name(parts[-2]) if len(parts) > 1 else None
+            if qualifier in cte_names:
+                continue
+
+            role = 'bound' if i in result['insert_columns'] else self._column_role(tokens, i, in_on_clause)
+            key = (qualifier, column)
+            if key not in columns or self.ROLE_RANK[role] < self.ROLE_RANK[columns[key]]:
+                columns[key] = role
+
+        return columns
+
+
+def main():
+    """Parse a mapper XML file and print extracted tables"""
+    import sys
+    import json
+
+    if len(sys.argv) < 2:
+        print("Usage: python3 sql_table_parser.py <mapper.xml>")
+        sys.exit(1)
+
+    tree = ET.parse(sys.argv[1])
+    parser = SQLTableParser()
+    for child in tree.getroot():
+        if child.tag in ['select', 'insert', 'update', 'delete', 'sql']:
+            sql_xml = ET.tostring(child, encoding='unicode', method='xml')
+            result = parser.parse(sql_xml)
+            print(json.dumps({'id': child.get('id'), **result}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Incremental JSON Validator
+Character-level JSON checker fed with streamed LLM output chunks
+"""
+
+import json
+import re
+from typing import Any, List, Optional
+
+
+class IncrementalJSONValidator:
+    """Validates one JSON object as it streams in
+
+    - Text before the first '{' (e.g. a ```json fence) and after the root object is ignored
+    - Raw control characters and invalid backslash escapes inside strings are repaired
+      (the usual LLM mistakes when embedding XML in JSON), so the result parses without
+      a json_fix round trip
+    - Any other structural error is reported as soon as its character arrives
+    """
+
+    LITERAL_PATTERN = re.compile(r'-?(0|[1-9]\d*)(\.\d+)?([eE][+-]?\d+)?$|true$|false$|null$')
+    LITERAL_CHARS = set('0123456789+-.eEtrufalsn')
+    CONTROL_ESCAPES = {'\n': '\\n', '\r': '\\r', '\t': '\\t', '\b': '\\b', '\f': '\\f'}
+    VALID_ESCAPES = set('"\\/bfnrtu')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forget everything fed so far"""
+        self.started = False
+        self.complete = False
+        self.error: Optional[str] = None
+        self.offset = 0          # characters consumed
+        self.repairs = 0
+        self.top_level_keys: List[str] = []
+
+        self._out: List[str] = []   # repaired JSON text of the root object
+        self._stack: List[str] = []
+        self._expect = 'value'      # value | key | key_or_end | colon | comma_or_end | value_or_end
+        self._in_string = False
+        self._string_is_key = False
+        self._string_chars: List[str] = []
+        self._escape = False
+        self._unicode_left = 0
+        self._literal: List[str] = []
+
+    def feed(self, text: str) -> bool:
+        """Consume a chunk, return False once the JSON is known to be malformed"""
+        if self.error:
+            return False
+        for char in text:
+            if self.complete:
+                break
+            self._consume(char)
+            self.offset += 1
+            if self.error:
+                return False
+        return True
+
+    def is_valid(self) -> bool:
+        """True once a complete, well-formed root object has been read"""
+        return self.complete and not self.error
+
+    def json_text(self) -> str:
+        """Repaired JSON text of the root object"""
+        return ''.join(self._out)
+
+    def result(self) -> Any:
+        """Parsed root object (only valid when is_valid())"""
+        return json.loads(self.json_text())
+
+    def _fail(self, message: str):
+        self.error = f"{message} at offset {self.offset}"
+
+    def _consume(self, char: str):
+        if not self.started:
+            # Skip markdown fences or preamble before the root object
+            if char != '{':
+                return
+            self.started = True
+
+        if self._in_string:
+            self._consume_string(char)
+            return
+
+        if self._literal:
+            if char in self.LITERAL_CHARS:
+                self._literal.append(char)
+                self._out.append(char)
+                return
+            if not self._end_literal():
+                return
+
+        if char in ' \t\r\n':
+            self._out.append(char)
+            return
+
+        expect = self._expect
+        if char == '"':
+            if expect in ('value', 'value_or_end'):
+                self._start_string(is_key=False)
+            elif expect in ('key', 'key_or_end'):
+                self._start_string(is_key=True)
+            else:
+                self._fail("Unexpected '\"'")
+                return
+        elif char in '{[':
+            if expect not in ('value', 'value_or_end'):
+                self._fail(f"Unexpected '{char}'")
+                return
+            self._stack.append(char)
+            self._expect = 'key_or_end' if char == '{' else 'value_or_end'
+        elif char in '}]':
+            opener = '{' if char == '}' else '['
+            if (not self._stack or self._stack[-1] != opener
+                    or expect not in ('comma_or_end', 'key_or_end', 'value_or_end')
+                    or (expect == 'key_or_end' and char == ']')
+                    or (expect == 'value_or_end' and char == '}')):
+                self._fail(f"Unexpected '{char}'")
+                return
+            self._stack.pop()
+            self._out.append(char)
+            self._end_value()
+            return
+        elif char == ':':
+            if expect != 'colon':
+                self._fail("Unexpected ':'")
+                return
+            self._expect = 'value'
+        elif char == ',':
+            if expect != 'comma_or_end':
+                self._fail("Unexpected ','")
+                return
+            self._expect = 'key' if self._stack[-1] == '{' else 'value'
+        elif char in self.LITERAL_CHARS and expect in ('value', 'value_or_end'):
+            self._literal = [char]
+        else:
+            self._fail(f"Unexpected {char!r}")
+            return
+
+        self._out.append(char)
+
+    def _start_string(self, is_key: bool):
+        self._in_string = True
+        self._string_is_key = is_key
+        self._string_chars = []
+
+    def _consume_string(self, char: str):
+        if self._unicode_left:
+            if char not in '0123456789abcdefABCDEF':
+                self._fail("Invalid \\u escape")
+                return
+            self._unicode_left -= 1
+            self._out.append(char)
+            return
+
+        if self._escape:
+            self._escape = False
+            if char in self.VALID_ESCAPES:
+                self._out.append('\\' + char)
+                if char == 'u':
+                    self._unicode_left = 4
+            else:
+                # Lone backslash (e.g. a regex in SQL): keep it literally
+                self._out.append('\\\\')
+                self.repairs += 1
+                self._consume_string(char)
+            return
+
+        if char == '\\':
+            self._escape = True
+        elif char == '"':
+            self._in_string = False
+            self._out.append(char)
+            if self._string_is_key:
+                if len(self._stack) == 1:
+                    self.top_level_keys.append(''.join(self._string_chars))
+                self._expect = 'colon'
+            else:
+                self._end_value()
+        elif char < ' ':
+            self._out.append(self.CONTROL_ESCAPES.get(char, f'\\u{ord(char):04x}'))
+            self.repairs += 1
+        else:
+            self._out.append(char)
+            if self._string_is_key:
+                self._string_chars.append(char)
+
+    def _end_literal(self) -> bool:
+        literal = ''.join(self._literal)
+        self._literal = []
+        if not self.LITERAL_PATTERN.match(literal):
+            self._fail(f"Invalid literal {literal!r}")
+            return False
+        self._end_value()
+        return not self.complete
+
+    def _end_value(self):
+        if not self._stack:
+            self.complete = True
+        else:
+            self._expect = 'comma_or_end'
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Table Name Matcher
+Aho-Corasick automaton over dictionary table names for single-pass SQL scanning
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List
+
+
+class TableMatcher:
+    """Multi-pattern matcher that finds whole-word table names in SQL text"""
+
+    def __init__(self, table_names: Iterable[str]):
+        # Trie as parallel lists: goto[state] = {char: state}, fail[state], output[state] = [names]
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[str]] = [[]]
+        self.pattern_count = 0
+
+        for name in table_names:
+            if name:
+                self._add(name.upper())
+        self._build()
+
+    def _add(self, name: str):
+        state = 0
+        for char in name:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = next_state
+        if name not in self.output[state]:
+            self.output[state].append(name)
+            self.pattern_count += 1
+
+    def _build(self):
+        """Compute failure links breadth-first"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                if self.fail[next_state] == next_state:
+                    self.fail[next_state] = 0
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    @staticmethod
+    def _is_word_char(char: str) -> bool:
+        # Oracle identifiers may contain letters, digits, _, $ and #
+        return char.isalnum() or char in '_$#'
+
+    def find_all(self, text: str) -> List[str]:
+        """Return matched table names in order of first appearance (whole words only)"""
+        text = text.upper()
+        found = []
+        seen = set()
+        state = 0
+        length = len(text)
+
+        for end, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+
+            for name in self.output[state]:
+                if name in seen:
+                    continue
+                start = end - len(name) + 1
+                if start > 0 and self._is_word_char(text[start - 1]):
+                    continue
+                if end + 1 < length and self._is_word_char(text[end + 1]):
+                    continue
+                seen.add(name)
+                found.append(name)
+
+        return found
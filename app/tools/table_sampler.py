@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Table Sampler
+Non-null sample values for all columns of a table in one or a few queries
+"""
+
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import oracledb
+
+
+class TableSampler:
+    """Sample value extraction strategies for the Oracle dictionary
+
+    Strategies:
+        scan   - bounded row scan (ROWNUM <= sample_rows) keeping the first non-null value per
+                 column, plus one query restricted to the columns still missing (default)
+        sample - same as scan, on a SAMPLE (sample_percent) row sample first
+        column - one query per column (legacy behaviour)
+        none   - no sample values
+
+    LOB and RAW values are never transferred in full: CLOBs are cut to max_lob_chars server-side
+    and binary columns only report their length.
+    """
+
+    STRATEGIES = ('scan', 'sample', 'column', 'none')
+    TEXT_LOB_TYPES = ('CLOB', 'NCLOB')
+    BINARY_TYPES = ('BLOB', 'RAW')
+    SKIPPED_TYPES = ('LONG', 'LONG RAW', 'BFILE')
+    # DBMS_LOB.SUBSTR returns VARCHAR2: 1000 chars stay below 4000 bytes in AL32UTF8
+    LOB_CHAR_LIMIT = 1000
+
+    def __init__(self, schema: str, strategy: str = 'scan', sample_rows: int = 1000,
+                 sample_percent: float = 1.0, max_lob_chars: int = 200):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown sample strategy: {strategy}")
+        self.schema = schema
+        self.strategy = strategy
+        self.sample_rows = max(1, sample_rows)
+        self.sample_percent = sample_percent
+        self.max_lob_chars = max(1, min(max_lob_chars, self.LOB_CHAR_LIMIT))
+
+        self._lock = threading.Lock()
+        self.stats = {
+            'tables': 0,
+            'queries': 0,
+            'columns_sampled': 0,
+            'columns_empty': 0,
+            'fallbacks': 0
+        }
+
+    @staticmethod
+    def format_value(value: Any) -> Optional[str]:
+        """Dictionary representation of a fetched sample value"""
+        if isinstance(value, (datetime,)):
+            return value.isoformat()
+        elif isinstance(value, (bytes,)):
+            return f"<BLOB {len(value)} bytes>"
+        else:
+            return str(value) if value is not None else None
+
+    @staticmethod
+    def _quote(identifier: str) -> str:
+        return '"' + identifier.replace('"', '""') + '"'
+
+    def _select_expression(self, column: Dict[str, Any]) -> Optional[str]:
+        """Select list entry that bounds the transferred bytes, None for unsampled types"""
+        data_type = (column.get('data_type') or '').upper()
+        name = self._quote(column['column_name'])
+        if data_type in self.SKIPPED_TYPES:
+            return None
+        if data_type in self.TEXT_LOB_TYPES:
+            return f"DBMS_LOB.SUBSTR({name}, {self.max_lob_chars}, 1)"
+        if data_type == 'BLOB':
+            return f"DBMS_LOB.GETLENGTH({name})"
+        if data_type == 'RAW':
+            return f"UTL_RAW.LENGTH({name})"
+        return name
+
+    def _format_sample(self, column: Dict[str, Any], value: Any) -> Optional[str]:
+        if value is None:
+            return None
+        if (column.get('data_type') or '').upper() in self.BINARY_TYPES:
+            return f"<BLOB {int(value)} bytes>"
+        return self.format_value(value)
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def _scan(self, connection, table_name: str, columns: List[Dict[str, Any]],
+              expressions: Dict[str, str], samples: Dict[str, Any], use_sample_clause: bool,
+              only_non_null: bool):
+        """One bounded query over the given columns, filling samples of columns still missing"""
+        names = [column['column_name'] for column in columns]
+        source = f"{self._quote(self.schema)}.{self._quote(table_name)}"
+        if use_sample_clause:
+            source += f" SAMPLE ({self.sample_percent})"
+        conditions = ["ROWNUM <= :1"]
+        if only_non_null:
+            conditions.insert(0, "(" + " OR ".join(f"{self._quote(name)} IS NOT NULL"
+                                                   for name in names) + ")")
+        query = (f"SELECT {', '.join(expressions[name] for name in names)} FROM {source} "
+                 f"WHERE {' AND '.join(conditions)}")
+
+        cursor = connection.cursor()
+        cursor.arraysize = min(self.sample_rows, 500)
+        try:
+            cursor.execute(query, [self.sample_rows])
+            self._count('queries')
+            missing = set(names)
+            for row in cursor:
+                for name, column, value in zip(names, columns, row):
+                    if name in missing and value is not None:
+                        samples[name] = self._format_sample(column, value)
+                        missing.discard(name)
+                if not missing:
+                    break
+        finally:
+            cursor.close()
+
+    def _sample_by_column(self, connection, table_name: str, columns: List[Dict[str, Any]],
+                          expressions: Dict[str, str], samples: Dict[str, Any]):
+        for column in columns:
+            name = column['column_name']
+            query = f"""
+                SELECT {expressions[name]}
+                FROM {self._quote(self.schema)}.{self._quote(table_name)}
+                WHERE {self._quote(name)} IS NOT NULL
+                AND ROWNUM <= 1
+            """
+            try:
+                cursor = connection.cursor()
+                cursor.execute(query)
+                self._count('queries')
+                result = cursor.fetchone()
+                cursor.close()
+                samples[name] = self._format_sample(column, result[0]) if result else None
+            except oracledb.Error as e:
+                samples[name] = f"<Error: {str(e)[:100]}>"
+
+    def sample_table(self, connection, table_name: str,
+                     columns: List[Dict[str, Any]]) -> Dict[str, Optional[str]]:
+        """column_name -> sample value (None when no non-null value was found)"""
+        samples: Dict[str, Optional[str]] = {column['column_name']: None for column in columns}
+        if self.strategy == 'none' or not columns:
+            return samples
+        self._count('tables')
+
+        expressions = {}
+        for column in columns:
+            expression = self._select_expression(column)
+            if expression:
+                expressions[column['column_name']] = expression
+        sampled_columns = [column for column in columns if column['column_name'] in expressions]
+
+        if self.strategy == 'column':
+            self._sample_by_column(connection, table_name, sampled_columns, expressions, samples)
+        else:
+            try:
+                self._scan(connection, table_name, sampled_columns, expressions, samples,
+                           use_sample_clause=(self.strategy == 'sample'), only_non_null=False)
+                # Sparse columns: one more bounded query that only returns rows carrying them
+                missing = [column for column in sampled_columns
+                           if samples[column['column_name']] is None]
+                if missing:
+                    self._scan(connection, table_name, missing, expressions, samples,
+                               use_sample_clause=False, only_non_null=True)
+            except oracledb.Error:
+                # e.g. a column type that cannot be fetched: isolate it per column
+                self._count('fallbacks')
+                missing = [column for column in sampled_columns
+                           if samples[column['column_name']] is None]
+                self._sample_by_column(connection, table_name, missing, expressions, samples)
+
+        found = sum(1 for value in samples.values() if value is not None)
+        self._count('columns_sampled', found)
+        self._count('columns_empty', len(samples) - found)
+        return samples
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats, strategy=self.strategy)
@@ -21,6 +21,7 @@ import json
 import logging
 import os
 import sys
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from collections import defaultdict, deque
@@ -30,6 +31,7 @@ from typing import List, Dict, Set
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'schema'))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'schema', 'common'))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'schema', 'postgresql'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'app', 'tools'))
 
 logging.basicConfig(
     level=logging.INFO,
@@ -101,6 +103,8 @@ class ConversionAgent:
         self.completed = set()
         self.failed_queue = deque()
         self.dependency_graph = DependencyGraph()
+        self.bedrock = None  # Shared BedrockClient, created on first LLM call
+        self.bedrock_lock = threading.Lock()
 
         # Statistics
         self.stats = {
@@ -314,25 +318,23 @@ class ConversionAgent:
             logger.exception("Error extracting DDL for %s %s", obj_type, obj_name)
             return ""
 
+    def get_bedrock_client(self):
+        """Return the shared Bedrock client (one retry budget / circuit breaker per run)."""
+        with self.bedrock_lock:
+            if self.bedrock is None:
+                from bedrock_client import BedrockClient
+
+                self.bedrock = BedrockClient(
+                    region_name=os.environ.get("BEDROCK_REGION", "ap-northeast-2"),
+                    model_id=os.environ.get("BEDROCK_MODEL_ID", "anthropic.claude-opus-4-7"),
+                    read_timeout=600  # 10 minutes for very large procedures (1700+ lines)
+                )
+            return self.bedrock
+
     def convert_with_llm(self, oracle_ddl: str, obj_type: str, obj_name: str) -> str:
         """Convert Oracle DDL to PostgreSQL using LLM."""
-        import boto3
-        import json
-        from botocore.config import Config
-
         try:
-            # Increase timeout for large procedures (1700+ lines)
-            config = Config(
-                read_timeout=600,  # 10 minutes for very large procedures
-                connect_timeout=10,
-                retries={'max_attempts': 1}  # Reduce retries since it's slow
-            )
-
-            bedrock = boto3.client(
-                service_name='bedrock-runtime',
-                region_name=os.environ.get("BEDROCK_REGION", "ap-northeast-2"),
-                config=config
-            )
+            bedrock = self.get_bedrock_client()
 
             prompt = f"""Convert this Oracle {obj_type} to PostgreSQL.
 
@@ -347,7 +349,7 @@ Requirements:
 
 PostgreSQL DDL:"""
 
-            body = json.dumps({
+            body = {
                 "anthropic_version": "bedrock-2023-05-31",
                 "max_tokens": 100000,  # Increased for large procedures
                 "messages": [
@@ -356,15 +358,9 @@ PostgreSQL DDL:"""
                         "content": prompt
                     }
                 ]
-            })
-
-            model_id = os.environ.get("BEDROCK_MODEL_ID", "anthropic.claude-opus-4-7")
-            response = bedrock.invoke_model(
-                modelId=model_id,
-                body=body
-            )
+            }
 
-            response_body = json.loads(response['body'].read())
+            response_body = bedrock.invoke_model(body)
             pg_ddl = response_body['content'][0]['text'].strip()
 
             # Remove markdown code blocks if present
@@ -545,6 +541,11 @@ PostgreSQL DDL:"""
         logger.info("Successful: %d", self.stats["success"])
         logger.info("Failed: %d", self.stats["failed"])
         logger.info("Retries: %d", self.stats["retried"])
+        if self.bedrock:
+            bedrock_stats = self.bedrock.get_stats()
+            logger.info("Bedrock retries: %d (waited %.1fs, circuit opened %d times)",
+                        bedrock_stats["total_retries"], bedrock_stats["retry_wait_seconds"],
+                        bedrock_stats["circuit_opened"])
         logger.info("Elapsed: %.1fs", elapsed)
         logger.info("=" * 60)
 
@@ -19,6 +19,7 @@ from typing import List, Dict, Tuple
 
 # Add parent paths
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'schema', 'common', 'tools'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'app', 'tools'))
 
 try:
     import psycopg2
@@ -40,8 +41,19 @@ class NumberTypeOptimizer:
     that came from Oracle NUMBER.
     """
 
-    def __init__(self, oracle_schema: str, target_config: dict):
+    # A dictionary profile is only trusted while the table's row count stays within this
+    # fraction of the count recorded with the profile
+    PROFILE_ROW_TOLERANCE = 0.1
+
+    def __init__(self, oracle_schema: str, target_config: dict, row_count_mode: str = 'stats',
+                 dictionary_path: str = None):
         self.oracle_schema = oracle_schema.upper()
+        self.row_count_mode = row_count_mode  # stats, exact or sampled (see RowCountProvider)
+        # oracle_dictionary.py --profile output: full-scan profiles replace the MIN/MAX query
+        self.dictionary_path = dictionary_path
+        self.dictionary = None
+        self.ddl_times = {}  # live all_objects.last_ddl_time per table, ISO format
+        self.profiled_tables = 0
         self.target_config = target_config
         self.target_db_type = target_config.get('db_type', 'postgres')  # 'postgres' or 'mysql'
         self.analysis_results = []
@@ -52,6 +64,40 @@ class NumberTypeOptimizer:
         else:
             self.numeric_types = ['bigint', 'double precision', 'numeric', 'integer', 'smallint']
 
+    def _profiled_ranges(self, table_name: str, table_columns: list, row_count):
+        """(result, reason): (min, max, has_decimals) per column from dictionary profiles, in
+        query result layout, or (None, why the Oracle scan is needed)
+
+        Only current full-scan profiles qualify: a SAMPLE profile can miss the extreme values,
+        and a profile of a table whose DDL changed or whose row count moved by more than
+        PROFILE_ROW_TOLERANCE may no longer cover the data. Every NUMBER column of the table
+        needs a profile.
+        """
+        if self.dictionary is None:
+            return None, "no dictionary"
+        tables = self.dictionary.get('tables', {})
+        entry = tables[table_name] if table_name in tables else None
+        if not entry or 'profile' not in entry:
+            return None, "no profile"
+        if entry['profile'].get('sample_percent'):
+            return None, "sampled profile"
+        if not entry.get('last_ddl_time') or entry['last_ddl_time'] != self.ddl_times.get(table_name):
+            return None, "DDL changed since the dictionary build"
+        stored_rows = entry.get('row_count')
+        if (stored_rows is None or row_count is None or row_count < 0 or
+                abs(row_count - stored_rows) > self.PROFILE_ROW_TOLERANCE * max(stored_rows, row_count)):
+            return None, f"row count changed ({stored_rows} -> {row_count})"
+
+        profiles = {col['column_name']: col.get('profile') for col in entry.get('columns', [])}
+        result = []
+        for col in table_columns:
+            profile = profiles.get(col[1])
+            if profile is None:
+                return None, f"no profile for {col[1]}"
+            result.extend([profile.get('min'), profile.get('max'),
+                           1 if profile.get('has_fraction') else 0])
+        return tuple(result), "dictionary profile"
+
     def get_oracle_connection(self):
         """Get Oracle connection."""
         try:
@@ -342,7 +388,8 @@ class NumberTypeOptimizer:
             'min_value': decimal or None,
             'max_value': decimal or None,
             'has_decimals': bool,
-            'row_count': int,
+            'row_count': int or None,
+            'row_count_source': str,
             'recommended_type': str
         }
         """
@@ -355,6 +402,30 @@ class NumberTypeOptimizer:
             logger.error("Cannot connect to Oracle")
             return []
 
+        from row_count_provider import RowCountProvider
+        row_counts = RowCountProvider(self.oracle_schema, mode=self.row_count_mode)
+        try:
+            row_counts.prefetch(oracle_conn)
+        except Exception as e:
+            logger.warning("Failed to load table statistics, reading them per table: %s", e)
+
+        if self.dictionary_path:
+            from dictionary_store import load_dictionary_file
+            try:
+                self.dictionary = load_dictionary_file(self.dictionary_path)
+                ddl_cur = oracle_conn.cursor()
+                ddl_cur.execute("""
+                    SELECT object_name, last_ddl_time
+                    FROM all_objects
+                    WHERE owner = :schema AND object_type = 'TABLE'
+                """, schema=self.oracle_schema)
+                self.ddl_times = {name: ddl_time.isoformat() for name, ddl_time in ddl_cur if ddl_time}
+                ddl_cur.close()
+            except Exception as e:
+                logger.warning("Failed to load dictionary %s, querying Oracle: %s",
+                               self.dictionary_path, e)
+                self.dictionary = None
+
         cur = oracle_conn.cursor()
 
         # Get all NUMBER columns with metadata
@@ -409,13 +480,12 @@ class NumberTypeOptimizer:
             logger.info("[%d/%d] Analyzing table %s (%d NUMBER columns)...",
                        table_num, len(columns_by_table), table_name, len(table_columns))
 
-            # Get row count once per table
-            try:
-                cur.execute(f"SELECT COUNT(*) FROM {self.oracle_schema}.{table_name}")
-                row_count = cur.fetchone()[0]
-            except Exception as e:
-                logger.warning("Failed to get row count for %s: %s", table_name, e)
+            # Get row count once per table (an empty table is verified, not estimated)
+            counted = row_counts.count(oracle_conn, table_name)
+            if counted['source'] == 'error':
+                logger.warning("Failed to get row count for %s", table_name)
                 continue
+            row_count = counted['row_count']
 
             # Build dynamic query to analyze all NUMBER columns at once
             if row_count == 0:
@@ -442,6 +512,7 @@ class NumberTypeOptimizer:
                         'max_value': None,
                         'has_decimals': False,
                         'row_count': row_count,
+                        'row_count_source': counted['source'],
                         'recommended_type': recommended_type
                     })
             else:
@@ -454,9 +525,16 @@ class NumberTypeOptimizer:
                     select_parts.append(f"CASE WHEN COUNT({column_name}) = COUNT(CASE WHEN MOD({column_name}, 1) = 0 THEN 1 END) THEN 0 ELSE 1 END as dec_{column_name}")
 
                 try:
-                    query = f"SELECT {', '.join(select_parts)} FROM {self.oracle_schema}.{table_name}"
-                    cur.execute(query)
-                    result = cur.fetchone()
+                    result, source = self._profiled_ranges(table_name, table_columns, row_count)
+                    if self.dictionary is not None:
+                        logger.info("  Value ranges of %s: %s", table_name,
+                                    source if result is not None else f"Oracle scan ({source})")
+                    if result is not None:
+                        self.profiled_tables += 1
+                    else:
+                        query = f"SELECT {', '.join(select_parts)} FROM {self.oracle_schema}.{table_name}"
+                        cur.execute(query)
+                        result = cur.fetchone()
 
                     # Process results for each column
                     for idx, col in enumerate(table_columns):
@@ -485,6 +563,7 @@ class NumberTypeOptimizer:
                             'max_value': float(max_val) if max_val is not None else None,
                             'has_decimals': bool(has_decimals),
                             'row_count': row_count,
+                            'row_count_source': counted['source'],
                             'recommended_type': recommended_type
                         })
                 except Exception as e:
@@ -494,6 +573,9 @@ class NumberTypeOptimizer:
         cur.close()
         oracle_conn.close()
 
+        logger.info("Row counts (%s): %s", self.row_count_mode, row_counts.get_stats()['sources'])
+        if self.dictionary is not None:
+            logger.info("Value ranges of %d tables taken from dictionary profiles", self.profiled_tables)
         self.analysis_results = results
         return results
 
@@ -769,6 +851,11 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--schema", required=True, help="Oracle schema name")
     parser.add_argument("--apply", action="store_true", help="Apply optimizations (default: dry-run)")
+    parser.add_argument("--row-count", choices=["stats", "exact", "sampled"], default="stats",
+                        help="Row count source: optimizer statistics (default), COUNT(*) or a SAMPLE estimate")
+    parser.add_argument("--dict-path",
+                        help="Oracle dictionary built with --profile: full-scan column profiles "
+                             "replace the MIN/MAX scan of their tables")
     args = parser.parse_args()
 
     logging.basicConfig(
@@ -786,7 +873,8 @@ def main():
         'schema': os.environ.get('PGSCHEMA', args.schema.lower())
     }
 
-    optimizer = NumberTypeOptimizer(args.schema, pg_config)
+    optimizer = NumberTypeOptimizer(args.schema, pg_config, row_count_mode=args.row_count,
+                                    dictionary_path=args.dict_path)
 
     # Step 1: Analyze Oracle NUMBER columns
     results = optimizer.analyze_oracle_numbers()